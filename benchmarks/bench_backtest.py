@@ -0,0 +1,58 @@
+"""Backtest throughput: vectorized signal path against the per-tick loop.
+
+    python benchmarks/bench_backtest.py --ticks 1000000
+
+Runs a moving-average crossover over one simulated brownian path twice: as a
+signal strategy (``positions``) and as the same targets fed one tick at a time.
+Both must end with identical cash, shares and trades.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from stocksim.backtest import backtest
+from stocksim.engine import gbm_paths
+from stocksim.strategies import MovingAverageCross
+
+
+class TickTargets:
+    """Per-tick strategy that trades towards precomputed targets."""
+
+    def __init__(self, targets):
+        self.targets = iter(targets.tolist())
+
+    def __call__(self, price, cash, shares):
+        return next(self.targets) - shares
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--cash", type=float, default=10000.0)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    prices = gbm_paths(1, args.ticks, rng=args.seed, sigma=0.01, mu=0.0)[0]
+    strategy = MovingAverageCross(size=args.size)
+
+    t0 = time.perf_counter()
+    fast = backtest(prices, strategy, args.cash)
+    fast_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    slow = backtest(prices, TickTargets(strategy.positions(prices, args.cash)), args.cash)
+    slow_s = time.perf_counter() - t0
+
+    same = np.array_equal(fast.cash, slow.cash) and np.array_equal(fast.shares, slow.shares) and np.array_equal(fast.trades, slow.trades)
+    print(f"signal   {fast_s * 1e3:>10,.1f} ms  {len(prices) / fast_s:>14,.0f} ticks/s")
+    print(f"loop     {slow_s * 1e3:>10,.1f} ms  {len(prices) / slow_s:>14,.0f} ticks/s")
+    print(f"speedup  {slow_s / fast_s:>10,.1f}x   identical: {same}   trades: {fast.n_trades:,}")
+
+
+if __name__ == '__main__':
+    main()
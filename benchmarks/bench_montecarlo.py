@@ -0,0 +1,52 @@
+"""Scaling benchmark for the Monte Carlo runner.
+
+    python benchmarks/bench_montecarlo.py --paths 64000 --steps 500
+
+Runs the same seeded workload with 1, 2, 4, ... workers (up to the CPU count)
+and reports paths/sec, speedup and parallel efficiency against one worker.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from stocksim.montecarlo import run_monte_carlo
+from stocksim.strategies import Threshold
+
+
+def worker_counts(max_workers):
+    n = 1
+    while n < max_workers:
+        yield n
+        n *= 2
+    yield max_workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="brownian")
+    parser.add_argument("--paths", type=int, default=16000)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--vectorized", action="store_true", help="call the strategy with arrays")
+    args = parser.parse_args(argv)
+
+    strategy = Threshold()
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>9} {'paths/s':>11} {'speedup':>8} {'efficiency':>10}")
+    for workers in worker_counts(args.max_workers):
+        t0 = time.perf_counter()
+        result = run_monte_carlo(strategy, args.model, n_paths=args.paths, n_steps=args.steps, seed=0,
+                                 workers=workers, chunk_size=args.chunk_size, vectorized=args.vectorized)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>7} {elapsed:>9.3f} {args.paths / elapsed:>11,.0f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+    print("mean P&L", round(result.summary()["mean_pnl"], 2))
+
+
+if __name__ == '__main__':
+    main()
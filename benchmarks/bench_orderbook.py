@@ -0,0 +1,70 @@
+"""Order book throughput: submit/cancel rates and matches per second.
+
+    python benchmarks/bench_orderbook.py --orders 50000 --ticks 200000
+
+Rests ``--orders`` random limit/stop/stop-limit orders around the start price,
+cancels a third of them, then matches a simulated brownian path tick by tick
+(``match``) and again through the batch path matcher (``match_path``).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from stocksim.engine import gbm_paths
+from stocksim.orderbook import BUY, LIMIT, SELL, STOP, STOP_LIMIT, OrderBook
+
+
+def build_book(n_orders, seed):
+    rng = np.random.default_rng(seed)
+    sides = np.where(rng.random(n_orders) < 0.5, BUY, SELL)
+    kinds = np.array([LIMIT, STOP, STOP_LIMIT])[rng.integers(0, 3, n_orders)]
+    limits = rng.uniform(25, 100, n_orders).tolist()
+    stops = rng.uniform(25, 100, n_orders).tolist()
+    amounts = rng.integers(1, 10, n_orders).tolist()
+    book = OrderBook()
+    t0 = time.perf_counter()
+    for side, kind, amount, limit, stop in zip(sides.tolist(), kinds.tolist(), amounts, limits, stops):
+        book.submit(side, amount, kind, limit=limit, stop=stop)
+    submit_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for order_id in range(1, n_orders + 1, 3): book.cancel(order_id)
+    cancel_s = time.perf_counter() - t0
+    return book, submit_s, cancel_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    prices = gbm_paths(1, args.ticks, rng=args.seed, sigma=0.01, mu=0.0)[0, 1:]
+    cash, shares = 1e12, 10**9
+
+    book, submit_s, cancel_s = build_book(args.orders, args.seed)
+    print(f"submit   {args.orders / submit_s:>12,.0f} orders/s")
+    print(f"cancel   {len(range(1, args.orders + 1, 3)) / cancel_s:>12,.0f} orders/s")
+
+    t0 = time.perf_counter()
+    fills = 0
+    for tick, price in enumerate(prices.tolist()):
+        cash, shares, tick_fills = book.match(price, cash, shares, tick)
+        fills += len(tick_fills)
+    elapsed = time.perf_counter() - t0
+    print(f"match    {args.ticks / elapsed:>12,.0f} ticks/s  {fills / elapsed:>12,.0f} matches/s  ({fills:,} matches)")
+
+    book, _, _ = build_book(args.orders, args.seed)
+    t0 = time.perf_counter()
+    _, _, path_fills = book.match_path(prices, 1e12, 10**9)
+    elapsed = time.perf_counter() - t0
+    print(f"path     {args.ticks / elapsed:>12,.0f} ticks/s  {len(path_fills) / elapsed:>12,.0f} matches/s  ({len(path_fills):,} matches)")
+
+
+if __name__ == '__main__':
+    main()
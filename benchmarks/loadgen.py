@@ -0,0 +1,145 @@
+"""Load generator for the market server: many simulated traders per event loop.
+
+    python benchmarks/loadgen.py --serve --traders 1000 --workers 4 --duration 30
+    python -m stocksim.server --tick-ms 100 &  python benchmarks/loadgen.py --port 8765 --traders 2000
+
+Every trader holds its own TCP connection. On each tick it receives, it sends a
+random market order of 1-10 shares with probability ``--order-prob``. The run
+reports how many traders stayed connected, tick delivery latency (server
+timestamp to arrival), order round trips (send to fill) and throughput.
+``--serve`` starts a server in a subprocess for the run. Traders are spread over
+``--workers`` processes so the generator itself does not cap the measurement.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from stocksim.server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class Stats:
+    def __init__(self):
+        self.connected = 0
+        self.ticks = 0
+        self.tick_latency = []
+        self.order_latency = []
+        self.sent = self.filled = self.rejected = 0
+
+
+async def trader(host, port, name, order_prob, stats, stop, rng):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 22)
+    writer.write(json.dumps({"op": "hello", "role": "trader", "name": name}).encode() + b"\n")
+    await reader.readline()  # welcome
+    stats.connected += 1
+    sent_at, ref = {}, 0
+    try:
+        while not stop.is_set():
+            line = await reader.readline()
+            if not line: break
+            now = time.time()
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "tick":
+                stats.ticks += 1
+                stats.tick_latency.append(now - message["time"])
+                if rng.random() < order_prob:
+                    ref += 1
+                    sent_at[ref] = time.perf_counter()
+                    side = "buy" if rng.random() < 0.5 else "sell"
+                    writer.write(json.dumps({"op": "order", "side": side, "amount": rng.randint(1, 10), "ref": ref}).encode() + b"\n")
+                    stats.sent += 1
+            elif kind == "fill":
+                stats.order_latency.append(time.perf_counter() - sent_at.pop(message["ref"]))
+                if message["filled"]: stats.filled += 1
+                else: stats.rejected += 1
+    finally:
+        stats.connected -= 1
+        writer.close()
+
+
+async def run(args, names, start_at):
+    stats, stop = Stats(), asyncio.Event()
+    rng = random.Random(f"{args.seed}-{names[0]}")
+    tasks = []
+    for start in range(0, len(names), args.connect_batch):
+        tasks += [asyncio.ensure_future(trader(args.host, args.port, name, args.order_prob, stats, stop, random.Random(rng.random())))
+                  for name in names[start:start + args.connect_batch]]
+        await asyncio.sleep(0.05)
+    # Every worker measures the same wall-clock window, after all of them have connected.
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    stats.ticks = stats.sent = stats.filled = stats.rejected = 0
+    stats.tick_latency.clear()
+    stats.order_latency.clear()
+    connected = stats.connected
+    await asyncio.sleep(args.duration)
+    connected = min(connected, stats.connected)
+    stop.set()
+    for t in tasks: t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {"connected": connected, "ticks": stats.ticks, "sent": stats.sent, "filled": stats.filled, "rejected": stats.rejected,
+            "tick_latency": stats.tick_latency, "order_latency": stats.order_latency}
+
+
+def _worker(args, names, start_at):
+    return asyncio.run(run(args, names, start_at))
+
+
+def quantiles_ms(values):
+    if not values: return "n/a"
+    p50, p99, top = np.quantile(np.array(values) * 1e3, (0.5, 0.99, 1.0))
+    return f"p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  max {top:8.2f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--traders", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured after every trader connects")
+    parser.add_argument("--order-prob", type=float, default=0.5, help="chance a trader orders on each tick")
+    parser.add_argument("--connect-batch", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="generator processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", action="store_true", help="start a server in a subprocess for the run")
+    parser.add_argument("--tick-ms", type=float, default=100, help="tick interval of the --serve server")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.serve:
+        server = subprocess.Popen([sys.executable, "-m", "stocksim.server", "--host", args.host, "--port", str(args.port),
+                                   "--tick-ms", str(args.tick_ms), "--seed", str(args.seed)],
+                                  cwd=os.path.join(os.path.dirname(__file__), os.pardir), stdout=subprocess.DEVNULL)
+        time.sleep(1.0)
+    names = [f"load-{i}" for i in range(args.traders)]
+    # Connecting takes about 0.05 s per batch; measuring starts once the slowest worker is done.
+    start_at = time.time() + 1.0 + 0.05 * -(-args.traders // (args.workers * args.connect_batch))
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_worker, [args] * args.workers, [names[i::args.workers] for i in range(args.workers)], [start_at] * args.workers))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    total = lambda key: sum(r[key] for r in results)
+    merged = lambda key: [v for r in results for v in r[key]]
+    elapsed = args.duration
+    print(f"measured {elapsed:.1f} s with {total('connected'):,} of {args.traders:,} traders connected ({args.workers} worker processes)")
+    print(f"ticks delivered {total('ticks'):>12,}  ({total('ticks') / elapsed:,.0f}/s)")
+    print(f"tick latency    {quantiles_ms(merged('tick_latency'))}")
+    print(f"orders sent     {total('sent'):>12,}  ({total('sent') / elapsed:,.0f}/s), {total('filled'):,} filled, {total('rejected'):,} rejected")
+    print(f"order latency   {quantiles_ms(merged('order_latency'))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""Headless benchmark suite: tick, render, save/load and log throughput, with regression checks.
+
+    python benchmarks/suite.py run --out before.json
+    python benchmarks/suite.py run --out after.json --only 'tick/*'
+    python benchmarks/suite.py compare before.json after.json --threshold 0.10
+
+``run`` measures, on SDL's dummy video driver so no window or display is needed:
+
+* ``step/<model>``: ``PriceModel.step`` alone, ticks/s (the scripts' ``update_stock_price_func``)
+* ``tick/<model>``: ``Game.update_stock_price`` with history, candles and indicators, ticks/s
+* ``paths/<model>``: ``PriceModel.paths`` for 1000 paths at once, ticks/s
+* ``render/<mode>/<ticks>``: one full ``PriceGraph`` redraw of the whole history, ms
+* ``save/<ticks>``, ``save_append/<ticks>``, ``load/<ticks>``: ``save_game``/``load_game``, ms
+* ``log/<ticks>``: ``log_data`` throughput, ticks/s
+* ``env/scalar``, ``env/vector/<n>``: ``TradingEnv``/``VectorTradingEnv`` steps (summed over environments), steps/s
+
+Each timing is the best of ``--repeat`` runs. Results are written as JSON along
+with the interpreter and library versions. ``compare`` matches results by name
+and exits with status 1 when any got worse than ``--threshold`` (a fraction)
+relative to the baseline; with a single file it compares a fresh run against it.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from stocksim.env import TradingEnv, VectorTradingEnv
+from stocksim.game import Game
+from stocksim.graph import PriceGraph
+from stocksim.models import get_model
+from stocksim.rng import RandomStream
+
+RESULTS_VERSION = 1
+MODELS = ("percent", "random", "brownian", "jump", "garch", "regime")
+FULL = {"ticks": 200_000, "history": (1_000, 10_000, 100_000, 1_000_000), "envs": (256, 4096), "repeat": 5}
+QUICK = {"ticks": 20_000, "history": (1_000, 100_000), "envs": (256,), "repeat": 3}
+PATHS = 1000
+GRAPH_RECT = (50, 150, 1100, 400)
+APPEND_TICKS = 1_000
+HIGHER, LOWER = "higher", "lower"
+
+
+def best_of(fn, repeat, setup=None):
+    """Fastest of ``repeat`` timed calls to ``fn``, in seconds; ``setup`` runs untimed before each."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup: setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def case(name, unit, better, measure, **params):
+    """A named measurement; ``measure()`` builds its workload, so cases skipped by ``--only`` cost nothing."""
+    return {"name": name, "unit": unit, "better": better, "params": params, "measure": measure}
+
+
+def _game(data_dir, ticks, model="brownian"):
+    game = Game(model, data_dir=data_dir, seed=0)
+    game.new_game("bench")
+    game.advance(ticks - 1)
+    return game
+
+
+# --- Benchmarks ---
+def bench_ticks(config, data_dir):
+    n, repeat = config["ticks"], config["repeat"]
+    for model in MODELS:
+        def measure_step(model=model):
+            step = get_model(model).step
+
+            def run_steps():
+                rng, price = RandomStream(0), 50.0
+                for _ in range(n): price = step(price, rng)
+
+            return n / best_of(run_steps, repeat)
+
+        def measure_tick(model=model):
+            games = []
+
+            def run_ticks():
+                update = games[-1].update_stock_price
+                for _ in range(n): update()
+
+            return n / best_of(run_ticks, repeat, lambda: games.append(_game(data_dir, 1, model)))
+
+        def measure_paths(model=model):
+            n_steps = max(1, n // PATHS)
+            return PATHS * n_steps / best_of(lambda: get_model(model).paths(PATHS, n_steps, rng=RandomStream(0)), repeat)
+
+        yield case(f"step/{model}", "ticks/s", HIGHER, measure_step, ticks=n)
+        yield case(f"tick/{model}", "ticks/s", HIGHER, measure_tick, ticks=n)
+        yield case(f"paths/{model}", "ticks/s", HIGHER, measure_paths, ticks=n, paths=PATHS)
+
+
+def bench_render(config, data_dir):
+    for ticks in config["history"]:
+        for mode in ("line", "candles", "bollinger"):
+            def measure(ticks=ticks, mode=mode):
+                screen = pygame.display.get_surface() or pygame.display.set_mode((1200, 700))
+                graph = PriceGraph(GRAPH_RECT)
+                graph.sync(_game(data_dir, ticks))
+                graph.show_all()
+                if mode == "candles": graph.toggle_candles()
+                if mode == "bollinger": graph.overlay = "bollinger"
+
+                def redraw():
+                    graph._stale = True
+                    graph.draw(screen)
+
+                return best_of(redraw, config["repeat"]) * 1e3
+
+            yield case(f"render/{mode}/{ticks}", "ms", LOWER, measure, ticks=ticks)
+
+
+def bench_save_load(config, data_dir):
+    repeat = config["repeat"]
+    for ticks in config["history"]:
+        def measure_save(ticks=ticks):
+            game = _game(data_dir, ticks)
+            path = os.path.join(data_dir, game.active_save_file)
+
+            def fresh():
+                if os.path.exists(path): os.remove(path)
+                game.saved_ticks = game.saved_trades = 0
+
+            return best_of(game.save_game, repeat, fresh) * 1e3
+
+        def measure_append(ticks=ticks):
+            # The common case: a save that appends the ticks played since the last one.
+            game = _game(data_dir, ticks)
+            game.save_game()
+            return best_of(game.save_game, repeat, lambda: game.advance(APPEND_TICKS)) * 1e3
+
+        def measure_load(ticks=ticks):
+            game = _game(data_dir, ticks)
+            game.save_game()
+            loader = Game("brownian", data_dir=data_dir)
+            return best_of(lambda: loader.load_game(game.active_save_file), repeat) * 1e3
+
+        yield case(f"save/{ticks}", "ms", LOWER, measure_save, ticks=ticks)
+        yield case(f"save_append/{ticks}", "ms", LOWER, measure_append, ticks=ticks, appended=APPEND_TICKS)
+        yield case(f"load/{ticks}", "ms", LOWER, measure_load, ticks=ticks)
+
+
+def bench_log(config, data_dir):
+    for ticks in config["history"]:
+        def measure(ticks=ticks):
+            return ticks / best_of(_game(data_dir, ticks).log_data, config["repeat"])
+
+        yield case(f"log/{ticks}", "ticks/s", HIGHER, measure, ticks=ticks)
+
+
+def bench_env(config, data_dir):
+    n, repeat = config["ticks"], config["repeat"]
+
+    def measure_scalar():
+        env = TradingEnv("brownian", max_steps=n, seed=0)
+        actions = [10, 0, -10, 0] * (n // 4)
+
+        def run_steps():
+            env.reset()
+            for action in actions: env.step(action)
+
+        return len(actions) / best_of(run_steps, repeat)
+
+    yield case("env/scalar", "steps/s", HIGHER, measure_scalar, steps=n)
+    for n_envs in config["envs"]:
+        def measure_vector(n_envs=n_envs):
+            steps = max(1, n // n_envs) * 10
+            env = VectorTradingEnv(n_envs, "brownian", seed=0)
+            actions = np.random.default_rng(0).integers(-10, 11, size=(4, n_envs))
+
+            def run_steps():
+                env.reset()
+                for t in range(steps): env.step(actions[t % 4])
+
+            return steps * n_envs / best_of(run_steps, repeat)
+
+        yield case(f"env/vector/{n_envs}", "steps/s", HIGHER, measure_vector, envs=n_envs)
+
+
+BENCHMARKS = (bench_ticks, bench_render, bench_save_load, bench_log, bench_env)
+
+
+def run(config, only=None, verbose=True):
+    data_dir = tempfile.mkdtemp(prefix="stocksim-bench-")
+    pygame.display.init()
+    results = []
+    try:
+        for bench in BENCHMARKS:
+            for c in bench(config, data_dir):
+                if only and not any(fnmatch.fnmatch(c["name"], pattern) for pattern in only): continue
+                measure = c.pop("measure")
+                results.append({**c, "value": measure()})
+                if verbose: print(f"{c['name']:<28} {results[-1]['value']:>16,.2f} {c['unit']}", flush=True)
+    finally:
+        pygame.display.quit()
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "config": {k: list(v) if isinstance(v, tuple) else v for k, v in config.items()},
+        "results": results,
+    }
+
+
+# --- Comparison ---
+def compare(baseline, current, threshold=0.10):
+    """Rows of (name, unit, old, new, change, regressed); ``change`` is the fractional gain (positive is better)."""
+    old = {r["name"]: r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        base = old.get(r["name"])
+        if base is None or not base["value"]: continue
+        change = (r["value"] - base["value"]) / base["value"]
+        if r["better"] == LOWER: change = -change
+        rows.append((r["name"], r["unit"], base["value"], r["value"], change, change < -threshold))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'benchmark':<28} {'baseline':>14} {'current':>14} {'change':>8}  unit"]
+    for name, unit, old, new, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{name:<28} {old:>14,.2f} {new:>14,.2f} {change:>+8.1%}  {unit}{flag}")
+    return "\n".join(lines)
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the suite and write JSON results")
+    run_parser.add_argument("--out", help="results file (default: benchmarks/results-<timestamp>.json)")
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", help="results to check (default: run the suite now)")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction")
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--quick", action="store_true", help="smaller workloads for a fast sanity run")
+        sub.add_argument("--only", action="append", metavar="PATTERN", help="glob on benchmark names; repeatable")
+        sub.add_argument("--repeat", type=int, help="timed runs per benchmark (best is kept)")
+    args = parser.parse_args(argv)
+
+    config = dict(QUICK if args.quick else FULL)
+    if args.repeat: config["repeat"] = args.repeat
+
+    if args.command == "run":
+        out = args.out or os.path.join(os.path.dirname(__file__), f"results-{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+        results = run(config, args.only)
+        with open(out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {out}")
+        return 0
+
+    baseline = _load(args.baseline)
+    current = _load(args.current) if args.current else run(config, args.only, verbose=False)
+    rows = compare(baseline, current, args.threshold)
+    print(format_comparison(rows))
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}" if regressions else f"no regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
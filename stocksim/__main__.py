@@ -0,0 +1,37 @@
+"""Command line entry point: ``python -m stocksim --model brownian`` or ``--replay prices.csv``."""
+import argparse
+
+from .models import MODELS, get_model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="stocksim", description="Stock trading simulator")
+    parser.add_argument("--model", choices=sorted(MODELS), default="percent", help="price model to simulate")
+    parser.add_argument("--replay", metavar="PATH", help="replay a price log (one price per line) or CSV instead of simulating")
+    parser.add_argument("--column", help="CSV price column, by name or index (default: Adj Close, Close or the last column)")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="join a market server (python -m stocksim.server) instead of playing alone")
+    parser.add_argument("--name", help="trader name on the server; reconnecting with it resumes the account")
+    parser.add_argument("--watch", action="store_true", help="with --connect, only watch the market")
+    parser.add_argument("--seed", type=int, help="seed new games for reproducible price paths (default: fresh entropy)")
+    args = parser.parse_args(argv)
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        from .app import run_remote
+        run_remote(host or "127.0.0.1", int(port), args.name, args.watch)
+        return
+
+    model = args.model
+    if args.replay:
+        column = int(args.column) if args.column and args.column.isdigit() else args.column
+        model = get_model("replay", path=args.replay, column=column)
+    elif model == "replay":
+        parser.error("--model replay needs --replay PATH")
+
+    # Deferred so that the simulation core never pays for pygame/display startup.
+    from .app import run
+    run(model, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""Pygame front end. Importing this module imports pygame but does not open a window;
+``run`` initializes the display."""
+import os
+from datetime import datetime
+
+import pygame
+
+from . import ui
+from .game import Game
+from .graph import PriceGraph
+from .profiler import FrameProfiler
+from .risk import RiskWorker
+from .scheduler import TickScheduler
+from .ui import BLUE, DARK_BLUE, GREEN, RED, WHITE, Button, InputBox, ProfilerOverlay, RiskPanel, Scene, TextLabel
+
+# --- Setup ---
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 700
+REPLAY_SEEK_TICKS = 1000  # per [ or ] press, times the speed multiplier
+SAVES_PER_PAGE = 8
+RISK_HORIZONS = (100, 500, 2000)  # ticks ahead, cycled with H
+RISK_REFRESH_MS = 2000  # re-estimate this often as the price moves; trades re-estimate at once
+
+# --- Display globals, created by init_display() ---
+screen = None
+clock = None
+
+
+def init_display(caption):
+    global screen, clock
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(caption)
+    clock = pygame.time.Clock()
+    ui.init_fonts()
+
+
+def handle_window_event(event, scene):
+    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+        scene.invalidate()
+
+# --- Menu Screens ---
+def new_game_menu(game):
+    scene = Scene(screen)
+    scene.add(TextLabel("Enter New Game Name:", (SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2 - 50), WHITE))
+    input_box = scene.add(InputBox(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2, 300, 50))
+    create_button = scene.add(Button(SCREEN_WIDTH/2 - 75, SCREEN_HEIGHT/2 + 70, 150, 50, "Create", GREEN))
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: return None
+            handle_window_event(event, scene)
+            filename = input_box.handle_event(event)
+            if filename:
+                game.new_game(filename)
+                return "start"
+            if event.type == pygame.MOUSEBUTTONDOWN and create_button.is_clicked(event.pos) and input_box.text:
+                game.new_game(input_box.text)
+                return "start"
+
+        scene.present()
+        clock.tick(30)
+
+def load_game_menu(game):
+    search_input = InputBox(SCREEN_WIDTH/2 - 250, 105, 360, 40)
+    sorts = (("played", "Recent"), ("name", "Name"), ("equity", "Equity"))
+    sort, descending, page = "played", True, 0
+    game.catalog.refresh()
+
+    def build():
+        # The catalog answers every page, sort and search; no save file is opened here.
+        rows, total = game.find_saves(search_input.text, sort, descending, SAVES_PER_PAGE, page * SAVES_PER_PAGE, refresh=False)
+        scene = Scene(screen)
+        scene.add(TextLabel("Select Save File", (SCREEN_WIDTH/2, 30), WHITE, ui.title_font, anchor="midtop"))
+        scene.add(TextLabel("Search:", (SCREEN_WIDTH/2 - 350, 112), WHITE))
+        scene.add(search_input)
+        sort_buttons = [scene.add(Button(SCREEN_WIDTH/2 + 120 + i * 110, 105, 100, 40, label + ((" v" if descending else " ^") if key == sort else ""), BLUE if key == sort else DARK_BLUE))
+                        for i, (key, label) in enumerate(sorts)]
+        row_buttons = [scene.add(Button(SCREEN_WIDTH/2 - 400, 160 + i * 55, 800, 45, save_row_text(row), BLUE)) for i, row in enumerate(rows)]
+        if not rows: scene.add(TextLabel("No saves found", (SCREEN_WIDTH/2, 200), WHITE, anchor="midtop"))
+        pages = max(1, -(-total // SAVES_PER_PAGE))
+        prev_button = scene.add(Button(SCREEN_WIDTH/2 - 400, 610, 120, 45, "Prev", BLUE if page > 0 else DARK_BLUE))
+        next_button = scene.add(Button(SCREEN_WIDTH/2 + 280, 610, 120, 45, "Next", BLUE if page + 1 < pages else DARK_BLUE))
+        scene.add(TextLabel(f"Page {page + 1:,} of {pages:,} ({total:,} saves)", (SCREEN_WIDTH/2, 622), WHITE, ui.small_font, anchor="midtop"))
+        return scene, rows, row_buttons, sort_buttons, prev_button, next_button, pages
+
+    scene, rows, row_buttons, sort_buttons, prev_button, next_button, pages = build()
+    while True:
+        rebuild = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: return None
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: return None
+            handle_window_event(event, scene)
+            text = search_input.text
+            search_input.handle_event(event)
+            if search_input.text != text: page, rebuild = 0, True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_PAGEDOWN and page + 1 < pages: page, rebuild = page + 1, True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_PAGEUP and page > 0: page, rebuild = page - 1, True
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                for row, button in zip(rows, row_buttons):
+                    if button.is_clicked(event.pos) and game.load_game(row["filename"]):
+                        return "start"
+                for (key, _), button in zip(sorts, sort_buttons):
+                    if button.is_clicked(event.pos):
+                        descending = not descending if key == sort else key != "name"
+                        sort, page, rebuild = key, 0, True
+                if prev_button.is_clicked(event.pos) and page > 0: page, rebuild = page - 1, True
+                if next_button.is_clicked(event.pos) and page + 1 < pages: page, rebuild = page + 1, True
+        if rebuild: scene, rows, row_buttons, sort_buttons, prev_button, next_button, pages = build()
+
+        scene.present()
+        clock.tick(30)
+
+def save_row_text(row):
+    played = datetime.fromtimestamp(row["played"]).strftime("%Y-%m-%d %H:%M")
+    return f"{row['name']}   |   equity ${row['equity']:,.2f}   |   {row['ticks']:,} ticks   |   {played}"
+
+def start_menu(game):
+    scene = Scene(screen)
+    scene.add(TextLabel(game.model.title, (SCREEN_WIDTH/2, SCREEN_HEIGHT/4), WHITE, ui.title_font, anchor="midtop"))
+    new_game_button = scene.add(Button(SCREEN_WIDTH/2 - 100, SCREEN_HEIGHT/2 - 50, 200, 80, "New Game", GREEN, font=ui.font))
+    load_game_button = scene.add(Button(SCREEN_WIDTH/2 - 100, SCREEN_HEIGHT/2 + 50, 200, 80, "Load Game", BLUE, font=ui.font))
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: return None
+            handle_window_event(event, scene)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if new_game_button.is_clicked(event.pos): return new_game_menu(game)
+                if load_game_button.is_clicked(event.pos): return load_game_menu(game)
+
+        scene.present()
+        clock.tick(15)
+
+def main_game(game):
+    graph_y_offset = 0
+    graph_zoom = 1.0
+    scene = Scene(screen)
+    graph = scene.add(PriceGraph((50, 150, SCREEN_WIDTH - 100, 400)))
+    range_label = scene.add(TextLabel("", (50, 555), WHITE, ui.small_font))
+    cash_label = scene.add(TextLabel("", (20, 20), WHITE))
+    shares_label = scene.add(TextLabel("", (20, 60), WHITE))
+    portfolio_label = scene.add(TextLabel("", (20, 100), WHITE))
+    price_label = scene.add(TextLabel("", (SCREEN_WIDTH - 320, 20), GREEN))
+    avg_cost_label = scene.add(TextLabel("", (420, 20), WHITE))
+    realized_label = scene.add(TextLabel("", (420, 60), WHITE))
+    unrealized_label = scene.add(TextLabel("", (420, 100), WHITE))
+    scene.add(TextLabel("Buy", (20, SCREEN_HEIGHT - 115), GREEN))
+    buy_buttons = scene.add(Button(80, SCREEN_HEIGHT - 110, 60, 40, "1", GREEN), Button(150, SCREEN_HEIGHT - 110, 60, 40, "10", GREEN), Button(220, SCREEN_HEIGHT - 110, 60, 40, "50", GREEN), Button(290, SCREEN_HEIGHT - 110, 70, 40, "100", GREEN))
+    custom_buy_input = scene.add(InputBox(370, SCREEN_HEIGHT - 110, 100, 40))
+    custom_buy_button = scene.add(Button(480, SCREEN_HEIGHT - 110, 100, 40, "Custom", GREEN))
+    buy_max_button = scene.add(Button(590, SCREEN_HEIGHT - 110, 100, 40, "Max", GREEN))
+    scene.add(TextLabel("Sell", (20, SCREEN_HEIGHT - 65), RED))
+    sell_buttons = scene.add(Button(80, SCREEN_HEIGHT - 60, 60, 40, "1", RED), Button(150, SCREEN_HEIGHT - 60, 60, 40, "10", RED), Button(220, SCREEN_HEIGHT - 60, 60, 40, "50", RED), Button(290, SCREEN_HEIGHT - 60, 70, 40, "100", RED))
+    custom_sell_input = scene.add(InputBox(370, SCREEN_HEIGHT - 60, 100, 40))
+    custom_sell_button = scene.add(Button(480, SCREEN_HEIGHT - 60, 100, 40, "Custom", RED))
+    sell_max_button = scene.add(Button(590, SCREEN_HEIGHT - 60, 100, 40, "Max", RED))
+    speed_label = scene.add(TextLabel("", (720, SCREEN_HEIGHT - 105), WHITE))
+    slower_button = scene.add(Button(900, SCREEN_HEIGHT - 110, 120, 40, "Slower", BLUE))
+    faster_button = scene.add(Button(1030, SCREEN_HEIGHT - 110, 120, 40, "Faster", BLUE))
+    skip_input = scene.add(InputBox(720, SCREEN_HEIGHT - 60, 170, 40))
+    skip_button = scene.add(Button(900, SCREEN_HEIGHT - 60, 250, 40, "Skip Ticks", BLUE))
+    profiler = FrameProfiler()
+    profiler_overlay = scene.add(ProfilerOverlay(profiler, (60, 160)))
+    risk = RiskWorker(RISK_HORIZONS[1])
+    risk_panel = scene.add(RiskPanel(risk, (SCREEN_WIDTH - 60, 160)))
+    risk_position, risk_submitted = None, 0
+    scheduler = TickScheduler()
+    feed = getattr(game.model, "feed", None)
+    if feed: risk_panel.note = "a replayed price file has no futures to simulate"
+    running = True
+
+    while running:
+        profiler.begin_frame()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            handle_window_event(event, scene)
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: running = False
+                if event.key == pygame.K_q: game.buy_shares(10)
+                if event.key == pygame.K_w: game.buy_shares(50)
+                if event.key == pygame.K_e: game.buy_shares(100)
+                if event.key == pygame.K_a: game.sell_shares(10)
+                if event.key == pygame.K_s: game.sell_shares(50)
+                if event.key == pygame.K_d: game.sell_shares(100)
+                if event.key == pygame.K_UP: graph_zoom *= 1.1
+                if event.key == pygame.K_DOWN: graph_zoom /= 1.1
+                if event.key == pygame.K_LEFT: graph.pan(-0.25)
+                if event.key == pygame.K_RIGHT: graph.pan(0.25)
+                if event.key == pygame.K_MINUS: graph.zoom_time(2)
+                if event.key == pygame.K_EQUALS: graph.zoom_time(0.5)
+                if event.key == pygame.K_HOME: graph.show_all()
+                if event.key == pygame.K_END: graph.follow()
+                if event.key == pygame.K_c: graph.toggle_candles()
+                if event.key == pygame.K_i: graph.cycle_overlay()
+                if event.key == pygame.K_PERIOD: scheduler.faster()
+                if event.key == pygame.K_COMMA: scheduler.slower()
+                if feed and event.key == pygame.K_LEFTBRACKET: game.seek(feed.position - REPLAY_SEEK_TICKS * scheduler.speed)
+                if feed and event.key == pygame.K_RIGHTBRACKET: game.seek(feed.position + REPLAY_SEEK_TICKS * scheduler.speed)
+                if event.key == pygame.K_F3: profiler_overlay.toggle()
+                if event.key == pygame.K_r: risk_panel.toggle()
+                if event.key == pygame.K_h: risk.horizon = RISK_HORIZONS[(RISK_HORIZONS.index(risk.horizon) + 1) % len(RISK_HORIZONS)]
+                if event.key == pygame.K_F4:
+                    path = os.path.join(game.data_dir, f"trace_{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+                    profiler_overlay.note = f"trace: {profiler.export_chrome_trace(path)}"
+            if event.type == pygame.MOUSEWHEEL:
+                graph_y_offset += event.y * 20
+                if event.x: graph.pan(event.x * 0.05)
+            custom_buy_input.handle_event(event)
+            custom_sell_input.handle_event(event)
+            if skip_input.handle_event(event): skip_button_clicked = True
+            else: skip_button_clicked = event.type == pygame.MOUSEBUTTONDOWN and skip_button.is_clicked(event.pos)
+            if skip_button_clicked:
+                try: game.advance(int(skip_input.text.replace(",", "").replace("_", "")))
+                except ValueError: pass
+                skip_input.text = ""
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                for i,b in enumerate(buy_buttons):
+                    if b.is_clicked(event.pos): game.buy_shares([1,10,50,100][i])
+                if custom_buy_button.is_clicked(event.pos):
+                    try: game.buy_shares(int(custom_buy_input.text)); custom_buy_input.text = ""
+                    except ValueError: custom_buy_input.text = ""
+                if buy_max_button.is_clicked(event.pos): game.buy_shares(game.max_buy())
+                for i,b in enumerate(sell_buttons):
+                    if b.is_clicked(event.pos): game.sell_shares([1,10,50,100][i])
+                if custom_sell_button.is_clicked(event.pos):
+                    try: game.sell_shares(int(custom_sell_input.text)); custom_sell_input.text = ""
+                    except ValueError: custom_sell_input.text = ""
+                if sell_max_button.is_clicked(event.pos): game.sell_shares(game.player_shares)
+                if faster_button.is_clicked(event.pos): scheduler.faster()
+                if slower_button.is_clicked(event.pos): scheduler.slower()
+
+        profiler.mark("events")
+
+        ticks = scheduler.advance(clock.get_time())
+        game.advance(ticks)
+        if risk_panel.visible and not feed:
+            # The estimate runs on the worker thread; the panel shows the last one finished.
+            now = pygame.time.get_ticks()
+            position = (game.player_cash, game.player_shares, risk.horizon)
+            if position != risk_position or (not risk.busy and now - risk_submitted >= RISK_REFRESH_MS):
+                risk.submit(game.player_cash, game.player_shares, game.stock_price, game.model, game.total_ticks)
+                risk_position, risk_submitted = position, now
+        profiler.mark("tick")
+
+        graph.sync(game)
+        graph.set_view(graph_zoom, graph_y_offset)
+        graph.build()
+        profiler.mark("graph")
+
+        start, stop = graph.visible_range()
+        candle_note = f" | {graph.candle_interval():,}-tick candles" if graph.candle_mode else ""
+        overlay_note = f", overlay: {graph.overlay}" if graph.overlay else ""
+        replay_note = "" if not feed else f", replaying line {feed.position:,}" + (" (end of file)" if feed.exhausted else "")
+        range_label.set(f"Ticks {start:,}-{stop:,} of {game.total_ticks:,}{candle_note}{overlay_note}{replay_note}" + ("" if graph.end is None else " (paused view, End to follow)")
+                        + (f" | {game.journal_error}" if game.journal_error else ""))
+        cash_label.set(f"Cash: ${game.player_cash:,.2f}")
+        shares_label.set(f"Shares: {game.player_shares}")
+        portfolio_label.set(f"Portfolio: ${game.portfolio_value:,.2f}")
+        price_color = GREEN if game.stock_price >= game.previous_price else RED
+        price_label.set(f"Stock Price: ${game.stock_price:,.2f}", price_color)
+        speed_label.set(f"Speed: {scheduler.speed:,}x")
+        ledger = game.ledger
+        avg_cost_label.set(f"Avg Cost: ${ledger.average_cost:,.2f}")
+        realized_label.set(f"Realized P&L: ${ledger.realized_pnl:,.2f}", GREEN if ledger.realized_pnl >= 0 else RED)
+        unrealized = ledger.unrealized_pnl(game.stock_price)
+        unrealized_label.set(f"Unrealized P&L: ${unrealized:,.2f}", GREEN if unrealized >= 0 else RED)
+        profiler_overlay.update(pygame.time.get_ticks())
+        risk_panel.update(pygame.time.get_ticks())
+        rects = scene.repaint()
+        profiler.mark("hud")
+        scene.flip(rects)
+        profiler.mark("flip")
+        profiler.end_frame(ticks, scheduler.overdue_ms)
+        clock.tick(60)
+
+    profiler.close()
+    risk.close()
+    game.save_game()
+    game.log_data()
+
+def remote_game(client, market):
+    """Thin client: draw the server's shared market and send this trader's orders to it."""
+    graph_zoom = 1.0
+    scene = Scene(screen)
+    graph = scene.add(PriceGraph((50, 150, SCREEN_WIDTH - 100, 400)))
+    status_label = scene.add(TextLabel("", (50, 555), WHITE, ui.small_font))
+    cash_label = scene.add(TextLabel("", (20, 20), WHITE))
+    shares_label = scene.add(TextLabel("", (20, 60), WHITE))
+    portfolio_label = scene.add(TextLabel("", (20, 100), WHITE))
+    price_label = scene.add(TextLabel("", (SCREEN_WIDTH - 320, 20), GREEN))
+    fill_label = scene.add(TextLabel("", (420, 20), WHITE))
+    scene.add(TextLabel("Buy: Q/W/E (10/50/100)   Sell: A/S/D   Esc: leave", (50, SCREEN_HEIGHT - 90), WHITE, ui.small_font))
+    trading = not client.viewer
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            handle_window_event(event, scene)
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: running = False
+                orders = {pygame.K_q: ("buy", 10), pygame.K_w: ("buy", 50), pygame.K_e: ("buy", 100),
+                          pygame.K_a: ("sell", 10), pygame.K_s: ("sell", 50), pygame.K_d: ("sell", 100)}
+                if trading and event.key in orders and client.connected: client.order(*orders[event.key])
+                if event.key == pygame.K_UP: graph_zoom *= 1.1
+                if event.key == pygame.K_DOWN: graph_zoom /= 1.1
+                if event.key == pygame.K_LEFT: graph.pan(-0.25)
+                if event.key == pygame.K_RIGHT: graph.pan(0.25)
+                if event.key == pygame.K_MINUS: graph.zoom_time(2)
+                if event.key == pygame.K_EQUALS: graph.zoom_time(0.5)
+                if event.key == pygame.K_HOME: graph.show_all()
+                if event.key == pygame.K_END: graph.follow()
+                if event.key == pygame.K_c: graph.toggle_candles()
+                if event.key == pygame.K_i: graph.cycle_overlay()
+
+        market.apply(client.poll())
+        graph.sync(market)
+        graph.set_view(graph_zoom, 0)
+        state = "connected" if client.connected else "disconnected"
+        status_label.set(f"{market.model_name or 'market'} server, {state}: {market.traders:,} traders, {market.total_ticks:,} ticks")
+        if trading:
+            cash_label.set(f"Cash: ${market.player_cash:,.2f}")
+            shares_label.set(f"Shares: {market.player_shares}")
+            portfolio_label.set(f"Portfolio: ${market.portfolio_value:,.2f}")
+        else:
+            cash_label.set("Watching")
+        price_label.set(f"Stock Price: ${market.stock_price:,.2f}", GREEN if market.stock_price >= market.previous_price else RED)
+        fill = market.last_fill
+        if fill:
+            verb = ("Bought" if fill["side"] == "buy" else "Sold") if fill["filled"] else f"Rejected {fill['side']}"
+            fill_label.set(f"{verb} {fill['amount']} @ ${fill['price']:,.2f}", GREEN if fill["filled"] else RED)
+        scene.present()
+        clock.tick(60)
+
+def run_remote(host, port, name=None, watch=False):
+    from .client import MarketClient, RemoteMarket
+    client = MarketClient(host, port, role="viewer" if watch else "trader", name=name)
+    init_display("Stock Trading Simulator - Shared Market")
+    try:
+        remote_game(client, RemoteMarket())
+    finally:
+        client.close()
+        pygame.quit()
+
+def run(model="percent", seed=None):
+    game = Game(model, seed=seed, journal=True)
+    init_display(game.model.caption)
+    try:
+        if start_menu(game) == "start":
+            main_game(game)
+    finally:
+        game.close()
+        pygame.quit()
@@ -0,0 +1,155 @@
+"""Backtest a strategy over a recorded or generated price array.
+
+Two kinds of strategy are accepted. A tick strategy is called as
+``strategy(price, cash, shares)`` (see ``strategies``) and returns an order. It
+may react to the account, so it runs in a plain per-tick loop. A signal strategy
+has a ``positions(prices, cash)`` method that returns the share count to hold at
+every tick, computed up front from the prices alone. Its orders are the
+differences between consecutive targets, and cash follows from one cumulative
+sum, so the whole backtest is a handful of array operations. Both kinds go
+through the ``buy_shares``/``sell_shares`` rules: whole shares, no buying past
+the cash and no selling more than is held. If a target cannot be met (a buy the
+cash does not cover), a short loop chases the targets until the holdings match
+them again, then the array path resumes. The results are exactly the floats a
+per-tick loop would give.
+"""
+import numpy as np
+
+from .game import STARTING_CASH
+from .ledger import LEDGER_DTYPE, Ledger
+from .trading import buy_shares, sell_shares
+
+# Ticks per array step; doubles while targets are met, resets after a missed one.
+MIN_WINDOW = 16
+MAX_CHASE = 1 << 14
+
+
+class BacktestResult:
+    """Per-tick cash and shares (after that tick's trade) and the filled trades."""
+
+    def __init__(self, prices, cash, shares, trades, start_cash):
+        self.prices = prices
+        self.cash = cash
+        self.shares = shares
+        self.trades = trades
+        self.start_cash = start_cash
+
+    @property
+    def equity(self):
+        return self.cash + self.shares * self.prices
+
+    @property
+    def final_equity(self):
+        return float(self.cash[-1] + self.shares[-1] * self.prices[-1]) if len(self.prices) else self.start_cash
+
+    @property
+    def pnl(self):
+        return self.final_equity - self.start_cash
+
+    @property
+    def max_drawdown(self):
+        equity = np.concatenate(([self.start_cash], self.equity))
+        peak = np.maximum.accumulate(equity)
+        return float(((peak - equity) / peak).max())
+
+    @property
+    def n_trades(self):
+        return len(self.trades)
+
+    def ledger(self):
+        return Ledger.from_records(self.trades)
+
+    def summary(self):
+        return {"final_equity": self.final_equity, "pnl": self.pnl, "max_drawdown": self.max_drawdown,
+                "n_trades": self.n_trades, "final_shares": int(self.shares[-1]) if len(self.shares) else 0}
+
+
+def _trades(ticks, amounts, prices):
+    trades = np.empty(len(ticks), dtype=LEDGER_DTYPE)
+    trades["tick"], trades["amount"], trades["price"] = ticks, amounts, prices
+    return trades
+
+
+def _loop(prices, strategy, cash):
+    n = len(prices)
+    cash_out, shares_out = np.empty(n), np.empty(n, dtype=np.int64)
+    shares = 0
+    ticks, amounts = [], []
+    for t, price in enumerate(prices.tolist()):
+        amount = int(strategy(price, cash, shares))
+        if amount > 0: new_cash, new_shares = buy_shares(cash, shares, price, amount)
+        elif amount < 0: new_cash, new_shares = sell_shares(cash, shares, price, -amount)
+        else: new_cash, new_shares = cash, shares
+        if new_shares != shares:
+            ticks.append(t)
+            amounts.append(new_shares - shares)
+        cash, shares = new_cash, new_shares
+        cash_out[t], shares_out[t] = cash, shares
+    return cash_out, shares_out, _trades(ticks, amounts, prices[ticks])
+
+
+def _run_signal(prices, targets, cash):
+    n = len(prices)
+    targets = np.asarray(targets, dtype=np.int64)
+    if targets.shape != prices.shape:
+        raise ValueError(f"positions() returned shape {targets.shape}, expected {prices.shape}")
+    cash_out, shares_out = np.empty(n), targets.copy()
+    trades = []
+    t, shares, window, chase = 0, 0, MIN_WINDOW, MIN_WINDOW
+    while t < n:
+        # Vectorized while every target is met: orders are target differences, and cash
+        # is summed left to right exactly as the loop would.
+        stop = min(n, t + window)
+        orders = targets[t:stop].copy()
+        orders[1:] -= targets[t:stop - 1]
+        orders[0] -= shares
+        cash_after = np.cumsum(np.concatenate(([cash], -(prices[t:stop] * orders))))[1:]
+        # Sells cannot fail while every earlier target was met; a buy fails if it overdraws.
+        failed = np.flatnonzero((targets[t:stop] < 0) | ((orders > 0) & (cash_after < 0)))
+        good = int(failed[0]) if len(failed) else stop - t
+        if good:
+            cash_out[t:t + good] = cash_after[:good]
+            traded = np.flatnonzero(orders[:good])
+            if len(traded): trades.append(_trades(t + traded, orders[traded], prices[t + traded]))
+            cash, shares = float(cash_after[good - 1]), int(targets[t + good - 1])
+            t += good
+        if not len(failed):
+            window *= 2
+            continue
+        # A target was missed: chase the targets tick by tick until the holdings match
+        # again. Where misses come thick and fast, chase for longer before retrying.
+        chase = min(MAX_CHASE, chase * 2) if good < chase else MIN_WINDOW
+        window = MIN_WINDOW
+        ticks, amounts = [], []
+        stop = t
+        while stop < n and (stop == t or shares != targets[stop - 1]):
+            t, stop = stop, min(n, stop + chase)
+            for tick, price, target in zip(range(t, stop), prices[t:stop].tolist(), targets[t:stop].tolist()):
+                amount = target - shares
+                if amount > 0: cash, new_shares = buy_shares(cash, shares, price, amount)
+                else: cash, new_shares = sell_shares(cash, shares, price, -amount)
+                if new_shares != shares:
+                    ticks.append(tick)
+                    amounts.append(new_shares - shares)
+                    shares = new_shares
+                cash_out[tick], shares_out[tick] = cash, shares
+        t = stop
+        if ticks: trades.append(_trades(ticks, amounts, prices[ticks]))
+    return cash_out, shares_out, np.concatenate(trades) if trades else _trades([], [], prices[:0])
+
+
+def backtest(prices, strategy, cash=STARTING_CASH):
+    """Replay ``strategy`` over ``prices``; returns a ``BacktestResult``.
+
+    The strategy trades at every tick's price. Signal strategies (with a
+    ``positions`` method) take the vectorized path.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if prices.ndim != 1:
+        raise ValueError("backtest() takes a single 1-D price path")
+    cash = float(cash)
+    if hasattr(strategy, "positions"):
+        cash_out, shares_out, trades = _run_signal(prices, strategy.positions(prices, cash), cash)
+    else:
+        cash_out, shares_out, trades = _loop(prices, strategy, cash)
+    return BacktestResult(prices, cash_out, shares_out, trades, cash)
@@ -0,0 +1,135 @@
+"""Fit the price models' parameters to a recorded price log.
+
+    python -m stocksim.calibrate data/log_brownian_save_game_brownian_2025-08-04_15-42-13.txt
+
+Each model's one-tick step is fitted by maximum likelihood (``mle``) or by the
+method of moments (``moments``):
+
+* brownian: returns ``r = p[t+1]/p[t] - 1`` are normal with mean ``mu*dt`` and
+  variance ``sigma**2*dt``. The MLE and the moments estimates coincide, apart
+  from the ``n`` vs ``n - 1`` divisor.
+* percent: returns are uniform on ``[-width, width]``. The MLE is ``max |r|``,
+  and the moments estimate is ``sqrt(3 * mean(r**2))``.
+* random: changes ``d = p[t+1] - p[t]`` are uniform on ``[-width, width]``.
+
+Steps that land on the $1 floor are clipped by the game rather than drawn from
+the model, so they are left out. The file is streamed through ``PriceFeed`` and
+reduced to running sums, so logs of any size fit in memory. Each fit also
+reports its log-likelihood of the observed prices, so models can be compared.
+"""
+import math
+
+import numpy as np
+
+from .engine import PRICE_FLOOR
+from .replay import PriceFeed
+
+METHODS = ("mle", "moments")
+READ_TICKS = 1 << 20
+
+
+class StepStats:
+    """Running sums over the unclipped steps of a price series."""
+
+    def __init__(self):
+        self.n = 0
+        self.sum_r = self.sum_r2 = self.max_abs_r = 0.0
+        self.sum_d2 = self.max_abs_d = 0.0
+        self.sum_log_p = 0.0
+
+    def add(self, prices):
+        """Add the steps inside ``prices``; call again with overlapping ends to continue."""
+        prices = np.asarray(prices, dtype=np.float64)
+        before, after = prices[:-1], prices[1:]
+        keep = (after > PRICE_FLOOR) & (before > 0)
+        before, after = before[keep], after[keep]
+        if not len(before): return
+        r = after / before - 1
+        d = after - before
+        self.n += len(r)
+        self.sum_r += float(r.sum())
+        self.sum_r2 += float((r * r).sum())
+        self.max_abs_r = max(self.max_abs_r, float(np.abs(r).max()))
+        self.sum_d2 += float((d * d).sum())
+        self.max_abs_d = max(self.max_abs_d, float(np.abs(d).max()))
+        self.sum_log_p += float(np.log(before).sum())
+
+    @classmethod
+    def from_file(cls, path, column=None):
+        stats = cls()
+        with PriceFeed(path, column) as feed:
+            last = feed.read(1)
+            while not feed.exhausted:
+                chunk = feed.read(READ_TICKS)
+                stats.add(np.concatenate((last, chunk)))
+                last = chunk[-1:]
+        return stats
+
+
+def _uniform_width(max_abs, mean_square, method):
+    return max_abs if method == "mle" else math.sqrt(3 * mean_square)
+
+
+def fit(stats, model, method="mle", dt=1.0):
+    """Returns ``{"model", "params", "log_likelihood", "n"}`` for one model."""
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {METHODS}")
+    n = stats.n
+    if n < 2:
+        raise ValueError("need at least two unclipped price steps to calibrate")
+    if model == "brownian":
+        mean = stats.sum_r / n
+        var = max(stats.sum_r2 / n - mean * mean, 0.0)
+        if method == "moments": var *= n / (n - 1)
+        params = {"mu": mean / dt, "sigma": math.sqrt(var / dt), "dt": dt}
+        # Normal density of p[t+1] given p[t]: sd = p[t]*sigma*sqrt(dt), residual sum from the running sums.
+        sd = math.sqrt(var)
+        residual = stats.sum_r2 - 2 * mean * stats.sum_r + n * mean * mean
+        log_likelihood = (-0.5 * n * math.log(2 * math.pi) - n * math.log(sd) - stats.sum_log_p
+                          - 0.5 * residual / var) if sd > 0 else math.inf
+    elif model == "percent":
+        width = _uniform_width(stats.max_abs_r, stats.sum_r2 / n, method)
+        params = {"width": width}
+        log_likelihood = -n * math.log(2 * width) - stats.sum_log_p if width >= stats.max_abs_r else -math.inf
+    elif model == "random":
+        width = _uniform_width(stats.max_abs_d, stats.sum_d2 / n, method)
+        params = {"width": width}
+        log_likelihood = -n * math.log(2 * width) if width >= stats.max_abs_d else -math.inf
+    else:
+        raise ValueError(f"cannot calibrate model {model!r}; expected brownian, percent or random")
+    return {"model": model, "params": params, "log_likelihood": log_likelihood, "n": n}
+
+
+def calibrate(path, models=("brownian", "percent", "random"), method="mle", column=None, dt=1.0):
+    """Fit every model in ``models`` to the price file at ``path``, best log-likelihood first."""
+    stats = StepStats.from_file(path, column)
+    fits = [fit(stats, model, method, dt) for model in models]
+    return sorted(fits, key=lambda f: f["log_likelihood"], reverse=True)
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="python -m stocksim.calibrate", description="Fit price-model parameters to a price log or CSV")
+    parser.add_argument("path", help="price log (one price per line) or CSV")
+    parser.add_argument("--model", action="append", choices=("brownian", "percent", "random"), help="model to fit (repeatable; default all)")
+    parser.add_argument("--method", choices=METHODS, default="mle")
+    parser.add_argument("--column", help="CSV price column, by name or index")
+    parser.add_argument("--dt", type=float, default=1.0, help="time step of one tick (brownian)")
+    parser.add_argument("--json", action="store_true", help="print the fits as JSON")
+    args = parser.parse_args(argv)
+
+    column = int(args.column) if args.column and args.column.isdigit() else args.column
+    fits = calibrate(args.path, tuple(args.model or ("brownian", "percent", "random")), args.method, column, args.dt)
+    if args.json:
+        print(json.dumps(fits, indent=2))
+        return
+    print(f"{fits[0]['n']:,} steps from {args.path} ({args.method})")
+    for f in fits:
+        params = ", ".join(f"{k}={v:.6g}" for k, v in f["params"].items())
+        print(f"  {f['model']:<9} {params:<40} log-likelihood {f['log_likelihood']:,.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Streaming OHLC candles at fixed tick intervals.
+
+Every tick is folded into the current candle of each interval, and a new candle
+starts at each interval boundary. Candle ``i`` of interval ``n`` covers ticks
+``[i*n, (i+1)*n)`` of the session, and the newest candle may still be open.
+Candles live in preallocated ``(4, capacity)`` arrays that double when full, and
+they are saved next to the save file so loading does not rebuild them from raw
+ticks.
+
+The candle file is append-only, so a save costs the candles since the previous
+one rather than the whole session. Layout (little-endian)::
+
+    header     16 bytes     magic, version, number of intervals
+    intervals  8 * n        candle intervals in ticks
+    records    24 bytes     first tick, tick count after the save, payload size
+               + payload    per interval, the (4, k) open/high/low/close candles
+                            covering ticks [first, count)
+
+Each save appends one record starting at the candle that was still open at the
+previous save, which it rewrites. Loading applies the records in order. A torn
+final record from a crash mid-save is ignored and overwritten by the next save.
+"""
+import os
+import struct
+
+import numpy as np
+
+CANDLE_INTERVALS = (10, 100, 1000)
+CANDLE_EXT = ".candles"
+MAGIC = b"STKCNDL\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<QQQ")
+O, H, L, C = range(4)
+
+
+class CandleFileError(ValueError):
+    pass
+
+
+class CandleSeries:
+    def __init__(self, interval, capacity=4096):
+        self.interval = interval
+        self.data = np.empty((4, capacity))
+        self.ticks = 0
+
+    def __len__(self):
+        return -(-self.ticks // self.interval)
+
+    @property
+    def open(self): return self.data[O, :len(self)]
+    @property
+    def high(self): return self.data[H, :len(self)]
+    @property
+    def low(self): return self.data[L, :len(self)]
+    @property
+    def close(self): return self.data[C, :len(self)]
+
+    def _reserve(self, candles):
+        if candles > self.data.shape[1]:
+            grown = np.empty((4, max(candles, 2 * self.data.shape[1])))
+            grown[:, :self.data.shape[1]] = self.data
+            self.data = grown
+
+    def append(self, price):
+        i = self.ticks // self.interval
+        self._reserve(i + 1)
+        if self.ticks % self.interval == 0:
+            self.data[:, i] = price
+        else:
+            if price > self.data[H, i]: self.data[H, i] = price
+            if price < self.data[L, i]: self.data[L, i] = price
+            self.data[C, i] = price
+        self.ticks += 1
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64).ravel()
+        if len(prices) == 0: return
+        first = self.ticks // self.interval
+        offset = self.ticks % self.interval
+        # Group the new ticks by candle; the first group may continue an open candle.
+        starts = np.arange(0, len(prices) + offset, self.interval) - offset
+        starts[0] = 0
+        ends = np.append(starts[1:], len(prices)) - 1
+        stop = first + len(starts)
+        self._reserve(stop)
+        high = np.maximum.reduceat(prices, starts)
+        low = np.minimum.reduceat(prices, starts)
+        if offset:
+            high[0] = max(high[0], self.data[H, first])
+            low[0] = min(low[0], self.data[L, first])
+        else:
+            self.data[O, first] = prices[0]
+        self.data[O, first + 1:stop] = prices[starts[1:]]
+        self.data[H, first:stop] = high
+        self.data[L, first:stop] = low
+        self.data[C, first:stop] = prices[ends]
+        self.ticks += len(prices)
+
+    def clear(self):
+        self.ticks = 0
+
+    def range(self, start, stop):
+        """Candles overlapping ticks ``[start, stop)`` as (first index, open, high, low, close)."""
+        first, last = start // self.interval, min(len(self), -(-stop // self.interval))
+        o, h, l, c = self.data[:, first:max(first, last)]
+        return first, o, h, l, c
+
+
+class CandleAggregator:
+    def __init__(self, intervals=CANDLE_INTERVALS):
+        self.series = {interval: CandleSeries(interval) for interval in intervals}
+        self._saved = None  # (path, tick count, file size) as of the last save or load
+
+    def __getitem__(self, interval):
+        return self.series[interval]
+
+    @property
+    def ticks(self):
+        return next(iter(self.series.values())).ticks
+
+    def append(self, price):
+        for series in self.series.values(): series.append(price)
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        for series in self.series.values(): series.extend(prices)
+
+    def clear(self):
+        for series in self.series.values(): series.clear()
+        self._saved = None
+
+    @classmethod
+    def from_prices(cls, prices, intervals=CANDLE_INTERVALS):
+        aggregator = cls(intervals)
+        aggregator.extend(prices)
+        return aggregator
+
+    # --- Persistence ---
+    def save(self, path):
+        self.write(self.unsaved(path))
+
+    def unsaved(self, path, append=True):
+        """What ``save(path)`` writes: a copy of the candles changed since the last save to ``path``
+        (all of them, in a new file, with ``append=False``).
+
+        Pass it to ``write`` to do the disk work later or on another thread.
+        """
+        appendable = append and self._saved and self._saved[0] == path and os.path.exists(path)
+        saved = self._saved if appendable else (path, 0, 0)
+        _, start, offset = saved
+        payload = b"".join(series.data[:, start // series.interval:len(series)].tobytes() for series in self.series.values())
+        return path, offset, start, self.ticks, payload
+
+    def write(self, unsaved):
+        path, offset, start, ticks, payload = unsaved
+        record = RECORD.pack(start, ticks, len(payload)) + payload
+        if offset == 0:
+            intervals = np.array(list(self.series), dtype="<u8")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(intervals)) + intervals.tobytes() + record)
+            os.replace(tmp_path, path)
+            offset = HEADER.size + intervals.nbytes
+        else:
+            with open(path, "r+b") as f:
+                f.seek(offset)
+                f.write(record)
+                f.truncate()
+        self._saved = (path, ticks, offset + len(record))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        if len(raw) < HEADER.size:
+            raise CandleFileError(f"{path}: truncated header")
+        magic, version, n_intervals = HEADER.unpack_from(raw)
+        if magic != MAGIC or version > VERSION:
+            raise CandleFileError(f"{path}: not a supported candle file")
+        aggregator = cls(tuple(np.frombuffer(raw, dtype="<u8", count=n_intervals, offset=HEADER.size).tolist()))
+        offset, ticks = HEADER.size + 8 * n_intervals, 0
+        while offset + RECORD.size <= len(raw):
+            start, end, size = RECORD.unpack_from(raw, offset)
+            spans = [(start // s.interval, -(-end // s.interval)) for s in aggregator.series.values()]
+            if start > ticks or size != 32 * sum(stop - first for first, stop in spans) or offset + RECORD.size + size > len(raw):
+                break  # torn by a crash mid-save
+            block = np.frombuffer(raw, dtype="<f8", count=size // 8, offset=offset + RECORD.size)
+            for series, (first, stop) in zip(aggregator.series.values(), spans):
+                series._reserve(stop)
+                series.data[:, first:stop] = block[:4 * (stop - first)].reshape(4, -1)
+                block = block[4 * (stop - first):]
+                series.ticks = end
+            offset, ticks = offset + RECORD.size + size, end
+        aggregator._saved = (path, ticks, offset)
+        return aggregator
+
+
+def candles_path(save_path):
+    return os.path.splitext(save_path)[0] + CANDLE_EXT
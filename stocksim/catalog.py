@@ -0,0 +1,145 @@
+"""SQLite index of the save files in the data directory.
+
+The load menu pages, sorts and searches this index instead of listing the
+directory and opening saves. ``Game.save_game`` records each save as it is
+written; ``refresh`` brings the index up to date with the directory, re-reading
+only the saves whose size or modification time changed since they were indexed
+(a binary save's header is enough) and dropping rows for deleted files.
+
+The index only ever holds what the save files already say, so it is written
+without fsync and is simply rebuilt if it goes missing or is unreadable.
+"""
+import os
+import sqlite3
+
+from .models import MODELS, model_for_save
+from .savefile import LEGACY_EXT, SAVE_EXT, SaveFileError, read_header, read_json_save
+
+CATALOG_NAME = "catalog.sqlite"
+SCHEMA_VERSION = 1
+SORTS = {"played": "played", "name": "name COLLATE NOCASE", "equity": "equity", "ticks": "ticks"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    filename TEXT PRIMARY KEY,
+    stem TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    name TEXT NOT NULL,
+    model TEXT,
+    played REAL NOT NULL,
+    cash REAL NOT NULL,
+    shares INTEGER NOT NULL,
+    price REAL NOT NULL,
+    equity REAL NOT NULL,
+    ticks INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saves_model_played ON saves (model, played);
+CREATE INDEX IF NOT EXISTS saves_model_name ON saves (model, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS saves_model_equity ON saves (model, equity);
+CREATE INDEX IF NOT EXISTS saves_stem ON saves (stem, ext);
+"""
+_COLUMNS = ("filename", "name", "model", "played", "cash", "shares", "price", "equity", "ticks")
+# A binary save hides the legacy JSON save it was migrated from.
+_VISIBLE = f"NOT (ext = '{LEGACY_EXT}' AND EXISTS (SELECT 1 FROM saves s WHERE s.stem = saves.stem AND s.ext = '{SAVE_EXT}'))"
+
+
+def save_name(filename, model):
+    stem = os.path.splitext(filename)[0]
+    suffix = MODELS[model].save_suffix if model in MODELS else ""
+    return stem[:len(stem) - len(suffix)]
+
+
+def _summary(path):
+    """(cash, shares, price, ticks) from a save's header, or the JSON for a legacy save."""
+    if path.endswith(SAVE_EXT):
+        header = read_header(path)
+        return header["cash"], header["shares"], header["price"], header["count"]
+    cash, shares, price, history = read_json_save(path)
+    return cash, shares, price, len(history)
+
+
+class SaveCatalog:
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, CATALOG_NAME)
+        os.makedirs(data_dir, exist_ok=True)
+        try:
+            self.db = self._open()
+        except sqlite3.DatabaseError:
+            os.remove(self.path)  # a damaged index: start over from the save files
+            self.db = self._open()
+
+    def _open(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA synchronous = OFF")
+        if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            db.execute("DROP TABLE IF EXISTS saves")
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.executescript(_SCHEMA)
+        return db
+
+    def close(self):
+        self.db.close()
+
+    # --- Updating ---
+    def _row(self, filename, stat, cash, shares, price, ticks):
+        stem, ext = os.path.splitext(filename)
+        model = model_for_save(filename)
+        return (filename, stem, ext, save_name(filename, model), model, stat.st_mtime,
+                cash, shares, price, cash + shares * price, ticks, stat.st_size, stat.st_mtime_ns)
+
+    def _upsert(self, rows):
+        self.db.executemany("INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def record(self, filename, cash, shares, price, ticks):
+        """Index a save just written by the game, without reading it back."""
+        stat = os.stat(os.path.join(self.data_dir, filename))
+        with self.db:
+            self._upsert([self._row(filename, stat, cash, shares, price, ticks)])
+
+    def refresh(self):
+        """Re-index saves added or changed on disk since they were last seen; returns how many changed."""
+        known = {f: (size, mtime) for f, size, mtime in self.db.execute("SELECT filename, size, mtime_ns FROM saves")}
+        rows, seen = [], set()
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1] not in (SAVE_EXT, LEGACY_EXT) or not entry.is_file(): continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                if known.get(entry.name) == (stat.st_size, stat.st_mtime_ns): continue
+                try:
+                    rows.append(self._row(entry.name, stat, *_summary(entry.path)))
+                except (OSError, ValueError, KeyError, SaveFileError):
+                    continue  # not a readable save; it stays out of the menu
+        gone = [(f,) for f in known.keys() - seen]
+        with self.db:
+            self._upsert(rows)
+            self.db.executemany("DELETE FROM saves WHERE filename = ?", gone)
+        return len(rows) + len(gone)
+
+    # --- Queries ---
+    def _where(self, model, search):
+        clauses, args = [_VISIBLE], []
+        if model is not None:
+            clauses.append("model = ?")
+            args.append(model)
+        if search:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            args.append("%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        return " AND ".join(clauses), args
+
+    def count(self, model=None, search=""):
+        where, args = self._where(model, search)
+        return self.db.execute(f"SELECT COUNT(*) FROM saves WHERE {where}", args).fetchone()[0]
+
+    def query(self, model=None, search="", sort="played", descending=True, limit=None, offset=0):
+        """Save rows as dicts (filename, name, model, played, cash, shares, price, equity, ticks)."""
+        if sort not in SORTS:
+            raise ValueError(f"unknown sort {sort!r}; expected one of {sorted(SORTS)}")
+        where, args = self._where(model, search)
+        order = f"{SORTS[sort]} {'DESC' if descending else 'ASC'}, filename"
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM saves WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?"
+        rows = self.db.execute(sql, args + [-1 if limit is None else limit, offset])
+        return [dict(zip(_COLUMNS, row)) for row in rows]
@@ -0,0 +1,121 @@
+"""Blocking client for the market server, for the pygame viewer and scripts.
+
+A background thread reads the server's JSON lines into a queue, and the frame
+loop drains it with ``poll`` once per frame, so the display never waits on the
+network. ``RemoteMarket`` folds those messages into the same price history,
+candles and indicators a local ``Game`` keeps, which lets ``PriceGraph`` draw a
+remote market unchanged.
+"""
+import json
+import queue
+import socket
+import threading
+
+import numpy as np
+
+from .candles import CandleAggregator
+from .history import PriceHistory
+from .indicators import IndicatorSet
+from .server import DEFAULT_HOST, DEFAULT_PORT, TRADER, VIEWER, _encode
+
+
+class MarketClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, role=TRADER, name=None, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.settimeout(None)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.messages = queue.SimpleQueue()
+        self.connected = True
+        self.viewer = role == VIEWER
+        self._next_ref = 0
+        self._send({"op": "hello", "role": role, "name": name})
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _send(self, message):
+        self.sock.sendall(_encode(message))
+
+    def _read(self):
+        try:
+            with self.sock.makefile("rb") as lines:
+                for line in lines: self.messages.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self.connected = False
+
+    def order(self, side, amount):
+        """Send a market order; returns its ``ref``, echoed in the matching fill."""
+        self._next_ref += 1
+        self._send({"op": "order", "side": side, "amount": amount, "ref": self._next_ref})
+        return self._next_ref
+
+    def poll(self):
+        """Every message received since the last call."""
+        out = []
+        while True:
+            try: out.append(self.messages.get_nowait())
+            except queue.Empty: return out
+
+    def close(self):
+        try: self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError: pass
+        self.sock.close()
+
+
+class RemoteMarket:
+    """The server's market as seen by one client: prices plus this trader's account."""
+
+    def __init__(self):
+        self.stock_history = PriceHistory()
+        self.candles = CandleAggregator()
+        self.indicators = IndicatorSet()
+        self.model_name = None
+        self.player_cash = self.player_shares = 0
+        self.traders = 0
+        self.last_fill = None
+
+    @property
+    def stock_price(self):
+        return self.stock_history[-1] if len(self.stock_history) else 0.0
+
+    @property
+    def previous_price(self):
+        return self.stock_history[-2] if len(self.stock_history) > 1 else self.stock_price
+
+    @property
+    def total_ticks(self):
+        return len(self.stock_history)
+
+    @property
+    def portfolio_value(self):
+        return self.player_shares * self.stock_price
+
+    def apply(self, messages):
+        """Fold ``MarketClient.poll`` output into the view; consecutive ticks are added in one batch."""
+        ticks = []
+        for message in messages:
+            kind = message.get("type")
+            if kind == "tick":
+                ticks.append(message["price"])
+                self.traders = message.get("traders", self.traders)
+                continue
+            self._extend(ticks)
+            ticks = []
+            if kind == "welcome":
+                self.model_name = message["model"]
+                self.stock_history = PriceHistory(message["history"])
+                self.candles = CandleAggregator.from_prices(self.stock_history.values())
+                self.indicators = IndicatorSet.from_prices(self.stock_history.values())
+                self.player_cash, self.player_shares = message.get("cash", 0), message.get("shares", 0)
+            elif kind == "fill":
+                self.player_cash, self.player_shares = message["cash"], message["shares"]
+                self.last_fill = message
+        self._extend(ticks)
+
+    def _extend(self, prices):
+        if not prices: return
+        prices = np.asarray(prices, dtype=np.float64)
+        self.stock_history.extend(prices)
+        self.candles.extend(prices)
+        self.indicators.extend(prices)
+
@@ -0,0 +1,210 @@
+"""Headless, vectorized price-path generation for every price model.
+
+Each generator returns an ``(n_paths, n_steps + 1)`` float64 array whose first
+column is the start price, and applies the same ``stock_price < 1`` floor as the
+tick-by-tick ``update_stock_price_func`` in the game scripts.
+"""
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from .rng import RandomStream
+
+START_PRICE = 50.0
+PRICE_FLOOR = 1.0
+
+# Smallest growth factor fed to log(); anything this small lands on the floor anyway.
+_MIN_FACTOR = 1e-300
+# Ticks per step of the GARCH variance scan, and how far (in log) its running products may fall.
+GARCH_BLOCK = 256
+MAX_LOG_SPAN = 600.0
+
+
+def _as_rng(rng):
+    return rng if isinstance(rng, (np.random.Generator, RandomStream)) else np.random.default_rng(rng)
+
+
+def _floored_walk(start, increments, floor):
+    # Solves x[t+1] = max(x[t] + inc[t], floor) for all t at once (Lindley recursion):
+    # x[t] = floor + S[t] + max(x[0] - floor, -min(S[1..t])), with S the running sum.
+    start = np.asarray(start, dtype=np.float64).reshape(-1, 1)
+    paths = np.empty((increments.shape[0], increments.shape[1] + 1))
+    paths[:, :1] = start
+    running = np.cumsum(increments, axis=1)
+    lowest = np.minimum.accumulate(running, axis=1)
+    np.maximum(start - floor, -lowest, out=lowest)
+    np.add(running, lowest, out=paths[:, 1:])
+    paths[:, 1:] += floor
+    return paths
+
+
+def _floored_product(start, factors):
+    # Multiplicative models walk in log space so the floor stays a single max().
+    np.maximum(factors, _MIN_FACTOR, out=factors)
+    log_paths = _floored_walk(np.log(start), np.log(factors, out=factors), np.log(PRICE_FLOOR))
+    return np.exp(log_paths, out=log_paths)
+
+
+def percent_paths(n_paths, n_steps, start=START_PRICE, rng=None, width=0.05):
+    """stock_sim.py: price *= 1 + uniform(-width, width)."""
+    factors = _as_rng(rng).uniform(1 - width, 1 + width, size=(n_paths, n_steps))
+    return _floored_product(start, factors)
+
+
+def additive_paths(n_paths, n_steps, start=START_PRICE, rng=None, width=5.0):
+    """stock_sim_random.py: price += uniform(-width, width)."""
+    changes = _as_rng(rng).uniform(-width, width, size=(n_paths, n_steps))
+    return _floored_walk(start, changes, PRICE_FLOOR)
+
+
+def gbm_paths(n_paths, n_steps, start=START_PRICE, rng=None, mu=0.0005, sigma=0.02, dt=1.0):
+    """stock_sim_brownian.py: price += price * (mu*dt + sigma*gauss(0, 1)*sqrt(dt))."""
+    factors = _as_rng(rng).standard_normal(size=(n_paths, n_steps))
+    factors *= sigma * np.sqrt(dt)
+    factors += 1 + mu * dt
+    return _floored_product(start, factors)
+
+
+def correlated_gbm_paths(n_steps, start, rng=None, mu=0.0005, sigma=0.02, cholesky=None, dt=1.0):
+    """GBM for several assets at once, shocks correlated through a lower-triangular ``cholesky`` factor.
+
+    ``start``, ``mu`` and ``sigma`` are per-asset (or scalars); returns ``(n_assets, n_steps + 1)``.
+    """
+    start = np.atleast_1d(np.asarray(start, dtype=np.float64))
+    n_assets = len(start)
+    shocks = _as_rng(rng).standard_normal(size=(n_steps, n_assets))
+    if cholesky is not None: shocks = shocks @ cholesky.T
+    factors = np.ascontiguousarray(shocks.T)
+    factors *= (np.broadcast_to(sigma, n_assets) * np.sqrt(dt))[:, None]
+    factors += (1 + np.broadcast_to(mu, n_assets) * dt)[:, None]
+    return _floored_product(start, factors)
+
+
+def event_threshold(probability):
+    """``z`` with ``P(Z < z) = probability`` for a standard normal ``Z``.
+
+    Lets a model decide an event with one normal draw, so it keeps to a single
+    kind of draw (see ``rng.RandomStream``).
+    """
+    if probability <= 0: return -np.inf
+    if probability >= 1: return np.inf
+    return NormalDist().inv_cdf(probability)
+
+
+def jump_diffusion_paths(n_paths, n_steps, start=START_PRICE, rng=None, mu=0.0005, sigma=0.02,
+                         jump_rate=0.01, jump_mu=-0.02, jump_sigma=0.08, dt=1.0):
+    """Merton jump-diffusion: a GBM tick, then a jump that multiplies the price by ``exp(N(jump_mu, jump_sigma))``.
+
+    Jumps arrive as a Poisson process with ``jump_rate`` per unit time, thinned to at
+    most one per tick. Each tick draws three normals: shock, jump decision and jump size.
+    """
+    draws = _as_rng(rng).standard_normal(size=(n_paths, n_steps, 3))
+    factors = draws[..., 0] * (sigma * np.sqrt(dt))
+    factors += 1 + mu * dt
+    jumped = draws[..., 1] < event_threshold(-np.expm1(-jump_rate * dt))
+    factors[jumped] *= np.exp(jump_mu + jump_sigma * draws[..., 2][jumped])
+    return _floored_product(start, factors)
+
+
+def garch_long_run_variance(omega, alpha, beta):
+    if alpha + beta >= 1:
+        raise ValueError(f"GARCH(1,1) needs alpha + beta < 1 for a long-run variance, got {alpha + beta:g}")
+    return omega / (1 - alpha - beta)
+
+
+def _affine_scan(a, c, x0, block=GARCH_BLOCK):
+    # Solves x[t+1] = a[t]*x[t] + c along axis 1, a block of ticks at a time. Inside a block,
+    # with P[k] the running product of a, x[k] = P[k] * (x[0] + c * sum(1/P[1..k])); the block
+    # length keeps P within float range. Returns x[0..n-1] (the value each tick starts from) and x[n].
+    n_paths, n_steps = a.shape
+    x = np.empty((n_paths, n_steps))
+    current = np.broadcast_to(np.asarray(x0, dtype=np.float64), (n_paths,)).copy()
+    np.maximum(a, _MIN_FACTOR, out=a)
+    for lo in range(0, n_steps, block):
+        log_p = np.cumsum(np.log(a[:, lo:lo + block]), axis=1)
+        x[:, lo] = current
+        ends = np.exp(log_p) * (current[:, None] + c * np.cumsum(np.exp(-log_p), axis=1))
+        x[:, lo + 1:lo + block] = ends[:, :-1]
+        current = ends[:, -1]
+    return x, current
+
+
+def _garch_block(beta):
+    # Each tick multiplies the variance by at least beta; keep a block's product above exp(-MAX_LOG_SPAN).
+    if beta >= 1: return GARCH_BLOCK
+    if beta <= 0: return 1
+    return max(1, min(GARCH_BLOCK, int(MAX_LOG_SPAN / -math.log(beta))))
+
+
+def garch_paths(n_paths, n_steps, start=START_PRICE, rng=None, mu=0.0005, omega=8e-6, alpha=0.08, beta=0.9, state=None):
+    """GARCH(1,1) returns: ``r = mu + sqrt(h)*z`` and ``h' = omega + alpha*h*z**2 + beta*h``.
+
+    ``state["variance"]`` holds each path's starting conditional variance (the long-run
+    variance if missing) and is updated to the variance after the last tick.
+    """
+    shocks = _as_rng(rng).standard_normal(size=(n_paths, n_steps))
+    variance0 = garch_long_run_variance(omega, alpha, beta) if state is None or "variance" not in state else state["variance"]
+    variance, final = _affine_scan(alpha * shocks * shocks + beta, omega, variance0, _garch_block(beta))
+    if state is not None: state["variance"] = final
+    factors = np.sqrt(variance, out=variance)
+    factors *= shocks
+    factors += 1 + mu
+    return _floored_product(start, factors)
+
+
+def _compose_scan(to_0, to_1):
+    # Running composition of per-tick maps on {0, 1} along axis 1 (Hillis-Steele doubling).
+    # A map is (where 0 goes, where 1 goes); afterwards column t maps the regime before tick 0
+    # to the regime after tick t.
+    shift = 1
+    while shift < to_0.shape[1]:
+        before_0, before_1 = to_0[:, :-shift], to_1[:, :-shift]
+        after_0, after_1 = to_0[:, shift:], to_1[:, shift:]
+        to_0[:, shift:], to_1[:, shift:] = np.where(before_0, after_1, after_0), np.where(before_1, after_1, after_0)
+        shift *= 2
+    return to_0, to_1
+
+
+def regime_paths(n_paths, n_steps, start=START_PRICE, rng=None, mu_calm=0.0008, sigma_calm=0.01,
+                 mu_turbulent=-0.002, sigma_turbulent=0.04, p_enter=0.01, p_exit=0.05, dt=1.0, state=None):
+    """Two-state Markov regime switching: GBM ticks whose drift and volatility depend on the regime.
+
+    The regime (0 calm, 1 turbulent) turns turbulent with probability ``p_enter`` and calm
+    again with ``p_exit`` after each tick. Each tick draws two normals: shock, then switch.
+    ``state["regime"]`` holds each path's starting regime (calm if missing) and is updated
+    to the regime after the last tick.
+    """
+    draws = _as_rng(rng).standard_normal(size=(n_paths, n_steps, 2))
+    regime0 = np.zeros(n_paths, dtype=bool) if state is None or "regime" not in state else np.asarray(state["regime"]).astype(bool)
+    regime0 = np.broadcast_to(regime0, (n_paths,))
+    switch = draws[..., 1]
+    after_0, after_1 = _compose_scan(switch < event_threshold(p_enter), switch >= event_threshold(p_exit))
+    after = np.where(regime0[:, None], after_1, after_0)
+    turbulent = np.empty((n_paths, n_steps), dtype=bool)
+    turbulent[:, :1] = regime0[:, None]
+    turbulent[:, 1:] = after[:, :-1]
+    if state is not None: state["regime"] = (after[:, -1] if n_steps else regime0).astype(np.int64)
+    factors = draws[..., 0] * np.where(turbulent, sigma_turbulent, sigma_calm)
+    factors *= np.sqrt(dt)
+    factors += 1 + np.where(turbulent, mu_turbulent, mu_calm) * dt
+    return _floored_product(start, factors)
+
+
+PATH_GENERATORS = {
+    "percent": percent_paths,
+    "random": additive_paths,
+    "brownian": gbm_paths,
+    "jump": jump_diffusion_paths,
+    "garch": garch_paths,
+    "regime": regime_paths,
+}
+
+
+def generate_paths(model, n_paths, n_steps, start=START_PRICE, rng=None, **params):
+    """Generate paths for a model by name; extra keyword arguments are model parameters."""
+    try:
+        generator = PATH_GENERATORS[model]
+    except KeyError:
+        raise ValueError(f"unknown price model {model!r}; expected one of {sorted(PATH_GENERATORS)}") from None
+    return generator(n_paths, n_steps, start=start, rng=rng, **params)
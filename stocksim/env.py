@@ -0,0 +1,142 @@
+"""Gym-style trading environments for bots and reinforcement learning.
+
+``TradingEnv`` is the ``main_game`` loop with the display and the real-time
+clock removed. ``step(action)`` trades ``action`` shares at the current price
+(positive buys, negative sells) through ``buy_shares``/``sell_shares``. It then
+advances the price one ``update_stock_price_func`` tick with the model's
+``step``. With the same seed it sees the same prices as a ``Game``.
+
+``VectorTradingEnv`` steps many independent accounts at once. Accounts are
+arrays and orders go through ``trading.apply_orders``. Prices do not depend on
+the actions, so they are generated ``block`` ticks at a time through the
+model's vectorized ``paths``. A step is therefore a few array operations over
+all environments.
+
+Both follow the Gymnasium API without depending on it:
+``reset(seed=None) -> (observation, info)`` and
+``step(action) -> (observation, reward, terminated, truncated, info)``.
+An observation holds ``OBSERVATION_FIELDS``. The reward is the change in
+equity over the step. An episode terminates when the account is broke (no
+shares, and less cash than one share costs). It is truncated after
+``max_steps`` steps. The vector environment resets finished environments by
+itself and returns their last observation in ``info["final_observation"]``.
+"""
+import numpy as np
+
+from .game import STARTING_CASH
+from .models import PriceModel, get_model
+from .rng import RandomStream
+from .trading import apply_orders, buy_shares, sell_shares
+
+OBSERVATION_FIELDS = ("price", "cash", "shares", "equity")
+DEFAULT_MAX_STEPS = 1000
+PRICE_BLOCK = 256
+
+
+class TradingEnv:
+    def __init__(self, model="percent", cash=STARTING_CASH, max_steps=DEFAULT_MAX_STEPS, seed=None):
+        self.model = model if isinstance(model, PriceModel) else get_model(model)
+        self.starting_cash = cash
+        self.max_steps = max_steps
+        self.rng = RandomStream(seed)
+        self.reset()
+
+    def _observation(self):
+        return np.array((self.price, self.cash, self.shares, self.cash + self.shares * self.price))
+
+    def reset(self, seed=None):
+        """Start a new episode; a ``seed`` reseeds the price stream, otherwise it carries on."""
+        if seed is not None: self.rng = RandomStream(seed)
+        self.price = self.model.reset()
+        self.cash = self.starting_cash
+        self.shares = 0
+        self.steps = 0
+        return self._observation(), {}
+
+    def step(self, action):
+        amount = int(action)
+        price = self.price
+        before = self.cash + self.shares * price
+        held = self.shares
+        if amount > 0: self.cash, self.shares = buy_shares(self.cash, self.shares, price, amount)
+        elif amount < 0: self.cash, self.shares = sell_shares(self.cash, self.shares, price, -amount)
+        self.price = self.model.step(price, self.rng)
+        self.steps += 1
+        observation = self._observation()
+        terminated = self.shares == 0 and self.cash < self.price
+        truncated = self.steps >= self.max_steps
+        return observation, observation[3] - before, terminated, truncated, {"filled": self.shares != held}
+
+
+class VectorTradingEnv:
+    def __init__(self, n_envs, model="percent", cash=STARTING_CASH, max_steps=DEFAULT_MAX_STEPS, seed=None, block=PRICE_BLOCK):
+        self.model = model if isinstance(model, PriceModel) else get_model(model)
+        self.n_envs = n_envs
+        self.starting_cash = cash
+        self.max_steps = max_steps
+        self.block = block
+        self.rng = RandomStream(seed)
+        self.reset()
+
+    def _paths(self, start, n_steps, state):
+        # (n_steps + 1, len(start)): row 0 is the start price, one row per tick after it.
+        # ``state`` carries stateful models (e.g. a GARCH variance) from one block to the next.
+        paths = np.ascontiguousarray(self.model.paths(len(start), n_steps, start=start, rng=self.rng, state=state).T)
+        paths[0] = start  # exactly, not through the generator's log/exp round trip
+        return paths
+
+    def _observation(self):
+        observation = np.empty((self.n_envs, len(OBSERVATION_FIELDS)))
+        observation[:, 0] = self.price
+        observation[:, 1] = self.cash
+        observation[:, 2] = self.shares
+        observation[:, 3] = self.cash + self.shares * self.price
+        return observation
+
+    @property
+    def price(self):
+        return self._prices[self._row]
+
+    def reset(self, seed=None):
+        """Start every environment over; returns ``(observations, info)``."""
+        if seed is not None: self.rng = RandomStream(seed)
+        self.cash = np.full(self.n_envs, float(self.starting_cash))
+        self.shares = np.zeros(self.n_envs, dtype=np.int64)
+        self.steps = np.zeros(self.n_envs, dtype=np.int64)
+        self._path_state = {}
+        self._prices = self._paths(np.full(self.n_envs, self.model.reset()), self.block, self._path_state)
+        self._row = 0
+        return self._observation(), {}
+
+    def _reset_done(self, done):
+        index = np.flatnonzero(done)
+        self.cash[index] = self.starting_cash
+        self.shares[index] = 0
+        self.steps[index] = 0
+        # Regenerate the rest of the current price block for just these environments.
+        fresh = {}
+        self._prices[self._row:, index] = self._paths(np.full(len(index), self.model.reset()), len(self._prices) - 1 - self._row, fresh)
+        for key, values in fresh.items(): self._path_state[key][index] = values
+
+    def step(self, actions):
+        """Trade ``actions`` (one signed share count per environment, or one for all) and advance one tick."""
+        price = self.price
+        before = self.cash + self.shares * price
+        amounts = np.broadcast_to(np.asarray(actions, dtype=np.int64), (self.n_envs,))
+        filled = apply_orders(self.cash, self.shares, price, amounts)
+        self._row += 1
+        if self._row == len(self._prices):
+            self._prices = self._paths(self._prices[-1], self.block, self._path_state)
+            self._row = 1
+        self.steps += 1
+        observation = self._observation()
+        reward = observation[:, 3] - before
+        terminated = (self.shares == 0) & (self.cash < self.price)
+        truncated = self.steps >= self.max_steps
+        info = {"filled": filled}
+        done = terminated | truncated
+        if done.any():
+            info["final_observation"] = observation
+            self._reset_done(done)
+            observation = self._observation()
+        return observation, reward, terminated, truncated, info
@@ -0,0 +1,364 @@
+"""Headless game state: cash, shares, price history, trades and save files.
+
+Nothing here imports pygame, so a ``Game`` can run in worker processes, scripts
+and test harnesses without a display.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+from .candles import CandleAggregator, CandleFileError, candles_path
+from .catalog import SaveCatalog
+from .engine import START_PRICE
+from .history import PriceHistory
+from .journal import JOURNAL_EXT, ORDER_DONE, TICK, TRADE, TRIGGER, JournalError, TickJournal, read_journal
+from .indicators import IndicatorSet
+from .ledger import Ledger
+from .models import PriceModel, get_model
+from .orderbook import OrderBook
+from .rng import RandomStream
+from .savefile import LEGACY_EXT, SAVE_EXT, load_history, load_ledger, read_header, read_json_save, read_meta, write_save
+from .trading import buy_shares, sell_shares
+
+DATA_DIR = "data"
+STARTING_CASH = 10000.00
+BATCH_MIN_TICKS = 16
+BATCH_CHUNK = 100_000
+
+
+class Game:
+    def __init__(self, model="percent", data_dir=DATA_DIR, seed=None, journal=False):
+        self.model = model if isinstance(model, PriceModel) else get_model(model)
+        self.data_dir = data_dir
+        self.seed = seed  # None draws a fresh seed for every new game
+        self.rng = RandomStream(seed)
+        self.player_cash = STARTING_CASH
+        self.player_shares = 0
+        self.stock_price = START_PRICE
+        self.stock_history = PriceHistory()
+        self.candles = CandleAggregator()
+        self.indicators = IndicatorSet()
+        self.orders = OrderBook()
+        self.ledger = Ledger()
+        self.active_save_file = None
+        self.saved_ticks = 0
+        self.saved_trades = 0
+        self.journaling = journal
+        self.journal = None
+        self.journal_error = None  # set once the journal fails and saves fall back to whole files
+        self._catalog = None
+
+    # --- Sessions ---
+    def new_game(self, name):
+        self.player_cash = STARTING_CASH
+        self.player_shares = 0
+        self.stock_price = self.model.reset()
+        self.rng = RandomStream(self.seed)
+        self.stock_history.clear()
+        self.stock_history.append(self.stock_price)
+        self.candles.clear()
+        self.candles.append(self.stock_price)
+        self.indicators.clear()
+        self.indicators.update(self.stock_price)
+        self.orders = OrderBook()
+        self.ledger = Ledger()
+        self.saved_ticks = 0
+        self.saved_trades = 0
+        self.active_save_file = f"{name}{self.model.save_suffix}{SAVE_EXT}"
+        if self.journaling: self.save_game()
+
+    @property
+    def catalog(self):
+        if self._catalog is None: self._catalog = SaveCatalog(self.data_dir)
+        return self._catalog
+
+    def list_saves(self):
+        """Save files for this model; a binary save hides the legacy JSON save it was migrated from."""
+        if not os.path.isdir(self.data_dir): return []
+        return sorted(row["filename"] for row in self.find_saves()[0])
+
+    def find_saves(self, search="", sort="played", descending=True, limit=None, offset=0, refresh=True):
+        """(rows, total) of this model's saves from the catalog; see ``SaveCatalog.query``.
+
+        ``refresh=False`` skips re-indexing changed files, e.g. when paging through a menu.
+        """
+        if refresh: self.catalog.refresh()
+        rows = self.catalog.query(self.model.name, search, sort, descending, limit, offset)
+        total = self.catalog.count(self.model.name, search) if limit is not None else len(rows)
+        return rows, total
+
+    def save_name(self, filename):
+        stem = os.path.splitext(filename)[0]
+        return stem[:len(stem) - len(self.model.save_suffix)]
+
+    def save_meta(self):
+        return {"model": self.model.name, "params": self.model.params, "orders": self.orders.to_list(),
+                "model_state": self.model.state(), "rng": self.rng.state()}
+
+    def save_game(self, filename=None):
+        filename = filename or self.active_save_file
+        if not filename: return
+        self._wait_for_checkpoint()
+        count = self._save_task(filename)()
+        try:
+            self.catalog.record(filename, self.player_cash, self.player_shares, self.stock_price, count)
+        except sqlite3.Error:
+            pass  # the next refresh indexes the file from disk instead
+        if filename == self.active_save_file:
+            self.saved_ticks = count
+            self.saved_trades = len(self.ledger)
+            if self.journaling: self._start_journal()
+
+    def _save_task(self, filename):
+        """A copy of what ``save_game`` writes to ``filename``, and a function that writes it from any thread."""
+        os.makedirs(self.data_dir, exist_ok=True)
+        filepath = os.path.join(self.data_dir, filename)
+        keep = self.saved_ticks if filename == self.active_save_file else 0
+        ledger_keep = self.saved_trades if keep else 0
+        state = (filepath, self.player_cash, self.player_shares, self.stock_price, np.array(self.stock_history.values(keep)))
+        options = {"keep": keep, "meta": self.save_meta(), "new_ledger": self.ledger.records[ledger_keep:].copy(), "ledger_keep": ledger_keep}
+        candles, unsaved_candles = self.candles, self.candles.unsaved(candles_path(filepath), append=bool(keep))
+
+        def write():
+            count = write_save(*state, **options)
+            candles.write(unsaved_candles)
+            return count
+        return write
+
+    def load_game(self, filename):
+        filepath = os.path.join(self.data_dir, filename)
+        if not os.path.exists(filepath): return False
+        self._wait_for_checkpoint()
+        if filename.endswith(LEGACY_EXT):
+            # Legacy JSON saves load as before and are written back in the binary format.
+            self.player_cash, self.player_shares, self.stock_price, history = read_json_save(filepath)
+            self.saved_ticks = 0
+            self.orders = OrderBook()
+            self.ledger = Ledger()
+            model_state = rng_state = {}
+            filename = os.path.splitext(filename)[0] + SAVE_EXT
+        else:
+            header = read_header(filepath)
+            self.player_cash, self.player_shares, self.stock_price = header["cash"], header["shares"], header["price"]
+            history = load_history(filepath, header)
+            self.saved_ticks = header["count"]
+            meta = read_meta(filepath, header)
+            self.orders = OrderBook.from_list(meta.get("orders", []))
+            model_state = meta.get("model_state", {})
+            rng_state = meta.get("rng", {})
+            self.ledger = Ledger.from_records(load_ledger(filepath, header))
+        self.saved_trades = len(self.ledger)
+        if self.ledger.shares != self.player_shares:
+            # Saves from before the ledger: open the position at the saved price.
+            self.ledger.record(max(0, len(history) - 1), self.player_shares - self.ledger.shares, self.stock_price)
+        self.stock_history = PriceHistory(history)
+        self.candles = self._load_candles(filepath)
+        self.indicators = IndicatorSet.from_prices(self.stock_history.values())
+        self.active_save_file = filename
+        # Saves from before seeded streams carry no state and continue on a fresh one.
+        self.rng = RandomStream.from_state(rng_state) if rng_state else RandomStream(self.seed)
+        if self.journaling: self.replay_journal()
+        ticks_since = self.total_ticks - self.saved_ticks
+        self.model.restore(model_state, ticks_since)
+        self.model.skip(self.rng, ticks_since)
+        if self.journaling: self.save_game()
+        return True
+
+    def _load_candles(self, filepath):
+        path = candles_path(filepath)
+        if filepath.endswith(SAVE_EXT) and os.path.exists(path):
+            try:
+                candles = CandleAggregator.load(path)
+            except CandleFileError:
+                candles = None
+            if candles is not None and candles.ticks <= len(self.stock_history):
+                # Catch up on ticks saved after the candles were (e.g. an interrupted save).
+                candles.extend(self.stock_history.values(candles.ticks))
+                return candles
+        return CandleAggregator.from_prices(self.stock_history.values())
+
+    # --- Journal ---
+    def journal_path(self):
+        return os.path.join(self.data_dir, os.path.splitext(self.active_save_file)[0] + JOURNAL_EXT)
+
+    def _checkpoint(self):
+        """Save on the journal's writer thread, off the frame loop; the journal restarts from it."""
+        write = self._save_task(self.active_save_file)
+        # Counted as saved before the writer thread can report a failure, which resets them.
+        self.saved_ticks = self.total_ticks
+        self.saved_trades = len(self.ledger)
+        self.journal.checkpoint(lambda: self._run_checkpoint(write), self.player_cash, self.player_shares,
+                                self.stock_price, self.total_ticks)
+
+    def _run_checkpoint(self, write):
+        try:
+            write()
+            return True
+        except (OSError, ValueError):
+            # Disk trouble: the next save rewrites the file whole; until then the journal keeps every tick.
+            self.saved_ticks = self.saved_trades = 0
+            return False
+
+    def _wait_for_checkpoint(self):
+        if self.journal: self.journal.flush()
+        self._check_journal()
+
+    def _check_journal(self):
+        """Once the journal cannot write, stop journaling and save whole files instead."""
+        if not (self.journal and self.journal.error): return
+        self.journal_error = f"journal stopped: {self.journal.error}"
+        self.journal.close()
+        self.journal = None
+        self.journaling = False
+        # The last checkpoint may not have made it to disk: the next save rewrites the file.
+        self.saved_ticks = self.saved_trades = 0
+
+    def _start_journal(self):
+        if self.journal: self.journal.close()
+        self.journal = TickJournal(self.journal_path(), self.player_cash, self.player_shares, self.stock_price, self.saved_ticks)
+
+    def replay_journal(self):
+        """Apply the ticks, trades and order events journaled after the last save; returns how many were replayed."""
+        path = self.journal_path()
+        if not os.path.exists(path): return 0
+        try:
+            header, records = read_journal(path)
+        except JournalError:
+            return 0
+        if header["base_count"] != self.saved_ticks or self.total_ticks != self.saved_ticks:
+            return 0  # Stale: the save already holds everything this journal recorded.
+        ticks = records["price"][records["kind"] == TICK]
+        self.stock_history.extend(ticks)
+        self.candles.extend(ticks)
+        self.indicators.extend(ticks)
+        events = records[records["kind"] != TICK]
+        cash, shares = header["cash"], header["shares"]
+        for kind, tick, amount, price in zip(events["kind"].tolist(), events["tick"].tolist(), events["amount"].tolist(), events["price"].tolist()):
+            if kind == TRADE:
+                if amount > 0: cash, shares = buy_shares(cash, shares, price, amount)
+                else: cash, shares = sell_shares(cash, shares, price, -amount)
+                self.ledger.record(tick, amount, price)
+            elif kind == ORDER_DONE: self.orders.cancel(amount)
+            elif kind == TRIGGER: self.orders.trigger(amount)
+        self.player_cash, self.player_shares = cash, shares
+        self.stock_price = self.stock_history[-1] if len(records) else header["price"]
+        return len(records)
+
+    def close(self):
+        """Close the save catalog and stop the journal; after a clean save it holds nothing and is removed."""
+        if self._catalog:
+            self._catalog.close()
+            self._catalog = None
+        if not self.journal: return
+        self.journal.close()
+        if self.journal.records_written == 0: os.remove(self.journal.path)
+        self.journal = None
+
+    def log_data(self):
+        if not self.active_save_file: return None
+        os.makedirs(self.data_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        name = os.path.splitext(self.active_save_file)[0]
+        log_file = os.path.join(self.data_dir, f"{self.model.log_prefix}{name}_{timestamp}.txt")
+        with open(log_file, 'w') as f:
+            f.writelines(f"{price}\n" for price in self.stock_history.values().tolist())
+        return log_file
+
+    # --- Market and trades ---
+    def update_stock_price(self):
+        self.stock_price = self.model.step(self.stock_price, self.rng)
+        self.stock_history.append(self.stock_price)
+        self.candles.append(self.stock_price)
+        self.indicators.update(self.stock_price)
+        if self.journal: self.journal.tick(self.stock_price, self.total_ticks - 1)
+        if self.orders:
+            self.player_cash, self.player_shares, fills = self.orders.match(
+                self.stock_price, self.player_cash, self.player_shares, self.total_ticks - 1, on_trigger=self._record_trigger)
+            for fill in fills: self._record_fill(fill)
+        return self.stock_price
+
+    def advance(self, n_ticks):
+        """Advance ``n_ticks`` at once; long runs go through the model's vectorized path generator."""
+        self._check_journal()
+        if n_ticks < BATCH_MIN_TICKS:
+            for _ in range(n_ticks): self.update_stock_price()
+            return
+        while n_ticks > 0:
+            chunk = min(n_ticks, BATCH_CHUNK)
+            prices = self.model.advance(self.stock_price, chunk, self.rng)
+            self.stock_history.extend(prices)
+            self.candles.extend(prices)
+            self.indicators.extend(prices)
+            self.stock_price = self.stock_history[-1]
+            if self.journal: self.journal.ticks(prices, self.total_ticks - chunk)
+            if self.orders:
+                self.player_cash, self.player_shares, _ = self.orders.match_path(
+                    prices, self.player_cash, self.player_shares, self.total_ticks - chunk,
+                    on_fill=self._record_fill, on_trigger=self._record_trigger)
+            if self.total_ticks - self.saved_ticks >= BATCH_CHUNK:
+                # Fold long fast-forwards into the save instead of growing the journal; without a
+                # working journal, save so a crash cannot take the whole run with it.
+                if self.journal: self._checkpoint()
+                elif self.journal_error: self.save_game()
+            n_ticks -= chunk
+
+    def seek(self, tick):
+        """Jump a replayed price file to ``tick``; play continues from there on the next tick."""
+        position = self.model.seek(tick)
+        if self.journaling: self.save_game()  # the journal only records ticks, not jumps
+        return position
+
+    def buy_shares(self, amount):
+        before = self.player_shares
+        self.player_cash, self.player_shares = buy_shares(self.player_cash, self.player_shares, self.stock_price, amount)
+        if self.player_shares == before: return False
+        self._record_trade(amount, self.stock_price)
+        return True
+
+    def sell_shares(self, amount):
+        before = self.player_shares
+        self.player_cash, self.player_shares = sell_shares(self.player_cash, self.player_shares, self.stock_price, amount)
+        if self.player_shares == before: return False
+        self._record_trade(-amount, self.stock_price)
+        return True
+
+    def _record_trade(self, amount, price, tick=None):
+        tick = self.total_ticks - 1 if tick is None else tick
+        self.ledger.record(tick, amount, price)
+        if self.journal: self.journal.trade(amount, price, tick)
+
+    # --- Resting orders ---
+    def submit_order(self, side, amount, kind="limit", limit=None, stop=None):
+        """Place a limit, stop or stop-limit order; it is matched against every later tick."""
+        order_id = self.orders.submit(side, amount, kind, limit, stop)
+        if self.journaling: self.save_game()  # order entry is rare: checkpoint rather than journal it
+        return order_id
+
+    def cancel_order(self, order_id):
+        cancelled = self.orders.cancel(order_id)
+        if cancelled and self.journaling: self.save_game()
+        return cancelled
+
+    def _record_fill(self, fill):
+        if fill.filled: self._record_trade(fill.amount if fill.side == "buy" else -fill.amount, fill.price, fill.tick)
+        if self.journal: self.journal.order_done(fill.order_id, fill.price, fill.tick)
+
+    def _record_trigger(self, order, tick):
+        if self.journal: self.journal.trigger(order.id, order.stop, tick)
+
+    def max_buy(self):
+        return int(self.player_cash // self.stock_price) if self.stock_price > 0 else 0
+
+    @property
+    def total_ticks(self):
+        return len(self.stock_history)
+
+    @property
+    def portfolio_value(self):
+        return self.player_shares * self.stock_price
+
+    @property
+    def previous_price(self):
+        return self.stock_history[-2] if len(self.stock_history) > 1 else self.stock_price
@@ -0,0 +1,224 @@
+"""Price graph drawn from a cached polyline over a level-of-detail view of the history.
+
+The visible tick range is read from the history's OHLC pyramid at roughly one
+bucket per pixel column, and each column is drawn through its open, high, low and
+close (M4 aggregation), which matches the raw polyline at pixel resolution. Screen
+coordinates are only recomputed when a tick arrives or the view changes; every
+other frame just blits the cached off-screen surface.
+
+Indicator overlays read the game's ``IndicatorSet``, which is updated as ticks
+arrive, so drawing them never recomputes an indicator. Moving averages and
+Bollinger bands share the price axis. RSI and MACD get a panel along the bottom.
+"""
+import numpy as np
+import pygame
+
+from .ui import BLACK, BLUE, DARK_GRAY, GRAY, GREEN, ORANGE, PURPLE, RED, WHITE, Widget
+
+MIN_SPAN = 16
+MIN_CANDLE_PX = 4
+OVERLAYS = (None, "averages", "bollinger", "rsi", "macd")
+OSCILLATOR_PANEL = 0.25  # fraction of the graph height used by RSI/MACD
+
+
+class PriceGraph(Widget):
+    def __init__(self, rect, color=BLUE, line_width=2):
+        self.rect = pygame.Rect(rect)
+        self.color = color
+        self.line_width = line_width
+        self.surface = pygame.Surface(self.rect.size)
+        self.history = None
+        self.candles = None
+        self.candle_mode = False
+        self.indicators = None
+        self.overlay = None
+        self.zoom = 1.0
+        self.y_offset = 0
+        self.span = self.rect.width  # ticks across the graph; one per pixel by default
+        self.end = None  # last visible tick (exclusive); None follows the newest tick
+        self._seen_ticks = 0
+        self._stale = True
+
+    # --- View ---
+    def sync(self, game):
+        """Pick up new ticks from ``game``; only redraws when they are in view."""
+        if game.stock_history is not self.history or game.candles is not self.candles or game.indicators is not self.indicators:
+            self.history = game.stock_history
+            self.candles = game.candles
+            self.indicators = game.indicators
+            self._stale = self.dirty = True
+        elif len(self.history) != self._seen_ticks and (self.end is None or self.end > self._seen_ticks):
+            self._stale = self.dirty = True
+        self._seen_ticks = len(self.history)
+
+    def set_view(self, zoom, y_offset):
+        if (zoom, y_offset) != (self.zoom, self.y_offset):
+            self.zoom, self.y_offset = zoom, y_offset
+            self._stale = self.dirty = True
+
+    def _set_range(self, span, end):
+        n = len(self.history) if self.history is not None else 0
+        span = int(min(max(span, MIN_SPAN), max(n, self.rect.width)))
+        if end is not None:
+            end = int(min(max(end, min(span, n)), n))
+            if end >= n: end = None
+        if (span, end) != (self.span, self.end):
+            self.span, self.end = span, end
+            self._stale = self.dirty = True
+
+    def toggle_candles(self):
+        self.candle_mode = not self.candle_mode
+        self._stale = self.dirty = True
+
+    def cycle_overlay(self):
+        self.overlay = OVERLAYS[(OVERLAYS.index(self.overlay) + 1) % len(OVERLAYS)]
+        self._stale = self.dirty = True
+
+    def candle_interval(self):
+        """Smallest candle interval that keeps candles at least MIN_CANDLE_PX wide."""
+        intervals = sorted(self.candles.series)
+        for interval in intervals:
+            if interval * self.rect.width / self.span >= MIN_CANDLE_PX: return interval
+        return intervals[-1]
+
+    def zoom_time(self, factor):
+        """Show ``factor`` times as many ticks, keeping the right edge fixed."""
+        self._set_range(self.span * factor, self.end)
+
+    def pan(self, fraction):
+        """Scroll by ``fraction`` of the visible span (negative is back in time)."""
+        n = len(self.history) if self.history is not None else 0
+        end = self.end if self.end is not None else n
+        self._set_range(self.span, end + fraction * self.span)
+
+    def show_all(self):
+        self._set_range(len(self.history) if self.history is not None else 0, None)
+
+    def follow(self):
+        self._set_range(self.span, None)
+
+    def visible_range(self):
+        n = len(self.history) if self.history is not None else 0
+        stop = n if self.end is None else min(self.end, n)
+        return max(0, stop - self.span), stop
+
+    # --- Drawing ---
+    def points(self):
+        start, stop = self.visible_range()
+        width = self.rect.width
+        if self.span <= width:
+            ys = np.array(self.history.values(start, stop))
+            xs = np.arange(len(ys)) * (width / self.span)
+            low, high = ys.min(), ys.max()
+        else:
+            columns = -(-width * (stop - start) // self.span)
+            xs, o, h, l, c = self.history.ohlc(start, stop, columns)
+            low, high = l.min(), h.max()
+            xs = np.repeat(xs, 4)
+            ys = np.column_stack((o, h, l, c)).ravel()
+        self._to_y = self._y_mapper(low, high)
+        return np.column_stack((xs, self._to_y(ys)))
+
+    def _y_mapper(self, low, high):
+        price_range = (high - low) / self.zoom if self.zoom != 0 else 1
+        if price_range == 0: price_range = 1
+        center_price = (high + low) / 2
+        height = self.rect.height
+        if self.overlay in ("rsi", "macd"): height *= 1 - OSCILLATOR_PANEL  # leave room for the panel
+        return lambda prices: np.clip(height / 2 - (prices - center_price) / price_range * height - self.y_offset, 0, height)
+
+    def candle_rects(self):
+        """Candles in view as (x, width, open_y, high_y, low_y, close_y, rising) columns."""
+        start, stop = self.visible_range()
+        series = self.candles[self.candle_interval()]
+        first, o, h, l, c = series.range(start, stop)
+        interval = series.interval
+        px_per_tick = self.rect.width / self.span
+        group = max(1, int(np.ceil(MIN_CANDLE_PX / (interval * px_per_tick))))
+        if group > 1:
+            # Even the widest interval is too narrow here: merge neighbouring candles.
+            starts = np.arange(0, len(o), group)
+            ends = np.minimum(starts + group, len(o)) - 1
+            o, h, l, c = o[starts], np.maximum.reduceat(h, starts), np.minimum.reduceat(l, starts), c[ends]
+            interval *= group
+            first //= group
+        to_y = self._to_y = self._y_mapper(l.min(), h.max())
+        xs = ((first + np.arange(len(o))) * interval - start) * px_per_tick
+        return xs, interval * px_per_tick, to_y(o), to_y(h), to_y(l), to_y(c), c >= o
+
+    def _draw_candles(self):
+        xs, width, oy, hy, ly, cy, rising = self.candle_rects()
+        body = max(1, int(width * 0.7))
+        for x, o, h, l, c, up in zip(xs.tolist(), oy.tolist(), hy.tolist(), ly.tolist(), cy.tolist(), rising.tolist()):
+            color = GREEN if up else RED
+            mid = int(x + width / 2)
+            pygame.draw.line(self.surface, color, (mid, h), (mid, l))
+            top = min(o, c)
+            pygame.draw.rect(self.surface, color, (mid - body // 2, top, body, max(1, abs(c - o))))
+
+    def overlay_samples(self):
+        """Ticks sampled for overlays (one per pixel column at most) and their x positions."""
+        start, stop = self.visible_range()
+        width = self.rect.width
+        if self.span <= width:
+            return np.arange(start, stop), np.arange(stop - start) * (width / self.span)
+        columns = -(-width * (stop - start) // self.span)
+        cols = np.arange(columns)
+        # The last tick of each column, matching the close of the price column drawn there.
+        return start + (cols + 1) * (stop - start) // columns - 1, cols.astype(np.float64)
+
+    def _polyline(self, color, xs, ys, width=1):
+        # Overlays are undefined (NaN) during their warm-up: draw each finite run on its own.
+        finite = np.isfinite(ys)
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], finite, [False])).astype(np.int8)))
+        for a, b in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            if b - a > 1: pygame.draw.lines(self.surface, color, False, np.column_stack((xs[a:b], ys[a:b])).tolist(), width)
+
+    def _draw_overlay(self):
+        ticks, xs = self.overlay_samples()
+        if not len(ticks): return
+        series = lambda name: self.indicators.sample(name, ticks)
+        if self.overlay == "averages":
+            self._polyline(ORANGE, xs, self._to_y(series("sma")))
+            self._polyline(PURPLE, xs, self._to_y(series("ema")))
+        elif self.overlay == "bollinger":
+            for name, color in (("bb_upper", GRAY), ("bb_mid", ORANGE), ("bb_lower", GRAY)):
+                self._polyline(color, xs, self._to_y(series(name)))
+        else:
+            height = self.rect.height
+            top = height * (1 - OSCILLATOR_PANEL)
+            panel = height - top
+            pygame.draw.line(self.surface, DARK_GRAY, (0, top), (self.rect.width, top))
+            if self.overlay == "rsi":
+                to_y = lambda v: top + (100 - v) / 100 * panel
+                for level in (30, 70): pygame.draw.line(self.surface, DARK_GRAY, (0, to_y(level)), (self.rect.width, to_y(level)))
+                self._polyline(PURPLE, xs, to_y(series("rsi")))
+            else:
+                line, signal, hist = series("macd"), series("macd_signal"), series("macd_hist")
+                scale = np.nanmax(np.abs(np.concatenate((line, signal)))) if np.isfinite(line).any() else 0
+                to_y = lambda v: top + panel / 2 - v / (scale or 1) * (panel / 2 - 2)
+                zero = top + panel / 2
+                for x, y, h in zip(xs.tolist(), to_y(hist).tolist(), hist.tolist()):
+                    if h == h: pygame.draw.line(self.surface, GREEN if h >= 0 else RED, (x, zero), (x, y))
+                self._polyline(BLUE, xs, to_y(line))
+                self._polyline(ORANGE, xs, to_y(signal))
+
+    def _render(self):
+        self.surface.fill(BLACK)
+        start, stop = self.visible_range()
+        if self.candle_mode and self.candles is not None and stop > start:
+            self._draw_candles()
+        elif stop - start > 1:
+            pygame.draw.lines(self.surface, self.color, False, self.points().tolist(), self.line_width)
+        if self.overlay and self.indicators is not None and stop - start > 1:
+            self._draw_overlay()
+        pygame.draw.rect(self.surface, WHITE, self.surface.get_rect(), 2, border_radius=5)
+        self._stale = False
+
+    def build(self):
+        """Re-render the off-screen graph if the history or view changed since the last frame."""
+        if self._stale: self._render()
+
+    def draw(self, surface):
+        self.build()
+        surface.blit(self.surface, self.rect)
@@ -0,0 +1,155 @@
+"""Unbounded price history with a min/max (OHLC) pyramid for level-of-detail views.
+
+Raw ticks live in one growable float64 array. Level ``k`` of the pyramid holds
+open/high/low/close for buckets of ``2**k`` ticks, from ``2**BASE_LEVEL`` up to a
+single bucket spanning the whole session, and is kept current as ticks are
+appended. ``ohlc`` answers "what does this tick range look like across N pixel
+columns" from the coarsest level that still has a bucket per column, so the cost
+depends on the number of columns, not the length of the history.
+
+The class also implements the parts of the ``deque`` interface the game uses
+(``append``, ``extend``, ``clear``, ``len``, indexing and iteration).
+"""
+import numpy as np
+
+BASE_LEVEL = 4  # finer views are aggregated straight from raw ticks
+O, H, L, C = range(4)
+
+
+class PriceHistory:
+    def __init__(self, values=()):
+        self._raw = np.empty(1024)
+        self._n = 0
+        self._levels = []  # self._levels[i] is a (4, capacity) array for level BASE_LEVEL + i
+        if len(values): self.extend(values)
+
+    # --- Sequence interface ---
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._raw[:self._n][index]
+        if index < 0: index += self._n
+        if not 0 <= index < self._n: raise IndexError("history index out of range")
+        return float(self._raw[index])
+
+    def __iter__(self):
+        return iter(self._raw[:self._n].tolist())
+
+    def values(self, start=0, stop=None):
+        """Read-only view of raw ticks ``[start, stop)``."""
+        view = self._raw[start:self._n if stop is None else min(stop, self._n)]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        self._n = 0
+        self._levels = []
+
+    # --- Appending ---
+    def _reserve(self, n):
+        if n > len(self._raw):
+            grown = np.empty(max(n, 2 * len(self._raw)))
+            grown[:self._n] = self._raw[:self._n]
+            self._raw = grown
+
+    def _level_count(self, i, n=None):
+        k = BASE_LEVEL + i
+        return ((self._n if n is None else n) + (1 << k) - 1) >> k
+
+    def _reserve_levels(self):
+        for i, level in enumerate(self._levels):
+            needed = self._level_count(i)
+            if needed > level.shape[1]:
+                grown = np.empty((4, max(needed, 2 * level.shape[1])))
+                grown[:, :level.shape[1]] = level
+                self._levels[i] = grown
+
+    def _add_levels(self):
+        # Grow until the top level is a single bucket covering every tick.
+        while not self._levels or self._level_count(len(self._levels) - 1) > 1:
+            self._levels.append(np.empty((4, max(16, self._level_count(len(self._levels))))))
+            self._build_level(len(self._levels) - 1, 0)
+
+    def _build_level(self, level_index, first):
+        """Recompute buckets ``first`` onwards of one level from the level below (or raw ticks)."""
+        if level_index == 0:
+            src = self._raw[first << BASE_LEVEL:self._n]
+            o = h = l = c = src
+            step = 1 << BASE_LEVEL
+        else:
+            o, h, l, c = self._levels[level_index - 1][:, 2 * first:self._level_count(level_index - 1)]
+            step = 2
+        starts = np.arange(0, len(o), step)
+        ends = np.minimum(starts + step, len(o)) - 1
+        stop = first + len(starts)
+        level = self._levels[level_index]
+        level[O, first:stop] = o[starts]
+        level[H, first:stop] = np.maximum.reduceat(h, starts)
+        level[L, first:stop] = np.minimum.reduceat(l, starts)
+        level[C, first:stop] = c[ends]
+
+    def append(self, price):
+        i = self._n
+        self._reserve(i + 1)
+        self._raw[i] = price
+        self._n += 1
+        self._reserve_levels()
+        for level_index, level in enumerate(self._levels):
+            k = BASE_LEVEL + level_index
+            b = i >> k
+            if i & ((1 << k) - 1) == 0:
+                level[:, b] = price
+            else:
+                if price > level[H, b]: level[H, b] = price
+                if price < level[L, b]: level[L, b] = price
+                level[C, b] = price
+        self._add_levels()
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64).ravel()
+        if len(prices) == 0: return
+        if len(prices) == 1: return self.append(prices[0])
+        old = self._n
+        self._reserve(old + len(prices))
+        self._raw[old:old + len(prices)] = prices
+        self._n += len(prices)
+        self._reserve_levels()
+        for level_index in range(len(self._levels)):
+            self._build_level(level_index, old >> (BASE_LEVEL + level_index))
+        self._add_levels()
+
+    # --- Level-of-detail queries ---
+    def ohlc(self, start, stop, columns):
+        """Aggregate ticks ``[start, stop)`` into at most ``columns`` equal-width columns.
+
+        Returns ``(cols, open, high, low, close)`` for the non-empty columns. Ranges
+        are snapped outward to bucket boundaries of the level used, so edge columns
+        may include a few ticks just outside the range.
+        """
+        start, stop = max(0, start), min(stop, self._n)
+        span = stop - start
+        if span <= 0 or columns <= 0:
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int64), empty, empty, empty, empty
+
+        ticks_per_column = span / columns
+        k = int(np.log2(ticks_per_column)) if ticks_per_column >= 1 else 0
+        level_index = min(k, BASE_LEVEL + len(self._levels) - 1) - BASE_LEVEL
+        if level_index < 0:
+            k = 0
+            src = self._raw[start:stop]
+            o = h = l = c = src
+            tick_starts = np.arange(start, stop)
+        else:
+            k = BASE_LEVEL + level_index
+            first, last = start >> k, ((stop - 1) >> k) + 1
+            o, h, l, c = self._levels[level_index][:, first:last]
+            tick_starts = np.arange(first, last) << k
+
+        cols = np.clip((tick_starts - start) * columns // span, 0, columns - 1)
+        boundaries = np.flatnonzero(np.diff(cols, prepend=-1))
+        ends = np.append(boundaries[1:], len(cols)) - 1
+        return (cols[boundaries], o[boundaries], np.maximum.reduceat(h, boundaries),
+                np.minimum.reduceat(l, boundaries), c[ends])
@@ -0,0 +1,400 @@
+"""Technical indicators, updated one tick at a time or over whole arrays.
+
+Every indicator has an ``update(price)`` method that costs O(1) per tick and an
+``extend(prices)`` method that does the same work for a block of ticks with NumPy.
+There is also a module-level batch function that computes the indicator for a
+whole price array. All three give the same numbers, up to floating-point
+rounding (about 1e-12 relative). Rolling windows use Welford's add/remove
+update and are re-seeded exactly from the window after every ``extend``. EMAs
+use ``y = d*y + a*x`` (``d = 1 - a``), seeded with the first value, and are
+evaluated blockwise in the batch form.
+
+``IndicatorSet`` keeps the game's default indicators in step with the price
+history. It keeps their recent output series for the graph overlays.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Largest growth of d**-k allowed inside one vectorized EMA block.
+_EMA_BLOCK_GROWTH = 1e8
+_MAX_EMA_BLOCK = 4096
+
+
+# --- Batch functions ---
+def _ema(values, alpha, prev=None):
+    """y[t] = (1 - alpha) * y[t-1] + alpha * x[t]; y[-1] = ``prev`` (default x[0])."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    if not len(values): return out
+    decay = 1.0 - alpha
+    prev = values[0] if prev is None else prev
+    if decay <= 0:
+        out[:] = values
+        return out
+    block = int(min(_MAX_EMA_BLOCK, max(1, math.log(_EMA_BLOCK_GROWTH) / -math.log(decay)))) if decay < 1 else _MAX_EMA_BLOCK
+    powers = decay ** np.arange(1, block + 1)
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        p = powers[:len(chunk)]
+        # y[j] = d**(j+1) * (prev + a * sum_k x[k] / d**(k+1))
+        out[start:start + len(chunk)] = p * (prev + alpha * np.cumsum(chunk / p))
+        prev = out[start + len(chunk) - 1]
+    return out
+
+
+def _rolling(values, window, reducer):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = reducer(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def sma(prices, window=20):
+    return _rolling(np.asarray(prices, dtype=np.float64), window, np.mean)
+
+
+def ema(prices, span=20):
+    return _ema(prices, 2.0 / (span + 1))
+
+
+def rolling_std(prices, window=20, ddof=0):
+    return _rolling(np.asarray(prices, dtype=np.float64), window, lambda v, axis: v.std(axis=axis, ddof=ddof))
+
+
+def bollinger(prices, window=20, k=2.0):
+    """(middle, upper, lower) bands: SMA +/- ``k`` population standard deviations."""
+    mid = sma(prices, window)
+    width = k * rolling_std(prices, window)
+    return mid, mid + width, mid - width
+
+
+def _rsi_from(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi[avg_loss == 0] = 100.0
+    rsi[(avg_loss == 0) & (avg_gain == 0)] = 50.0
+    return rsi
+
+
+def _rsi_value(avg_gain, avg_loss):
+    if avg_loss == 0: return 50.0 if avg_gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def rsi(prices, period=14):
+    """Wilder's RSI (smoothing ``1/period``), undefined for the first ``period`` ticks."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    if len(prices) < 2: return out
+    changes = np.diff(prices)
+    gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+    out[1:] = _rsi_from(_ema(gains, 1.0 / period), _ema(losses, 1.0 / period))
+    out[:period] = np.nan
+    return out
+
+
+def macd(prices, fast=12, slow=26, signal=9):
+    """(MACD line, signal line, histogram)."""
+    line = ema(prices, fast) - ema(prices, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def _log_returns(prices):
+    # NaN wherever either price is not positive (e.g. a replayed file with such prices).
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(prices[1:] / prices[:-1])
+    returns[~((prices[1:] > 0) & (prices[:-1] > 0))] = np.nan
+    return returns
+
+
+def rolling_volatility(prices, window=20):
+    """Sample standard deviation of the last ``window`` log returns (per tick)."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    if len(prices) > 1:
+        out[1:] = rolling_std(_log_returns(prices), window, ddof=1)
+    return out
+
+
+# --- Streaming ---
+class RollingStats:
+    """Mean and variance of the last ``window`` values via Welford's add/remove updates."""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.n = 0
+        self._next = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def full(self):
+        return self.n == self.window
+
+    def push(self, x):
+        if self.n < self.window:
+            self.n += 1
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self._m2 += delta * (x - self.mean)
+        else:
+            old = self.buffer[self._next]
+            mean = self.mean + (x - old) / self.n
+            self._m2 += (x - old) * (x - mean + old - self.mean)
+            self.mean = mean
+        self.buffer[self._next] = x
+        self._next = (self._next + 1) % self.window
+
+    def variance(self, ddof=0):
+        return max(self._m2, 0.0) / (self.n - ddof) if self.n > ddof else math.nan
+
+    def std(self, ddof=0):
+        return math.sqrt(self.variance(ddof))
+
+    def recent(self):
+        """Values in the window, oldest first."""
+        return np.array(self.buffer[self._next:self.n] + self.buffer[:self._next] if self.full else self.buffer[:self.n])
+
+    def reseed(self, values):
+        """Restart from the last ``window`` of ``values`` (also clears accumulated rounding)."""
+        values = np.asarray(values, dtype=np.float64)[-self.window:]
+        self.n = len(values)
+        self.buffer[:self.n] = values.tolist()
+        self._next = self.n % self.window
+        self.mean = float(values.mean()) if self.n else 0.0
+        self._m2 = float(((values - self.mean) ** 2).sum()) if self.n else 0.0
+
+
+class SMA:
+    def __init__(self, window=20):
+        self.stats = RollingStats(window)
+        self.value = math.nan
+
+    def update(self, price):
+        self.stats.push(price)
+        self.value = self.stats.mean if self.stats.full else math.nan
+        return self.value
+
+    def extend(self, prices):
+        values = np.concatenate((self.stats.recent(), prices))
+        out = sma(values, self.stats.window)[len(values) - len(prices):]
+        self.stats.reseed(values)
+        if len(out): self.value = float(out[-1])
+        return out
+
+
+class EMA:
+    def __init__(self, span=20, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, price):
+        self.value = price if self.value is None else (1.0 - self.alpha) * self.value + self.alpha * price
+        return self.value
+
+    def extend(self, prices):
+        out = _ema(prices, self.alpha, self.value)
+        if len(out): self.value = float(out[-1])
+        return out
+
+
+class Bollinger:
+    def __init__(self, window=20, k=2.0):
+        self.k = k
+        self.stats = RollingStats(window)
+        self.value = (math.nan, math.nan, math.nan)
+
+    def update(self, price):
+        self.stats.push(price)
+        if self.stats.full:
+            mid, width = self.stats.mean, self.k * self.stats.std()
+            self.value = (mid, mid + width, mid - width)
+        return self.value
+
+    def extend(self, prices):
+        values = np.concatenate((self.stats.recent(), prices))
+        skip = len(values) - len(prices)
+        bands = tuple(band[skip:] for band in bollinger(values, self.stats.window, self.k))
+        self.stats.reseed(values)
+        if len(prices): self.value = tuple(float(band[-1]) for band in bands)
+        return bands
+
+
+class RSI:
+    def __init__(self, period=14):
+        self.period = period
+        self.gain = EMA(alpha=1.0 / period)
+        self.loss = EMA(alpha=1.0 / period)
+        self.last = None
+        self.count = 0
+        self.value = math.nan
+
+    def update(self, price):
+        if self.last is not None:
+            change = price - self.last
+            gain, loss = self.gain.update(max(change, 0.0)), self.loss.update(max(-change, 0.0))
+            self.value = _rsi_value(gain, loss) if self.count >= self.period else math.nan
+        self.last = price
+        self.count += 1
+        return self.value
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        out = np.full(len(prices), np.nan)
+        if not len(prices): return out
+        changes = np.diff(prices, prepend=prices[0] if self.last is None else self.last)
+        first = 1 if self.last is None else 0  # the very first tick has no change
+        gains = self.gain.extend(np.maximum(changes[first:], 0))
+        losses = self.loss.extend(np.maximum(-changes[first:], 0))
+        out[first:] = _rsi_from(gains, losses)
+        out[:max(0, self.period - self.count)] = np.nan
+        self.last = float(prices[-1])
+        self.count += len(prices)
+        self.value = float(out[-1])
+        return out
+
+
+class MACD:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+        self.value = (math.nan, math.nan, math.nan)
+
+    def update(self, price):
+        line = self.fast.update(price) - self.slow.update(price)
+        signal = self.signal.update(line)
+        self.value = (line, signal, line - signal)
+        return self.value
+
+    def extend(self, prices):
+        line = self.fast.extend(prices) - self.slow.extend(prices)
+        signal = self.signal.extend(line)
+        if len(line): self.value = (float(line[-1]), float(signal[-1]), float(line[-1] - signal[-1]))
+        return line, signal, line - signal
+
+
+class RollingVolatility:
+    def __init__(self, window=20):
+        self.stats = RollingStats(window)
+        self.last = None
+        self.value = math.nan
+
+    def update(self, price):
+        if self.last is not None:
+            if price > 0 and self.last > 0:
+                self.stats.push(math.log(price / self.last))
+            else:
+                self.stats = RollingStats(self.stats.window)  # no return: the window starts over
+            self.value = self.stats.std(ddof=1) if self.stats.full else math.nan
+        self.last = price
+        return self.value
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        if not len(prices): return np.empty(0)
+        head = [] if self.last is None else [self.last]
+        recent = self.stats.recent()
+        returns = np.concatenate((recent, _log_returns(np.concatenate((head, prices)))))
+        out = rolling_std(returns, self.stats.window, ddof=1)[len(recent):]
+        if not head: out = np.concatenate(([np.nan], out))  # the very first tick has no return
+        gaps = np.flatnonzero(np.isnan(returns))
+        self.stats.reseed(returns[gaps[-1] + 1:] if len(gaps) else returns)
+        self.last = float(prices[-1])
+        self.value = float(out[-1])
+        return out
+
+
+# --- The game's indicator set ---
+COLUMNS = ("sma", "ema", "bb_mid", "bb_upper", "bb_lower", "rsi", "macd", "macd_signal", "macd_hist", "volatility")
+DEFAULT_KEEP = 1 << 18
+# Ticks replayed before the kept range when rebuilding from a history, enough for
+# the EMAs to forget their seed.
+WARMUP_TICKS = 10_000
+
+
+class IndicatorSet:
+    """SMA/EMA(20), Bollinger(20, 2), RSI(14), MACD(12, 26, 9) and volatility(20), kept
+    in step with the price history.
+
+    Outputs of at least the last ``keep`` ticks are kept per column (see ``COLUMNS``)
+    for drawing.
+    """
+
+    def __init__(self, keep=DEFAULT_KEEP):
+        self.keep = keep
+        self.clear()
+
+    def clear(self):
+        self.sma, self.ema = SMA(20), EMA(20)
+        self.bollinger, self.rsi, self.macd = Bollinger(20, 2.0), RSI(14), MACD(12, 26, 9)
+        self.volatility = RollingVolatility(20)
+        self._data = np.empty((len(COLUMNS), 1024))
+        self._n = 0
+        self.start = 0  # tick of the oldest kept output
+
+    @classmethod
+    def from_prices(cls, prices, keep=DEFAULT_KEEP):
+        indicators = cls(keep)
+        first = max(0, len(prices) - keep - WARMUP_TICKS)
+        indicators.extend(prices[first:])
+        indicators.start += first
+        return indicators
+
+    @property
+    def ticks(self):
+        return self.start + self._n
+
+    def _append(self, rows):
+        # Between ``keep`` and ``2 * keep`` outputs are held, so trimming is amortized O(1).
+        n = rows.shape[1]
+        if n >= self.keep:
+            self.start += self._n + n - self.keep
+            rows, self._n, n = rows[:, -self.keep:], 0, self.keep
+        if self._n + n > self._data.shape[1]:
+            if self._n + n > 2 * self.keep:
+                drop = self._n + n - self.keep
+                self._data[:, :self._n - drop] = self._data[:, drop:self._n]
+                self._n -= drop
+                self.start += drop
+            if self._n + n > self._data.shape[1]:
+                grown = np.empty((len(COLUMNS), min(2 * self.keep, max(2 * self._data.shape[1], self._n + n))))
+                grown[:, :self._n] = self._data[:, :self._n]
+                self._data = grown
+        self._data[:, self._n:self._n + n] = rows
+        self._n += n
+
+    def update(self, price):
+        row = (self.sma.update(price), self.ema.update(price), *self.bollinger.update(price),
+               self.rsi.update(price), *self.macd.update(price), self.volatility.update(price))
+        self._append(np.array(row).reshape(-1, 1))
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        if not len(prices): return
+        rows = np.vstack((self.sma.extend(prices), self.ema.extend(prices), *self.bollinger.extend(prices),
+                          self.rsi.extend(prices), *self.macd.extend(prices), self.volatility.extend(prices)))
+        self._append(rows)
+
+    def series(self, name, start=0, stop=None):
+        """Outputs of ``name`` for ticks ``start:stop``; NaN for ticks no longer kept."""
+        stop = self.ticks if stop is None else min(stop, self.ticks)
+        out = np.full(max(0, stop - start), np.nan)
+        first = max(start, self.start)
+        if first < stop:
+            row = self._data[COLUMNS.index(name)]
+            out[first - start:] = row[first - self.start:stop - self.start]
+        return out
+
+    def sample(self, name, ticks):
+        """Outputs of ``name`` at the given ticks; NaN for ticks no longer kept."""
+        ticks = np.asarray(ticks, dtype=np.int64)
+        kept = (ticks >= self.start) & (ticks < self.ticks)
+        out = np.full(len(ticks), np.nan)
+        out[kept] = self._data[COLUMNS.index(name), ticks[kept] - self.start]
+        return out
+
+    def latest(self, name):
+        return float(self._data[COLUMNS.index(name), self._n - 1]) if self._n else math.nan
@@ -0,0 +1,184 @@
+"""Write-ahead tick journal.
+
+Every tick, filled trade and order event since the last ``save_game`` is appended to
+``<save>.journal``. Records are queued on the game thread and written in batches
+by a background thread that fsyncs at least every ``flush_interval`` seconds, so
+the frame loop never waits on the disk and a crash loses at most that much play.
+
+Layout (little-endian)::
+
+    header   64 bytes   magic, version, base tick count, cash, shares, price at the checkpoint
+    records  32 bytes   kind, tick, signed share amount (or order id), price
+
+Record kinds are a tick, a filled trade, an order leaving the order book (filled
+or rejected on a tick), or a stop-limit order triggering into a limit order. The
+last two put the order id in the amount field. Every record carries the tick it
+happened on, so a fill inside a fast-forward replays onto its own tick even
+though the whole run of ticks was journaled before it. Version 1 records had no
+tick; they are read as happening on the latest tick journaled before them.
+
+A torn final record from a crash mid-write is ignored on replay.
+
+``checkpoint`` hands a save to the writer thread. It runs once the records
+queued before it are on disk, and the journal then starts over from the saved
+state. A crash before the new journal exists leaves the old one, which either
+replays onto the old save or, if the new save made it to disk, is ignored as
+stale.
+
+If the disk fails (full, say, or permissions), the writer keeps the ``OSError``
+in ``error`` and drops everything queued from then on. Flushes still return.
+The game checks ``error`` and falls back to saving whole files.
+"""
+import os
+import struct
+import threading
+
+import numpy as np
+
+MAGIC = b"STKJRNL\x00"
+VERSION = 2
+JOURNAL_EXT = ".journal"
+HEADER = struct.Struct("<8sIQdqd20x")
+RECORD = struct.Struct("<B7xqqd")
+RECORD_DTYPE = np.dtype([("kind", "u1"), ("pad", "V7"), ("tick", "<i8"), ("amount", "<i8"), ("price", "<f8")])
+V1_RECORD_DTYPE = np.dtype([("kind", "u1"), ("pad", "V7"), ("amount", "<i8"), ("price", "<f8")])
+TICK = 1
+TRADE = 2
+ORDER_DONE = 3
+TRIGGER = 4
+
+
+class JournalError(ValueError):
+    pass
+
+
+def read_journal(path):
+    """Returns (header, records) where records is a structured array with kind/tick/amount/price."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < HEADER.size:
+        raise JournalError(f"{path}: truncated header")
+    magic, version, base_count, cash, shares, price = HEADER.unpack_from(raw)
+    if magic != MAGIC or version > VERSION:
+        raise JournalError(f"{path}: not a supported journal")
+    dtype = RECORD_DTYPE if version >= 2 else V1_RECORD_DTYPE
+    body = memoryview(raw)[HEADER.size:]
+    records = np.frombuffer(body[:len(body) - len(body) % dtype.itemsize], dtype=dtype)
+    if version < 2:
+        upgraded = np.zeros(len(records), dtype=RECORD_DTYPE)
+        for field in ("kind", "amount", "price"): upgraded[field] = records[field]
+        upgraded["tick"] = base_count - 1 + np.cumsum(records["kind"] == TICK)
+        records = upgraded
+    header = {"base_count": base_count, "cash": cash, "shares": shares, "price": price}
+    return header, records
+
+
+class TickJournal:
+    def __init__(self, path, cash, shares, price, base_count, flush_interval=0.25, max_batch=4096):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.records_written = 0
+        self.error = None  # the OSError that stopped the writer thread from writing, if any
+        self._queue = []
+        self._cond = threading.Condition()
+        self._flush_requested = 0
+        self._flushed = 0
+        self._closing = False
+        self._file = self._create(HEADER.pack(MAGIC, VERSION, base_count, cash, shares, price))
+        self._thread = threading.Thread(target=self._writer, name="tick-journal", daemon=True)
+        self._thread.start()
+
+    def _create(self, header):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return open(self.path, "ab", buffering=0)
+
+    # --- Game thread ---
+    def tick(self, price, tick):
+        self._append(RECORD.pack(TICK, tick, 0, price))
+
+    def ticks(self, prices, first_tick):
+        records = np.zeros(len(prices), dtype=RECORD_DTYPE)
+        records["kind"] = TICK
+        records["tick"] = np.arange(first_tick, first_tick + len(prices))
+        records["price"] = prices
+        self._append(records.tobytes())
+
+    def trade(self, amount, price, tick):
+        self._append(RECORD.pack(TRADE, tick, amount, price))
+
+    def order_done(self, order_id, price, tick):
+        self._append(RECORD.pack(ORDER_DONE, tick, order_id, price))
+
+    def trigger(self, order_id, price, tick):
+        self._append(RECORD.pack(TRIGGER, tick, order_id, price))
+
+    def checkpoint(self, save, cash, shares, price, base_count):
+        """Run ``save()`` on the writer thread after everything queued so far, then restart the
+        journal from the saved state. ``save`` returns whether it succeeded; if not, the journal
+        carries on, still relative to the previous save."""
+        self._append((save, HEADER.pack(MAGIC, VERSION, base_count, cash, shares, price)))
+
+    def _append(self, record):
+        with self._cond:
+            self._queue.append(record)
+            if len(self._queue) >= self.max_batch: self._cond.notify()
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        with self._cond:
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._cond.notify()
+            self._cond.wait_for(lambda: self._flushed >= target or not self._thread.is_alive())
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+        self._file.close()
+
+    # --- Writer thread ---
+    def _writer(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closing or self._flush_requested > self._flushed
+                                    or len(self._queue) >= self.max_batch, timeout=self.flush_interval)
+                batch, self._queue = self._queue, []
+                flush_target, closing = self._flush_requested, self._closing
+            if self.error is None:
+                try:
+                    self._write_batch(batch)
+                except OSError as e:
+                    self.error = e
+            with self._cond:
+                self._flushed = flush_target
+                self._cond.notify_all()
+            if closing: return
+
+    def _write_batch(self, batch):
+        start = 0
+        for i, item in enumerate(batch):
+            if isinstance(item, tuple):
+                self._write(batch[start:i])
+                start = i + 1
+                save, header = item
+                if save(): self._restart(header)
+        self._write(batch[start:])
+
+    def _write(self, records):
+        if not records: return
+        self._file.write(b"".join(records))
+        os.fsync(self._file.fileno())
+        self.records_written += len(records)
+
+    def _restart(self, header):
+        self._file.close()
+        self._file = self._create(header)
+        self.records_written = 0
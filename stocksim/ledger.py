@@ -0,0 +1,74 @@
+"""Append-only trade ledger with running position aggregates.
+
+Each filled trade is one fixed-size record (tick, signed share amount, price) in a
+growable structured array. The aggregates (shares held, cost basis, realized
+P&L, traded volume) are updated as each record is appended, so the HUD and
+analytics read them in O(1) and never rescan trades. Cost basis uses the
+average-cost method, and positions are long-only like the game. Replaying the
+records into an empty ledger rebuilds the same aggregates.
+"""
+import numpy as np
+
+LEDGER_DTYPE = np.dtype([("tick", "<i8"), ("amount", "<i8"), ("price", "<f8")])
+
+
+class Ledger:
+    def __init__(self, capacity=256):
+        self._records = np.zeros(capacity, dtype=LEDGER_DTYPE)
+        self._n = 0
+        self.shares = 0
+        self.cost_basis = 0.0
+        self.realized_pnl = 0.0
+        self.bought_value = 0.0
+        self.sold_value = 0.0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def records(self):
+        return self._records[:self._n]
+
+    def record(self, tick, amount, price):
+        """Append a filled trade: positive amounts are buys, negative amounts sells."""
+        if self._n == len(self._records):
+            grown = np.zeros(2 * len(self._records), dtype=LEDGER_DTYPE)
+            grown[:self._n] = self._records
+            self._records = grown
+        self._records[self._n] = (tick, amount, price)
+        self._n += 1
+        if amount > 0:
+            self.cost_basis += amount * price
+            self.bought_value += amount * price
+        else:
+            sold = -amount
+            average = self.cost_basis / self.shares if self.shares else price
+            self.realized_pnl += (price - average) * sold
+            self.cost_basis -= average * sold
+            self.sold_value += price * sold
+            if self.shares == sold: self.cost_basis = 0.0
+        self.shares += amount
+
+    def extend(self, records):
+        for tick, amount, price in zip(records["tick"].tolist(), records["amount"].tolist(), records["price"].tolist()):
+            self.record(tick, amount, price)
+
+    @classmethod
+    def from_records(cls, records):
+        ledger = cls(max(256, len(records)))
+        ledger.extend(records)
+        return ledger
+
+    # --- O(1) queries ---
+    @property
+    def average_cost(self):
+        return self.cost_basis / self.shares if self.shares else 0.0
+
+    def exposure(self, price):
+        return self.shares * price
+
+    def unrealized_pnl(self, price):
+        return self.shares * price - self.cost_basis
+
+    def total_pnl(self, price):
+        return self.realized_pnl + self.unrealized_pnl(price)
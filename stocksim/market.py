@@ -0,0 +1,138 @@
+"""Multi-asset market stored as structure-of-arrays.
+
+Prices, holdings and per-ticker model parameters are NumPy arrays indexed by
+ticker, and one tick advances every ticker in a single vectorized step. Price
+moves follow the brownian model (``price += price * (mu*dt + sigma*z*sqrt(dt))``
+with the $1 floor), with the shocks ``z`` correlated through the Cholesky factor
+of a user-supplied correlation matrix.
+"""
+import numpy as np
+
+from .engine import PRICE_FLOOR, START_PRICE, correlated_gbm_paths
+from .game import STARTING_CASH
+
+
+def cholesky_factor(correlation):
+    """Lower-triangular factor of a correlation matrix; raises ValueError if it is not a valid one."""
+    correlation = np.asarray(correlation, dtype=np.float64)
+    if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+        raise ValueError("correlation matrix must be square")
+    if not np.allclose(correlation, correlation.T) or not np.allclose(np.diag(correlation), 1):
+        raise ValueError("correlation matrix must be symmetric with a unit diagonal")
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("correlation matrix is not positive definite") from None
+
+
+class Market:
+    def __init__(self, tickers, start_prices=START_PRICE, mu=0.0005, sigma=0.02, correlation=None,
+                 dt=1.0, cash=STARTING_CASH, keep_history=True, rng=None):
+        if isinstance(tickers, int): tickers = [f"T{i:04d}" for i in range(tickers)]
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.prices = np.broadcast_to(np.asarray(start_prices, dtype=np.float64), (n,)).copy()
+        self.holdings = np.zeros(n, dtype=np.int64)
+        self.cash = float(cash)
+        self.mu = np.broadcast_to(np.asarray(mu, dtype=np.float64), (n,)).copy()
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=np.float64), (n,)).copy()
+        self.dt = dt
+        self.cholesky = None if correlation is None else cholesky_factor(correlation)
+        if self.cholesky is not None and self.cholesky.shape[0] != n:
+            raise ValueError(f"correlation matrix is {self.cholesky.shape[0]}x{self.cholesky.shape[0]}, expected {n}x{n}")
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self.keep_history = keep_history
+        self._history = np.empty((1024 if keep_history else 0, n))
+        self.ticks = 0
+        self._record(self.prices[None, :])
+
+    def __len__(self):
+        return len(self.tickers)
+
+    # --- History (tick-major: row t holds every ticker's price at tick t) ---
+    @property
+    def history(self):
+        return self._history[:self.ticks + 1] if self.keep_history else self.prices[None, :]
+
+    def _record(self, rows):
+        if not self.keep_history:
+            return
+        start = self.ticks + 1 - len(rows)
+        needed = start + len(rows)
+        if needed > len(self._history):
+            grown = np.empty((max(needed, 2 * len(self._history)), len(self)))
+            grown[:start] = self._history[:start]
+            self._history = grown
+        self._history[start:needed] = rows
+
+    # --- Simulation ---
+    def step(self):
+        """Advance every ticker by one tick."""
+        shocks = self.rng.standard_normal(len(self))
+        if self.cholesky is not None: shocks = self.cholesky @ shocks
+        self.prices += self.prices * (self.mu * self.dt + self.sigma * shocks * np.sqrt(self.dt))
+        np.maximum(self.prices, PRICE_FLOOR, out=self.prices)
+        self.ticks += 1
+        self._record(self.prices[None, :])
+        return self.prices
+
+    def advance(self, n_steps):
+        """Advance every ticker by ``n_steps`` ticks in one batch."""
+        if n_steps <= 0: return self.prices
+        paths = correlated_gbm_paths(n_steps, self.prices, rng=self.rng, mu=self.mu, sigma=self.sigma,
+                                     cholesky=self.cholesky, dt=self.dt)
+        self.ticks += n_steps
+        self._record(paths[:, 1:].T)
+        self.prices = paths[:, -1].copy()
+        return self.prices
+
+    # --- Trading ---
+    def buy(self, ticker, amount):
+        return self.apply_orders({ticker: amount})[self.index[ticker]]
+
+    def sell(self, ticker, amount):
+        return self.apply_orders({ticker: -amount})[self.index[ticker]]
+
+    def apply_orders(self, orders):
+        """Fill per-ticker share orders (positive buys, negative sells) with the game's cash/share rules.
+
+        ``orders`` is an array aligned with ``tickers`` or a ``{ticker: amount}`` dict. Sells
+        are filled first; buys are then filled in ticker order while cash lasts, each one
+        whole or not at all. Returns a boolean mask of filled orders.
+        """
+        if isinstance(orders, dict):
+            amounts = np.zeros(len(self), dtype=np.int64)
+            for ticker, amount in orders.items(): amounts[self.index[ticker]] = amount
+        else:
+            amounts = np.asarray(orders).astype(np.int64)
+        filled = np.zeros(len(self), dtype=bool)
+
+        sells = (amounts < 0) & (self.holdings >= -amounts)
+        self.cash += float(self.prices[sells] @ -amounts[sells])
+        self.holdings[sells] += amounts[sells]
+        filled |= sells
+
+        buys = np.flatnonzero(amounts > 0)
+        costs = self.prices[buys] * amounts[buys]
+        if costs.sum() > self.cash:
+            # Not everything fits: walk the buys in ticker order, like repeated Buy clicks.
+            keep = np.zeros(len(buys), dtype=bool)
+            cash = self.cash
+            for j, cost in enumerate(costs.tolist()):
+                if cost <= cash:
+                    keep[j] = True
+                    cash -= cost
+            buys, costs = buys[keep], costs[keep]
+        self.cash -= float(costs.sum())
+        self.holdings[buys] += amounts[buys]
+        filled[buys] = True
+        return filled
+
+    @property
+    def portfolio_value(self):
+        return float(self.holdings @ self.prices)
+
+    @property
+    def equity(self):
+        return self.cash + self.portfolio_value
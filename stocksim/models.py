@@ -0,0 +1,300 @@
+"""Price-model registry.
+
+A model knows how to advance one price by a single tick (``step``) for the
+interactive game and how to generate many paths at once (``paths``) through the
+vectorized engine, plus the captions and file naming the game uses for it. The
+replay model plays back a recorded price file through the same interface.
+
+Some models carry state from tick to tick: GARCH carries its conditional variance
+and the regime-switching model its current regime. They name these attributes in
+``state_keys``. Saves keep them, ``paths`` starts from them, and ``advance``
+carries them through a vectorized run of the game's own path.
+"""
+import math
+import os
+import random
+
+import numpy as np
+
+from . import engine
+from .replay import PriceFeed
+from .rng import NORMAL, UNIFORM
+
+
+class PriceModel:
+    name = None
+    caption = "Stock Trading Simulator"
+    title = "Stock Simulator"
+    save_suffix = ""
+    log_prefix = "log_"
+    defaults = {}
+    path_generator = None
+    noise = None  # kind of random draw each tick consumes (see rng.RandomStream)
+    draws = 1     # how many of them
+    state_keys = ()  # attributes the model carries from tick to tick, e.g. a GARCH variance
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise TypeError(f"{self.name} model got unexpected parameters {sorted(unknown)}")
+        self.params = {**self.defaults, **params}
+
+    def step(self, price, rng=random):
+        raise NotImplementedError
+
+    def reset(self):
+        """Start price of a new game."""
+        return engine.START_PRICE
+
+    def state(self):
+        """Progress a save must keep beyond the price itself (see ``restore``)."""
+        return {key: getattr(self, key) for key in self.state_keys}
+
+    def restore(self, state, ticks_since=0):
+        """Resume from ``state``, then skip ``ticks_since`` ticks recovered from the journal."""
+        for key in self.state_keys:
+            if key in state: setattr(self, key, state[key])
+
+    def paths(self, n_paths, n_steps, start=engine.START_PRICE, rng=None, state=None):
+        """Independent paths, each starting from the model's current state.
+
+        For a model with ``state_keys``, ``state`` maps each key to per-path starting values
+        (taken from the model where missing) and is updated in place to where each path ends.
+        """
+        if not self.state_keys:
+            return type(self).path_generator(n_paths, n_steps, start=start, rng=rng, **self.params)
+        state = {} if state is None else state
+        for key in self.state_keys: state.setdefault(key, np.full(n_paths, getattr(self, key)))
+        return type(self).path_generator(n_paths, n_steps, start=start, rng=rng, state=state, **self.params)
+
+    def advance(self, price, n_ticks, rng):
+        """The next ``n_ticks`` prices of the game's path in one vectorized call; the model's state moves on with them."""
+        state = {}
+        prices = self.paths(1, n_ticks, start=price, rng=rng, state=state)[0, 1:]
+        for key, values in state.items(): setattr(self, key, values[0].item())
+        return prices
+
+    def skip(self, rng, n_ticks):
+        """Consume the draws of ``n_ticks`` ticks recovered from the journal rather than simulated."""
+        if self.state_keys: self.advance(engine.START_PRICE, n_ticks, rng)
+        elif self.noise: rng.skip(self.noise, n_ticks * self.draws)
+
+    def with_params(self, **params):
+        return type(self)(**{**self.params, **params})
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self.params.items())
+        return f"{type(self).__name__}({args})"
+
+
+class PercentModel(PriceModel):
+    name = "percent"
+    caption = "Stock Trading Simulator v2.5"
+    defaults = {"width": 0.05}
+    path_generator = engine.percent_paths
+    noise = UNIFORM
+
+    def step(self, price, rng=random):
+        width = self.params["width"]
+        price *= 1 + rng.uniform(-width, width)
+        return max(price, engine.PRICE_FLOOR)
+
+
+class AdditiveModel(PriceModel):
+    name = "random"
+    caption = "Stock Trading Simulator v2.5 - Pure Random"
+    title = "Stock Simulator - Random"
+    save_suffix = "_random"
+    log_prefix = "log_random_"
+    defaults = {"width": 5.0}
+    path_generator = engine.additive_paths
+    noise = UNIFORM
+
+    def step(self, price, rng=random):
+        width = self.params["width"]
+        price += rng.uniform(-width, width)
+        return max(price, engine.PRICE_FLOOR)
+
+
+class BrownianModel(PriceModel):
+    name = "brownian"
+    caption = "Stock Trading Simulator v3.5 - Brownian Motion"
+    title = "Stock Simulator - Brownian"
+    save_suffix = "_brownian"
+    log_prefix = "log_brownian_"
+    defaults = {"mu": 0.0005, "sigma": 0.02, "dt": 1.0}
+    path_generator = engine.gbm_paths
+    noise = NORMAL
+
+    def step(self, price, rng=random):
+        mu, sigma, dt = self.params["mu"], self.params["sigma"], self.params["dt"]
+        price += price * (mu * dt + sigma * rng.gauss(0, 1) * math.sqrt(dt))
+        return max(price, engine.PRICE_FLOOR)
+
+
+class JumpDiffusionModel(PriceModel):
+    """Brownian ticks plus rare multiplicative jumps (Merton), for fat-tailed returns."""
+    name = "jump"
+    caption = "Stock Trading Simulator - Jump Diffusion"
+    title = "Stock Simulator - Jumps"
+    save_suffix = "_jump"
+    log_prefix = "log_jump_"
+    defaults = {"mu": 0.0005, "sigma": 0.02, "jump_rate": 0.01, "jump_mu": -0.02, "jump_sigma": 0.08, "dt": 1.0}
+    path_generator = engine.jump_diffusion_paths
+    noise = NORMAL
+    draws = 3
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._jump_below = engine.event_threshold(-math.expm1(-self.params["jump_rate"] * self.params["dt"]))
+
+    def step(self, price, rng=random):
+        mu, sigma, dt = self.params["mu"], self.params["sigma"], self.params["dt"]
+        shock, jump, size = rng.gauss(0, 1), rng.gauss(0, 1), rng.gauss(0, 1)
+        price += price * (mu * dt + sigma * shock * math.sqrt(dt))
+        if jump < self._jump_below: price *= math.exp(self.params["jump_mu"] + self.params["jump_sigma"] * size)
+        return max(price, engine.PRICE_FLOOR)
+
+
+class GarchModel(PriceModel):
+    """Volatility clustering: GARCH(1,1) conditional variance, carried in ``variance``."""
+    name = "garch"
+    caption = "Stock Trading Simulator - GARCH Volatility"
+    title = "Stock Simulator - GARCH"
+    save_suffix = "_garch"
+    log_prefix = "log_garch_"
+    defaults = {"mu": 0.0005, "omega": 8e-6, "alpha": 0.08, "beta": 0.9}
+    path_generator = engine.garch_paths
+    noise = NORMAL
+    state_keys = ("variance",)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.variance = self.long_run_variance
+
+    @property
+    def long_run_variance(self):
+        return engine.garch_long_run_variance(self.params["omega"], self.params["alpha"], self.params["beta"])
+
+    def reset(self):
+        self.variance = self.long_run_variance
+        return super().reset()
+
+    def step(self, price, rng=random):
+        shock, variance = rng.gauss(0, 1), self.variance
+        price += price * (self.params["mu"] + math.sqrt(variance) * shock)
+        self.variance = self.params["omega"] + (self.params["alpha"] * shock * shock + self.params["beta"]) * variance
+        return max(price, engine.PRICE_FLOOR)
+
+
+class RegimeSwitchingModel(PriceModel):
+    """Calm and turbulent markets: a two-state Markov chain picks the drift and volatility of each tick."""
+    name = "regime"
+    caption = "Stock Trading Simulator - Regime Switching"
+    title = "Stock Simulator - Regimes"
+    save_suffix = "_regime"
+    log_prefix = "log_regime_"
+    defaults = {"mu_calm": 0.0008, "sigma_calm": 0.01, "mu_turbulent": -0.002, "sigma_turbulent": 0.04,
+                "p_enter": 0.01, "p_exit": 0.05, "dt": 1.0}
+    path_generator = engine.regime_paths
+    noise = NORMAL
+    draws = 2
+    state_keys = ("regime",)
+    CALM, TURBULENT = 0, 1
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.regime = self.CALM
+        self._switch_below = (engine.event_threshold(self.params["p_enter"]), engine.event_threshold(self.params["p_exit"]))
+        self._drift_vol = tuple((self.params[f"mu_{r}"], self.params[f"sigma_{r}"]) for r in ("calm", "turbulent"))
+
+    def reset(self):
+        self.regime = self.CALM
+        return super().reset()
+
+    def step(self, price, rng=random):
+        shock, switch = rng.gauss(0, 1), rng.gauss(0, 1)
+        (mu, sigma), dt = self._drift_vol[self.regime], self.params["dt"]
+        price += price * (mu * dt + sigma * shock * math.sqrt(dt))
+        if switch < self._switch_below[self.regime]: self.regime = 1 - self.regime
+        return max(price, engine.PRICE_FLOOR)
+
+
+class ReplayModel(PriceModel):
+    """Recorded prices instead of a random walk: each tick is the next line of a log or CSV file."""
+    name = "replay"
+    caption = "Stock Trading Simulator - Replay"
+    title = "Stock Simulator - Replay"
+    save_suffix = "_replay"
+    log_prefix = "log_replay_"
+    defaults = {"path": None, "column": None}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.feed = PriceFeed(self.params["path"], self.params["column"]) if self.params["path"] else None
+
+    def _require_feed(self):
+        if self.feed is None:
+            raise ValueError("replay model needs a price file: ReplayModel(path=...)")
+        return self.feed
+
+    def reset(self):
+        feed = self._require_feed()
+        feed.seek(0)
+        first = feed.read(1)
+        return float(first[0]) if len(first) else engine.START_PRICE
+
+    def step(self, price, rng=random):
+        # Once the file runs out the price holds at its last value.
+        next_price = self._require_feed().read(1)
+        return float(next_price[0]) if len(next_price) else price
+
+    def paths(self, n_paths, n_steps, start=engine.START_PRICE, rng=None, state=None):
+        if n_paths != 1:
+            raise ValueError("a replayed price file is a single path")
+        paths = np.full((1, n_steps + 1), start, dtype=np.float64)
+        prices = self._require_feed().read(n_steps)
+        paths[0, 1:len(prices) + 1] = prices
+        if len(prices): paths[0, len(prices) + 1:] = prices[-1]
+        return paths
+
+    def seek(self, tick):
+        return self._require_feed().seek(tick)
+
+    def state(self):
+        if self.feed is None: return {}
+        return {"position": self.feed.position, "offset": self.feed.offset}
+
+    def restore(self, state, ticks_since=0):
+        feed = self._require_feed()
+        if "position" in state: feed.restore(state["position"], state["offset"])
+        if ticks_since: feed.seek(feed.position + ticks_since)
+
+
+MODELS = {}
+
+
+def register_model(model_cls):
+    MODELS[model_cls.name] = model_cls
+    return model_cls
+
+
+def get_model(name, **params):
+    try:
+        model_cls = MODELS[name]
+    except KeyError:
+        raise ValueError(f"unknown price model {name!r}; expected one of {sorted(MODELS)}") from None
+    return model_cls(**params)
+
+
+def model_for_save(filename):
+    """Name of the model a save file belongs to, judged by its longest matching suffix."""
+    stem = os.path.splitext(filename)[0]
+    matches = [cls for cls in MODELS.values() if stem.endswith(cls.save_suffix)]
+    if not matches:
+        return None
+    return max(matches, key=lambda cls: len(cls.save_suffix)).name
+
+
+for _model_cls in (PercentModel, AdditiveModel, BrownianModel, JumpDiffusionModel, GarchModel, RegimeSwitchingModel, ReplayModel):
+    register_model(_model_cls)
@@ -0,0 +1,112 @@
+"""Multi-core Monte Carlo evaluation of trading strategies.
+
+Paths are split into fixed-size chunks, and each chunk gets its own child of one
+``numpy.random.SeedSequence``. Results therefore depend only on ``seed`` and
+``chunk_size``, never on how many worker processes ran the chunks.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import START_PRICE
+from .game import STARTING_CASH
+from .models import PriceModel, get_model
+from .trading import apply_orders, buy_shares, sell_shares
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class MonteCarloResult:
+    def __init__(self, pnl, max_drawdown, quantiles=DEFAULT_QUANTILES):
+        self.pnl = pnl
+        self.max_drawdown = max_drawdown
+        self.quantiles = tuple(quantiles)
+
+    @property
+    def n_paths(self):
+        return len(self.pnl)
+
+    def summary(self):
+        q = np.array(self.quantiles)
+        return {
+            "n_paths": self.n_paths,
+            "mean_pnl": float(self.pnl.mean()),
+            "std_pnl": float(self.pnl.std()),
+            "pnl_quantiles": dict(zip(self.quantiles, np.quantile(self.pnl, q).tolist())),
+            "prob_loss": float((self.pnl < 0).mean()),
+            "mean_max_drawdown": float(self.max_drawdown.mean()),
+            "max_drawdown_quantiles": dict(zip(self.quantiles, np.quantile(self.max_drawdown, q).tolist())),
+        }
+
+
+# --- Per-chunk evaluation ---
+def _run_scalar(strategy, paths, cash):
+    n_paths, n_points = paths.shape
+    pnl = np.empty(n_paths)
+    max_drawdown = np.empty(n_paths)
+    for i, path in enumerate(paths.tolist()):
+        path_cash, shares = cash, 0
+        peak, worst = cash, 0.0
+        for price in path[:-1]:
+            amount = int(strategy(price, path_cash, shares))
+            if amount > 0: path_cash, shares = buy_shares(path_cash, shares, price, amount)
+            elif amount < 0: path_cash, shares = sell_shares(path_cash, shares, price, -amount)
+            equity = path_cash + shares * price
+            if equity > peak: peak = equity
+            elif (peak - equity) / peak > worst: worst = (peak - equity) / peak
+        equity = path_cash + shares * path[-1]
+        if equity < peak: worst = max(worst, (peak - equity) / peak)
+        pnl[i] = equity - cash
+        max_drawdown[i] = worst
+    return pnl, max_drawdown
+
+
+def _run_vectorized(strategy, paths, cash):
+    n_paths, n_points = paths.shape
+    path_cash = np.full(n_paths, float(cash))
+    shares = np.zeros(n_paths, dtype=np.int64)
+    equity = np.empty_like(paths)
+    for t in range(n_points - 1):
+        prices = paths[:, t]
+        apply_orders(path_cash, shares, prices, strategy(prices, path_cash, shares))
+        equity[:, t] = path_cash + shares * prices
+    equity[:, -1] = path_cash + shares * paths[:, -1]
+    peak = np.maximum.accumulate(equity, axis=1)
+    max_drawdown = ((peak - equity) / peak).max(axis=1)
+    return equity[:, -1] - cash, max_drawdown
+
+
+def _run_chunk(strategy, model, n_paths, n_steps, start, cash, seed_seq, vectorized):
+    paths = model.paths(n_paths, n_steps, start=start, rng=np.random.default_rng(seed_seq))
+    run = _run_vectorized if vectorized else _run_scalar
+    return run(strategy, paths, cash)
+
+
+def run_monte_carlo(strategy, model="percent", n_paths=10000, n_steps=1000, start=START_PRICE,
+                    cash=STARTING_CASH, seed=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    vectorized=False, quantiles=DEFAULT_QUANTILES):
+    """Evaluate ``strategy`` over ``n_paths`` simulated paths of ``n_steps`` ticks.
+
+    With ``vectorized=True`` the strategy is called once per tick with arrays covering
+    a whole chunk of paths instead of once per path and tick. ``workers=1`` runs in
+    the calling process; ``None`` uses every CPU.
+    """
+    model = model if isinstance(model, PriceModel) else get_model(model)
+    n_chunks = math.ceil(n_paths / chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [min(chunk_size, n_paths - i * chunk_size) for i in range(n_chunks)]
+    args = [(strategy, model, size, n_steps, start, cash, seed_seq, vectorized) for size, seed_seq in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n_chunks == 1:
+        results = [_run_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, n_chunks)) as pool:
+            results = list(pool.map(_run_chunk, *zip(*args)))
+
+    pnl = np.concatenate([r[0] for r in results])
+    max_drawdown = np.concatenate([r[1] for r in results])
+    return MonteCarloResult(pnl, max_drawdown, quantiles)
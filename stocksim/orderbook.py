@@ -0,0 +1,186 @@
+"""Resting limit, stop and stop-limit orders matched against each simulated tick.
+
+The simulated price is the only counterparty: on each tick, stops whose trigger
+price was crossed fire first (stops become market orders, stop-limits become
+limit orders), then every limit order the price has reached fills at the tick
+price. Within each group orders go best price first, then oldest first. Fills go
+through the game's cash/share rules (``buy_shares``/``sell_shares``). An order
+the account cannot cover when it triggers is rejected, just like pressing Buy
+without the cash.
+
+Each side of each order type is a binary heap of ``(price key, order id)``.
+Cancels only drop the order from the ``orders`` dict, and the heaps skip such
+entries lazily, so submit and cancel cost O(log n) and a tick that touches no
+order costs O(1).
+"""
+import heapq
+import math
+
+import numpy as np
+
+from .trading import buy_shares, sell_shares
+
+BUY, SELL = "buy", "sell"
+LIMIT, STOP, STOP_LIMIT = "limit", "stop", "stop_limit"
+ORDER_TYPES = (LIMIT, STOP, STOP_LIMIT)
+
+
+class Order:
+    __slots__ = ("id", "side", "kind", "amount", "limit", "stop", "status")
+
+    def __init__(self, id, side, kind, amount, limit=None, stop=None):
+        self.id, self.side, self.kind, self.amount = id, side, kind, amount
+        self.limit, self.stop = limit, stop
+        self.status = "open"
+
+    def to_dict(self):
+        return {"id": self.id, "side": self.side, "kind": self.kind, "amount": self.amount,
+                "limit": self.limit, "stop": self.stop}
+
+    def __repr__(self):
+        price = f" limit={self.limit}" if self.limit is not None else ""
+        price += f" stop={self.stop}" if self.stop is not None else ""
+        return f"Order(#{self.id} {self.side} {self.amount} {self.kind}{price} {self.status})"
+
+
+class Fill:
+    __slots__ = ("order_id", "side", "amount", "price", "tick", "filled")
+
+    def __init__(self, order_id, side, amount, price, tick, filled):
+        self.order_id, self.side, self.amount = order_id, side, amount
+        self.price, self.tick, self.filled = price, tick, filled
+
+    def __repr__(self):
+        verb = "filled" if self.filled else "rejected"
+        return f"Fill(#{self.order_id} {self.side} {self.amount} @ {self.price:.4f} tick={self.tick} {verb})"
+
+
+class OrderBook:
+    def __init__(self):
+        self.orders = {}  # open orders by id; ids double as time priority
+        self._next_id = 1
+        self._buy_limits = []   # (-limit, id): highest bid first
+        self._sell_limits = []  # (limit, id): lowest offer first
+        self._buy_stops = []    # (stop, id): fire when price >= stop
+        self._sell_stops = []   # (-stop, id): fire when price <= stop
+        self._dead = 0
+
+    def __len__(self):
+        return len(self.orders)
+
+    # --- Order entry ---
+    def submit(self, side, amount, kind=LIMIT, limit=None, stop=None, order_id=None):
+        if side not in (BUY, SELL): raise ValueError(f"side must be {BUY!r} or {SELL!r}")
+        if kind not in ORDER_TYPES: raise ValueError(f"order type must be one of {ORDER_TYPES}")
+        if not isinstance(amount, int) or amount <= 0: raise ValueError("amount must be a positive integer")
+        if kind in (LIMIT, STOP_LIMIT) and limit is None: raise ValueError(f"{kind} order needs a limit price")
+        if kind in (STOP, STOP_LIMIT) and stop is None: raise ValueError(f"{kind} order needs a stop price")
+        order_id = order_id or self._next_id
+        self._next_id = max(self._next_id, order_id + 1)
+        order = Order(order_id, side, kind, amount, limit, stop)
+        self.orders[order_id] = order
+        if kind == LIMIT: self._push_limit(order)
+        elif side == BUY: heapq.heappush(self._buy_stops, (stop, order_id))
+        else: heapq.heappush(self._sell_stops, (-stop, order_id))
+        return order_id
+
+    def _push_limit(self, order):
+        if order.side == BUY: heapq.heappush(self._buy_limits, (-order.limit, order.id))
+        else: heapq.heappush(self._sell_limits, (order.limit, order.id))
+
+    def trigger(self, order_id):
+        """Turn an open stop-limit order into the limit order its stop being crossed makes it."""
+        order = self.orders.get(order_id)
+        if order is None or order.kind != STOP_LIMIT: return False
+        order.kind = LIMIT
+        self._push_limit(order)
+        return True
+
+    def cancel(self, order_id):
+        order = self.orders.pop(order_id, None)
+        if order is None: return False
+        order.status = "cancelled"
+        self._dead += 1
+        if self._dead > 64 and self._dead > len(self.orders): self._compact()
+        return True
+
+    def _compact(self):
+        for heap in (self._buy_limits, self._sell_limits, self._buy_stops, self._sell_stops):
+            heap[:] = [entry for entry in heap if entry[1] in self.orders]
+            heapq.heapify(heap)
+        self._dead = 0
+
+    def _top(self, heap):
+        while heap and heap[0][1] not in self.orders: heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    # --- Matching ---
+    def trigger_bounds(self):
+        """(low, high): a tick needs matching only if its price is <= low or >= high."""
+        buy_limit, sell_stop = self._top(self._buy_limits), self._top(self._sell_stops)
+        sell_limit, buy_stop = self._top(self._sell_limits), self._top(self._buy_stops)
+        low = max(-buy_limit[0] if buy_limit else -math.inf, -sell_stop[0] if sell_stop else -math.inf)
+        high = min(sell_limit[0] if sell_limit else math.inf, buy_stop[0] if buy_stop else math.inf)
+        return low, high
+
+    def _execute(self, order, price, cash, shares, tick, fills):
+        del self.orders[order.id]
+        trade = buy_shares if order.side == BUY else sell_shares
+        new_cash, new_shares = trade(cash, shares, price, order.amount)
+        filled = new_shares != shares
+        order.status = "filled" if filled else "rejected"
+        fills.append(Fill(order.id, order.side, order.amount, price, tick, filled))
+        return new_cash, new_shares
+
+    def match(self, price, cash, shares, tick=None, on_trigger=None):
+        """Match resting orders against one tick; returns (cash, shares, fills).
+
+        ``on_trigger(order, tick)`` is called for every stop-limit order that becomes a limit order.
+        """
+        fills = []
+        # Stops first, in trigger-price then time order.
+        for heap, crossed in ((self._buy_stops, lambda key: key <= price), (self._sell_stops, lambda key: -key >= price)):
+            while (top := self._top(heap)) is not None and crossed(top[0]):
+                heapq.heappop(heap)
+                order = self.orders[top[1]]
+                if order.kind == STOP:
+                    cash, shares = self._execute(order, price, cash, shares, tick, fills)
+                elif self.trigger(order.id) and on_trigger:
+                    on_trigger(order, tick)
+        for heap, reached in ((self._buy_limits, lambda key: -key >= price), (self._sell_limits, lambda key: key <= price)):
+            while (top := self._top(heap)) is not None and reached(top[0]):
+                heapq.heappop(heap)
+                cash, shares = self._execute(self.orders[top[1]], price, cash, shares, tick, fills)
+        return cash, shares, fills
+
+    def match_path(self, prices, cash, shares, first_tick=0, on_fill=None, on_trigger=None):
+        """Match against a run of ticks, only visiting ticks that cross a trigger.
+
+        ``on_fill(fill)`` is called for every fill in order, ``on_trigger`` as in ``match``.
+        Returns (cash, shares, fills).
+        """
+        prices = np.asarray(prices)
+        fills = []
+        i = 0
+        while self.orders and i < len(prices):
+            low, high = self.trigger_bounds()
+            hits = np.flatnonzero((prices[i:] <= low) | (prices[i:] >= high))
+            if not len(hits): break
+            i += int(hits[0])
+            cash, shares, tick_fills = self.match(float(prices[i]), cash, shares, first_tick + i, on_trigger)
+            if on_fill:
+                for fill in tick_fills: on_fill(fill)
+            fills.extend(tick_fills)
+            i += 1
+        return cash, shares, fills
+
+    # --- Persistence ---
+    def to_list(self):
+        return [order.to_dict() for order in sorted(self.orders.values(), key=lambda order: order.id)]
+
+    @classmethod
+    def from_list(cls, orders):
+        book = cls()
+        for order in orders:
+            book.submit(order["side"], order["amount"], order["kind"], order["limit"], order["stop"], order_id=order["id"])
+        return book
@@ -0,0 +1,143 @@
+"""Per-frame phase timings for the game loop, with Chrome trace export.
+
+The loop calls ``begin_frame``, then ``mark(phase)`` as each phase ends (in
+``phases`` order), then ``end_frame``. Timings go into fixed-size ring buffers holding the last
+``capacity`` frames, so percentiles always describe recent play and recording
+never allocates. Garbage-collector pauses are timed through ``gc.callbacks``
+and kept apart from the phase they interrupted, so a stutter can be pinned on
+the loop phase or on the collector.
+
+``export_chrome_trace`` writes the buffered frames as trace-event JSON, which
+loads in ``chrome://tracing`` or Perfetto: one slice per phase, the collector
+on its own track and counters for ticks per frame and tick lag.
+"""
+import gc
+import json
+import os
+import time
+
+import numpy as np
+
+PHASES = ("events", "tick", "graph", "hud", "flip")
+FRAME_CAPACITY = 1024
+GC_CAPACITY = 256
+
+
+def _percentiles(values, qs=(50, 99)):
+    return np.percentile(values, qs) if len(values) else np.zeros(len(qs))
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, capacity=FRAME_CAPACITY):
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self._index = {phase: i for i, phase in enumerate(self.phases)}
+        self.starts = np.zeros(capacity)                      # perf_counter seconds at begin_frame
+        self.durations = np.zeros((capacity, len(self.phases)))  # ms per phase
+        self.frame_ms = np.zeros(capacity)
+        self.gc_ms = np.zeros(capacity)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+        self.tick_lag_ms = np.zeros(capacity)
+        self.gc_events = np.zeros((GC_CAPACITY, 3))  # start seconds, ms, generation
+        self.frames = 0
+        self.gc_count = 0
+        self._row = 0
+        self._last = self._frame_start = 0.0
+        self._gc_start = None
+        self._frame_gc = 0.0
+        gc.callbacks.append(self._on_gc)
+
+    def close(self):
+        if self._on_gc in gc.callbacks: gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        now = time.perf_counter()
+        if phase == "start":
+            self._gc_start = now
+        elif self._gc_start is not None:
+            ms = (now - self._gc_start) * 1e3
+            self._frame_gc += ms
+            self.gc_events[self.gc_count % GC_CAPACITY] = (self._gc_start, ms, info.get("generation", 0))
+            self.gc_count += 1
+            self._gc_start = None
+
+    # --- Recording ---
+    def begin_frame(self):
+        self._row = self.frames % self.capacity
+        self.durations[self._row] = 0.0
+        self._frame_gc = 0.0
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """End ``phase``: it took the time since the previous mark (or ``begin_frame``)."""
+        now = time.perf_counter()
+        self.durations[self._row, self._index[phase]] += (now - self._last) * 1e3
+        self._last = now
+
+    def end_frame(self, ticks=0, tick_lag_ms=0.0):
+        row = self._row
+        self.starts[row] = self._frame_start
+        self.frame_ms[row] = (time.perf_counter() - self._frame_start) * 1e3
+        self.gc_ms[row] = self._frame_gc
+        self.ticks[row] = ticks
+        self.tick_lag_ms[row] = tick_lag_ms
+        self.frames += 1
+
+    # --- Reading ---
+    def _recent(self, column):
+        """Buffered rows of ``column`` in frame order (oldest first)."""
+        n = min(self.frames, self.capacity)
+        if self.frames <= self.capacity: return column[:n]
+        return np.roll(column, -(self.frames % self.capacity), axis=0)
+
+    def fps(self):
+        """Frames per second over the buffered window, by frame start times."""
+        starts = self._recent(self.starts)
+        if len(starts) < 2: return 0.0
+        span = starts[-1] - starts[0]
+        return (len(starts) - 1) / span if span > 0 else 0.0
+
+    def summary(self):
+        """Recent FPS, p50/p99 frame, phase and GC times, and tick lag, all in ms."""
+        frame_p50, frame_p99 = _percentiles(self._recent(self.frame_ms))
+        durations = self._recent(self.durations)
+        lag = self._recent(self.tick_lag_ms)[self._recent(self.ticks) > 0]
+        stats = {"frames": self.frames, "fps": self.fps(), "frame_p50": frame_p50, "frame_p99": frame_p99,
+                 "gc_p99": _percentiles(self._recent(self.gc_ms))[1], "gc_count": self.gc_count}
+        for i, phase in enumerate(self.phases):
+            stats[f"{phase}_p50"], stats[f"{phase}_p99"] = _percentiles(durations[:, i])
+        stats["tick_lag_p50"], stats["tick_lag_p99"] = _percentiles(lag)
+        return stats
+
+    # --- Export ---
+    def trace_events(self):
+        """Buffered frames as Chrome trace events (microsecond timestamps)."""
+        starts = self._recent(self.starts)
+        if not len(starts): return []
+        origin = starts[0]
+        us = lambda seconds: (seconds - origin) * 1e6
+        events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                  for tid, name in ((1, "frame loop"), (2, "gc"))]
+        durations, frame_ms = self._recent(self.durations), self._recent(self.frame_ms)
+        ticks, lag = self._recent(self.ticks), self._recent(self.tick_lag_ms)
+        for frame, start in enumerate(starts.tolist()):
+            ts = us(start)
+            events.append({"name": "frame", "cat": "frame", "ph": "X", "pid": 1, "tid": 1, "ts": ts, "dur": frame_ms[frame] * 1e3})
+            # Phases run back to back from the frame start.
+            for phase, ms in zip(self.phases, durations[frame].tolist()):
+                if ms: events.append({"name": phase, "cat": "phase", "ph": "X", "pid": 1, "tid": 1, "ts": ts, "dur": ms * 1e3})
+                ts += ms * 1e3
+            events.append({"name": "ticks", "ph": "C", "pid": 1, "ts": us(start), "args": {"ticks": int(ticks[frame])}})
+            events.append({"name": "tick lag (ms)", "ph": "C", "pid": 1, "ts": us(start), "args": {"lag": float(lag[frame])}})
+        n_gc = min(self.gc_count, GC_CAPACITY)
+        for gc_start, ms, generation in self.gc_events[:n_gc].tolist():
+            if gc_start >= origin:
+                events.append({"name": f"gc gen {int(generation)}", "cat": "gc", "ph": "X", "pid": 1, "tid": 2,
+                               "ts": us(gc_start), "dur": ms * 1e3})
+        return events
+
+    def export_chrome_trace(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        return path
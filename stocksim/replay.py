@@ -0,0 +1,171 @@
+"""Stream recorded prices from ``log_data`` logs or CSV files as a tick feed.
+
+A ``PriceFeed`` memory-maps the file and parses it a block at a time, so even
+multi-gigabyte files are never loaded whole. Every line is one tick, except that
+blank lines (such as a trailing one) are skipped; positions count lines. Logs hold
+one price per line; in a CSV the price column is picked by name or index (by
+default "Adj Close", then "Close", then the last column), and a header row is
+detected and skipped. Every ``MARK_EVERY``-th tick's byte offset is remembered
+as the file is read, so ``seek`` only ever scans forward from the nearest mark.
+"""
+import mmap
+import os
+
+import numpy as np
+
+BLOCK_BYTES = 1 << 20
+SCAN_BYTES = 1 << 24
+MARK_EVERY = 1 << 12
+PRICE_COLUMNS = ("adj close", "close")
+
+
+def _newlines(block):
+    return np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord("\n"))
+
+
+class PriceFeed:
+    def __init__(self, path, column=None):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file; an empty feed is simply exhausted.
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+        self.delimiter = None
+        self.column = 0
+        self._data_start = 0
+        self._inspect(column)
+        self.position = 0
+        self.offset = self._data_start
+        self._marks = [self._data_start]
+
+    def _inspect(self, column):
+        end = self._mm.find(b"\n", 0, BLOCK_BYTES) if self.size else -1
+        first = self._mm[:end if end >= 0 else BLOCK_BYTES].strip()
+        if b"," in first: self.delimiter = b","
+        elif b";" in first: self.delimiter = b";"
+        if self.delimiter is None:
+            if first and not _is_number(first): self._data_start = end + 1
+            return
+        fields = [f.strip().strip(b'"').decode("utf-8", "replace") for f in first.split(self.delimiter)]
+        header = not any(_is_number(f.encode()) for f in fields)
+        if header: self._data_start = end + 1
+        if isinstance(column, int):
+            self.column = column
+        elif column is not None:
+            if not header or column.lower() not in [f.lower() for f in fields]:
+                raise ValueError(f"{self.path}: no column named {column!r}")
+            self.column = [f.lower() for f in fields].index(column.lower())
+        else:
+            names = [f.lower() for f in fields] if header else []
+            self.column = next((names.index(n) for n in PRICE_COLUMNS if n in names), len(fields) - 1)
+
+    def close(self):
+        if self.size: self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def exhausted(self):
+        return self.offset >= self.size
+
+    # --- Reading ---
+    def _parse(self, lines):
+        if self.delimiter is not None:
+            lines = [line.split(self.delimiter)[self.column].strip().strip(b'"') if line.strip() else b"" for line in lines]
+        try:
+            return np.array(lines).astype(np.float64)
+        except ValueError:
+            pass
+        try:
+            return np.array([line for line in lines if line.strip()]).astype(np.float64)
+        except ValueError:
+            bad = next(i for i, line in enumerate(lines) if line.strip() and not _is_number(line))
+            raise ValueError(f"{self.path}: bad price at tick {self.position + bad}: {lines[bad].strip()!r}") from None
+
+    def _mark(self, starts):
+        # starts[i] is the byte offset of tick self.position + i.
+        first = len(self._marks) * MARK_EVERY
+        if self.position <= first < self.position + len(starts):
+            self._marks.extend(starts[first - self.position::MARK_EVERY].tolist())
+
+    def _lines(self, limit, block_bytes=BLOCK_BYTES):
+        """Up to ``limit`` whole lines from the current offset: (lines, start offsets, end offset)."""
+        while True:
+            block = self._mm[self.offset:self.offset + block_bytes]
+            ends = _newlines(block)
+            if self.offset + len(block) >= self.size and block and block[-1:] != b"\n":
+                ends = np.append(ends, len(block))  # last line without a trailing newline
+            if len(ends) or not block: break
+            block_bytes *= 2  # a single line longer than the block
+        ends = ends[:limit]
+        if not len(ends): return [], ends, self.offset
+        starts = np.concatenate(([0], ends[:-1] + 1)) + self.offset
+        return block[:ends[-1]].split(b"\n"), starts, self.offset + int(ends[-1]) + 1
+
+    def read(self, n):
+        """The next ``n`` prices (fewer at the end of the file) as a float64 array."""
+        chunks = []
+        while n > 0 and not self.exhausted:
+            lines, starts, end = self._lines(n)
+            if not lines: break
+            values = self._parse(lines)
+            self._mark(starts)
+            chunks.append(values)
+            self.position += len(lines)
+            self.offset = min(end, self.size)
+            n -= len(values)
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    def __iter__(self):
+        while not self.exhausted:
+            yield from self.read(MARK_EVERY).tolist()
+
+    # --- Seeking ---
+    def tell(self):
+        return self.position
+
+    def seek(self, tick):
+        """Move so that the next price read is tick ``tick`` (clamped to the end of the file)."""
+        tick = max(0, int(tick))
+        mark = min(tick // MARK_EVERY, len(self._marks) - 1)
+        self.position, self.offset = mark * MARK_EVERY, self._marks[mark]
+        while self.position < tick and not self.exhausted:
+            # Skip whole lines without parsing them, noting marks on the way.
+            block = self._mm[self.offset:self.offset + SCAN_BYTES]
+            ends = _newlines(block)[:tick - self.position]
+            if not len(ends):
+                if block: self.position += 1  # last line without a trailing newline
+                self.offset = self.size
+                break
+            self._mark(np.concatenate(([0], ends[:-1] + 1)) + self.offset)
+            self.position += len(ends)
+            self.offset += int(ends[-1]) + 1
+        return self.position
+
+    def restore(self, position, offset):
+        """Return to a position/offset pair from ``tell``/``offset``, e.g. one kept in a save."""
+        if not self._data_start <= offset <= self.size:
+            return self.seek(position)
+        self.position, self.offset = position, offset
+        return position
+
+
+def _is_number(field):
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def iter_prices(path, column=None, start=0):
+    """Lazily yield the prices of a log or CSV file from tick ``start`` on."""
+    with PriceFeed(path, column) as feed:
+        feed.seek(start)
+        yield from feed
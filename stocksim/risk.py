@@ -0,0 +1,176 @@
+"""Monte Carlo risk of the current position over a horizon of future ticks.
+
+``estimate_risk`` simulates the price model forward from the current price (and
+the model's current state, e.g. a GARCH variance) with its batch path generator.
+It holds the position fixed and reports, for the equity ``cash + shares * price``:
+
+* Value-at-Risk and CVaR (expected shortfall) of the loss at the horizon
+* the probability of ruin: equity dropping below ``ruin_fraction`` of its current
+  value at any tick before the horizon
+* the expected maximum drawdown
+
+Paths are simulated a chunk at a time and only per-path results are kept, so
+100,000 paths over a long horizon never hold the whole price matrix in memory.
+
+``RiskWorker`` runs estimates on a background thread for the game screen.
+Submitting a new position supersedes an estimate still in progress. The frame
+loop reads the latest finished ``report`` and never waits. NumPy releases the
+GIL inside the large array operations each chunk consists of, so the frame
+loop keeps running while the worker computes.
+"""
+import threading
+import time
+
+import numpy as np
+
+from .models import PriceModel, get_model
+
+DEFAULT_HORIZON = 500
+DEFAULT_PATHS = 100_000
+DEFAULT_CONFIDENCE = (0.95, 0.99)
+RUIN_FRACTION = 0.5
+CHUNK_TICKS = 1 << 21  # simulated ticks per chunk; paths per chunk = CHUNK_TICKS // horizon
+
+
+class RiskReport:
+    def __init__(self, cash, shares, price, horizon, pnl, max_drawdown, ruined, confidence, ruin_fraction, model=None):
+        self.cash = cash
+        self.shares = shares
+        self.price = price
+        self.horizon = horizon
+        self.pnl = pnl
+        self.max_drawdown = max_drawdown
+        self.ruined = ruined
+        self.confidence = tuple(confidence)
+        self.ruin_fraction = ruin_fraction
+        self.model = model
+        self.elapsed = 0.0
+        self.tick = None
+
+    @property
+    def equity(self):
+        return self.cash + self.shares * self.price
+
+    @property
+    def n_paths(self):
+        return len(self.pnl)
+
+    def var(self, confidence):
+        """Loss at the horizon exceeded with probability ``1 - confidence`` (positive is a loss)."""
+        return float(np.quantile(-self.pnl, confidence))
+
+    def cvar(self, confidence):
+        """Mean loss at the horizon in the worst ``1 - confidence`` of paths."""
+        losses = -self.pnl
+        return float(losses[losses >= np.quantile(losses, confidence)].mean())
+
+    @property
+    def prob_ruin(self):
+        return float(self.ruined.mean())
+
+    @property
+    def expected_max_drawdown(self):
+        return float(self.max_drawdown.mean())
+
+    def summary(self):
+        stats = {"n_paths": self.n_paths, "horizon": self.horizon, "equity": self.equity,
+                 "prob_ruin": self.prob_ruin, "expected_max_drawdown": self.expected_max_drawdown}
+        for c in self.confidence:
+            stats[f"var_{c:g}"], stats[f"cvar_{c:g}"] = self.var(c), self.cvar(c)
+        return stats
+
+
+def estimate_risk(cash, shares, price, model="percent", horizon=DEFAULT_HORIZON, n_paths=DEFAULT_PATHS,
+                  confidence=DEFAULT_CONFIDENCE, ruin_fraction=RUIN_FRACTION, seed=None, cancelled=None):
+    """Risk of holding ``shares`` and ``cash`` for ``horizon`` ticks; ``None`` if ``cancelled()`` turns true."""
+    model = model if isinstance(model, PriceModel) else get_model(model)
+    rng = np.random.default_rng(seed)
+    equity0 = cash + shares * price
+    pnl, max_drawdown = np.zeros(n_paths), np.zeros(n_paths)
+    ruined = np.zeros(n_paths, dtype=bool)
+    if shares:
+        chunk = max(1, CHUNK_TICKS // horizon)
+        for lo in range(0, n_paths, chunk):
+            if cancelled and cancelled(): return None
+            n = min(chunk, n_paths - lo)
+            equity = model.paths(n, horizon, start=price, rng=rng)
+            equity *= shares
+            equity += cash
+            pnl[lo:lo + n] = equity[:, -1] - equity0
+            ruined[lo:lo + n] = equity.min(axis=1) < ruin_fraction * equity0
+            peak = np.maximum.accumulate(equity, axis=1)
+            np.divide(equity, peak, out=peak)
+            max_drawdown[lo:lo + n] = 1 - peak.min(axis=1)
+    else:
+        ruined[:] = equity0 < ruin_fraction * equity0  # nothing held: equity stays where it is
+    return RiskReport(cash, shares, price, horizon, pnl, max_drawdown, ruined, confidence, ruin_fraction, model.name)
+
+
+def snapshot(model):
+    """A private copy of ``model`` in its current state, for simulating while the game keeps stepping it."""
+    copy = model.with_params()
+    copy.restore(model.state())
+    return copy
+
+
+class RiskWorker:
+    """Background thread running ``estimate_risk`` for the latest submitted position."""
+
+    def __init__(self, horizon=DEFAULT_HORIZON, n_paths=DEFAULT_PATHS, confidence=DEFAULT_CONFIDENCE, ruin_fraction=RUIN_FRACTION):
+        self.horizon = horizon
+        self.n_paths = n_paths
+        self.confidence = tuple(confidence)
+        self.ruin_fraction = ruin_fraction
+        self.report = None
+        self.error = None
+        self.busy = False
+        self._pending = None
+        self._generation = 0
+        self._closed = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="risk", daemon=True)
+        self._thread.start()
+
+    def submit(self, cash, shares, price, model, tick=None):
+        """Estimate the risk of this position, superseding any estimate not yet finished."""
+        request = (cash, shares, price, snapshot(model), self.horizon, tick)
+        with self._wake:
+            self._pending = request
+            self._generation += 1
+            self.busy = True
+            self._wake.notify()
+
+    def _superseded(self, generation):
+        return self._closed or self._generation != generation
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while self._pending is None and not self._closed: self._wake.wait()
+                if self._closed: return
+                (cash, shares, price, model, horizon, tick), self._pending = self._pending, None
+                generation = self._generation
+            started = time.perf_counter()
+            report, error = None, None
+            try:
+                report = estimate_risk(cash, shares, price, model, horizon, self.n_paths, self.confidence, self.ruin_fraction,
+                                       cancelled=lambda: self._superseded(generation))
+            except ValueError as e:
+                error = str(e)  # e.g. a replayed price file, which is a single path
+            except Exception as e:
+                error = f"risk estimate failed: {e!r}"
+            finally:
+                with self._wake:
+                    if self._generation == generation:
+                        if report is not None:
+                            report.elapsed = time.perf_counter() - started
+                            report.tick = tick
+                            self.report = report
+                        self.error = error
+                        self.busy = False
+
+    def close(self):
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join(timeout=5.0)
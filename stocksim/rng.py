@@ -0,0 +1,112 @@
+"""Seeded, block-buffered random numbers for the tick loop.
+
+A ``RandomStream`` wraps one PCG64 ``numpy.random.Generator`` per simulation.
+Draws are generated ``BLOCK`` at a time and handed out from a buffer, so a tick
+costs a list index rather than an RNG call. The stream is duck-typed to both
+sides of the game: ``uniform(a, b)`` and ``gauss(mu, sigma)`` as in the
+``random`` module for ``PriceModel.step``, and ``uniform(size=...)`` /
+``standard_normal(size=...)`` as on a ``Generator`` for the vectorized engine.
+
+Buffered and bulk draws come off the same sequence: a thousand single draws and
+one draw of a thousand return the same numbers. ``state()`` captures the
+generator as it was before the current block plus the position inside it, so
+``RandomStream.from_state`` resumes on exactly the next draw.
+"""
+import numpy as np
+
+BLOCK = 4096
+UNIFORM = "uniform"
+NORMAL = "normal"
+
+
+def new_seed():
+    """Fresh 128-bit seed from OS entropy."""
+    return int(np.random.SeedSequence().entropy)
+
+
+class RandomStream:
+    def __init__(self, seed=None, block=BLOCK):
+        self.seed = new_seed() if seed is None else int(seed)
+        self.block = block
+        self.generator = np.random.Generator(np.random.PCG64(self.seed))
+        self._clear()
+
+    def _clear(self):
+        self._kind = None
+        self._buffer = []
+        self._pos = 0
+        self._block_state = self.generator.bit_generator.state
+
+    def _draw(self, kind, n):
+        if kind == UNIFORM: return self.generator.random(n)
+        return self.generator.standard_normal(n)
+
+    def _refill(self, kind):
+        # A different kind abandons the rest of the block; each model only ever draws one kind.
+        self._block_state = self.generator.bit_generator.state
+        self._kind = kind
+        self._buffer = self._draw(kind, self.block).tolist()
+        self._pos = 0
+
+    def _next(self, kind):
+        if self._pos >= len(self._buffer) or self._kind != kind: self._refill(kind)
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def _bulk(self, kind, n):
+        """``n`` draws: the rest of the buffer, then straight from the generator."""
+        if self._kind != kind: self._pos = len(self._buffer)
+        head = self._buffer[self._pos:self._pos + n]
+        self._pos += len(head)
+        if len(head) == n: return np.array(head, dtype=np.float64)
+        out = np.empty(n, dtype=np.float64)
+        out[:len(head)] = head
+        out[len(head):] = self._draw(kind, n - len(head))
+        self._clear()
+        return out
+
+    # --- random-module interface (one value per call) ---
+    def random(self):
+        return self._next(UNIFORM)
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        if size is None: return low + (high - low) * self._next(UNIFORM)
+        out = self._bulk(UNIFORM, int(np.prod(size))).reshape(size)
+        out *= high - low
+        out += low
+        return out
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        return mu + sigma * self._next(NORMAL)
+
+    # --- Generator interface (arrays) ---
+    def standard_normal(self, size=None):
+        if size is None: return self._next(NORMAL)
+        return self._bulk(NORMAL, int(np.prod(size))).reshape(size)
+
+    def skip(self, kind, n):
+        """Discard ``n`` draws, e.g. ticks recovered from a journal rather than simulated."""
+        while n > 0:
+            chunk = min(n, 1 << 20)
+            self._bulk(kind, chunk)
+            n -= chunk
+
+    # --- Saving ---
+    def state(self):
+        if self._pos >= len(self._buffer): self._clear()  # nothing left to redraw on load
+        return {"seed": self.seed, "block": self.block, "kind": self._kind, "pos": self._pos,
+                "bit_generator": self._block_state}
+
+    @classmethod
+    def from_state(cls, state):
+        stream = cls(state["seed"], state.get("block", BLOCK))
+        stream.generator.bit_generator.state = state["bit_generator"]
+        stream._clear()
+        if state.get("kind"):
+            stream._refill(state["kind"])
+            stream._pos = state["pos"]
+        return stream
+
+    def __repr__(self):
+        return f"RandomStream(seed={self.seed})"
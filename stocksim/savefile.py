@@ -0,0 +1,233 @@
+"""Compact binary save files with an append-only price history.
+
+Layout (little-endian)::
+
+    header    64 bytes          magic, version, active metadata slot, metadata size/capacity, cash,
+                                shares, price, tick count, ledger record count/capacity
+    metadata  2 * meta_cap      two slots of UTF-8 JSON (model name, parameters, open orders, ...),
+                                zero padded
+    ledger    24 * ledger_cap   trade records (tick, signed amount, price), appended in place
+    history   8 * count         float64 prices, only ever appended to
+
+The header is written last, after the new ledger and history bytes are on disk
+and the new metadata is in the slot the header does not point at; writing it
+switches the active slot and extends the counts together. A crash part-way
+through a save therefore leaves a file that still loads to the previous save; the
+stray bytes past the counts and in the inactive slot are overwritten by the next
+one. When the ledger outgrows its reserved block (or the metadata its slot) the
+file is rewritten once with double the room. Version 1 and 2 files have a single
+metadata slot and are rewritten in this layout on their first save; version 1
+files, which have no ledger, read as having an empty one. Legacy JSON saves are read through
+``read_json_save`` and converted by ``migrate_json``.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from .ledger import LEDGER_DTYPE
+
+MAGIC = b"STKSAVE\x00"
+VERSION = 3
+SAVE_EXT = ".sav"
+LEGACY_EXT = ".json"
+HEADER = struct.Struct("<8sHHIIdqdQII4x")
+HEADER_SIZE = HEADER.size
+DEFAULT_META_CAP = 4096
+DEFAULT_LEDGER_CAP = 1024
+
+
+class SaveFileError(ValueError):
+    pass
+
+
+def _pack_header(header):
+    return HEADER.pack(MAGIC, VERSION, header["meta_slot"], header["meta_len"], header["meta_cap"],
+                       header["cash"], header["shares"], header["price"], header["count"],
+                       header["ledger_count"], header["ledger_cap"])
+
+
+def _encode_meta(meta):
+    return json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+
+
+def _history_bytes(history):
+    return np.asarray(history, dtype="<f8").tobytes()
+
+
+def _ledger_bytes(ledger):
+    return np.asarray(ledger, dtype=LEDGER_DTYPE).tobytes()
+
+
+def _meta_slots(header):
+    return 2 if header["version"] >= 3 else 1
+
+
+def _meta_offset(header, slot):
+    return HEADER_SIZE + slot * header["meta_cap"]
+
+
+def _ledger_offset(header):
+    return HEADER_SIZE + _meta_slots(header) * header["meta_cap"]
+
+
+def _history_offset(header):
+    return _ledger_offset(header) + LEDGER_DTYPE.itemsize * header["ledger_cap"]
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise SaveFileError(f"{path}: truncated header")
+    magic, version, meta_slot, meta_len, meta_cap, cash, shares, price, count, ledger_count, ledger_cap = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise SaveFileError(f"{path}: not a binary save file")
+    if version > VERSION:
+        raise SaveFileError(f"{path}: save format version {version} is newer than supported ({VERSION})")
+    return {"version": version, "meta_slot": meta_slot if version >= 3 else 0, "meta_len": meta_len, "meta_cap": meta_cap,
+            "cash": cash, "shares": shares, "price": price, "count": count,
+            "ledger_count": ledger_count, "ledger_cap": ledger_cap}
+
+
+def is_binary_save(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_meta(path, header=None):
+    header = header or read_header(path)
+    with open(path, "rb") as f:
+        f.seek(_meta_offset(header, header["meta_slot"]))
+        return json.loads(f.read(header["meta_len"]) or b"{}")
+
+
+def load_history(path, header=None, mmap=True, start=0):
+    """History from tick ``start`` on: a read-only ``numpy.memmap`` by default, else a loaded array."""
+    header = header or read_header(path)
+    count = header["count"] - start
+    if count <= 0:
+        return np.empty(0)
+    offset = _history_offset(header) + 8 * start
+    if mmap:
+        return np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=(count,))
+    return np.fromfile(path, dtype="<f8", count=count, offset=offset)
+
+
+def load_ledger(path, header=None):
+    header = header or read_header(path)
+    if not header["ledger_count"]:
+        return np.zeros(0, dtype=LEDGER_DTYPE)
+    return np.fromfile(path, dtype=LEDGER_DTYPE, count=header["ledger_count"], offset=_ledger_offset(header))
+
+
+def read_save(path, mmap=True):
+    """Returns (header, meta, history)."""
+    header = read_header(path)
+    return header, read_meta(path, header), load_history(path, header, mmap=mmap)
+
+
+def _write_new(path, cash, shares, price, history, meta_raw, meta_cap, ledger, ledger_cap):
+    header = {"version": VERSION, "meta_slot": 0, "meta_len": len(meta_raw), "meta_cap": meta_cap, "cash": cash, "shares": shares, "price": price,
+              "count": len(history), "ledger_count": len(ledger), "ledger_cap": ledger_cap}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_pack_header(header))
+        f.write(meta_raw.ljust(2 * meta_cap, b"\0"))
+        f.write(_ledger_bytes(ledger).ljust(LEDGER_DTYPE.itemsize * ledger_cap, b"\0"))
+        f.write(_history_bytes(history))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return header["count"]
+
+
+def write_save(path, cash, shares, price, new_history, keep=0, meta=None, new_ledger=(), ledger_keep=0, fsync=True):
+    """Write a save, appending ``new_history`` after the first ``keep`` ticks already on disk
+    and ``new_ledger`` records after the first ``ledger_keep`` trades.
+
+    ``keep=0`` (or a missing file) writes a fresh file. Returns the total tick count.
+    """
+    meta_raw = _encode_meta(meta)
+    new_ledger = np.asarray(new_ledger, dtype=LEDGER_DTYPE) if len(new_ledger) else np.zeros(0, dtype=LEDGER_DTYPE)
+    if keep == 0 or not os.path.exists(path):
+        if keep:
+            raise SaveFileError(f"{path}: cannot keep {keep} ticks of a missing file")
+        return _write_new(path, cash, shares, price, new_history, meta_raw, max(DEFAULT_META_CAP, len(meta_raw)),
+                          new_ledger, max(DEFAULT_LEDGER_CAP, 2 * len(new_ledger)))
+
+    header = read_header(path)
+    if keep > header["count"] or ledger_keep > header["ledger_count"]:
+        raise SaveFileError(f"{path}: holds {header['count']} ticks and {header['ledger_count']} trades, "
+                            f"cannot keep {keep} and {ledger_keep}")
+    ledger_count = ledger_keep + len(new_ledger)
+    if len(meta_raw) > header["meta_cap"] or ledger_count > header["ledger_cap"] or header["version"] < VERSION:
+        # Metadata or ledger outgrew its block (or an older single-slot file): rewrite once with room to spare.
+        history = np.concatenate([load_history(path, header, mmap=False)[:keep], np.asarray(new_history, dtype=np.float64)])
+        ledger = np.concatenate([load_ledger(path, header)[:ledger_keep], new_ledger])
+        return _write_new(path, cash, shares, price, history, meta_raw, max(header["meta_cap"], 2 * len(meta_raw)),
+                          ledger, max(header["ledger_cap"], DEFAULT_LEDGER_CAP, 2 * ledger_count))
+
+    with open(path, "r+b") as f:
+        f.seek(_history_offset(header) + 8 * keep)
+        f.write(_history_bytes(new_history))
+        f.truncate()
+        f.seek(_ledger_offset(header) + LEDGER_DTYPE.itemsize * ledger_keep)
+        f.write(_ledger_bytes(new_ledger))
+        # The new metadata goes in the inactive slot; the header switches to it only once it is on disk.
+        slot = 1 - header["meta_slot"]
+        f.seek(_meta_offset(header, slot))
+        f.write(meta_raw.ljust(header["meta_cap"], b"\0"))
+        f.flush()
+        if fsync: os.fsync(f.fileno())
+        header.update(meta_slot=slot, meta_len=len(meta_raw), cash=cash, shares=shares, price=price,
+                      count=keep + len(new_history), ledger_count=ledger_count)
+        f.seek(0)
+        f.write(_pack_header(header))
+        f.flush()
+        if fsync: os.fsync(f.fileno())
+    return header["count"]
+
+
+# --- Legacy JSON saves ---
+def read_json_save(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data["player_cash"], data["player_shares"], data["stock_price"], data["stock_history"]
+
+
+def migrate_json(json_path, out_path=None, meta=None):
+    """Convert a legacy JSON save to the binary format; the JSON file is left in place."""
+    out_path = out_path or os.path.splitext(json_path)[0] + SAVE_EXT
+    cash, shares, price, history = read_json_save(json_path)
+    write_save(out_path, cash, shares, price, history, meta=meta)
+    return out_path
+
+
+def main(argv=None):
+    import argparse
+    from .models import model_for_save
+
+    parser = argparse.ArgumentParser(prog="python -m stocksim.savefile", description="Convert legacy JSON saves to the binary format")
+    parser.add_argument("paths", nargs="+", help="JSON save files or directories containing them")
+    parser.add_argument("--force", action="store_true", help="overwrite existing binary saves")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        files = [os.path.join(path, f) for f in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+        for json_path in files:
+            if not json_path.endswith(LEGACY_EXT): continue
+            out_path = os.path.splitext(json_path)[0] + SAVE_EXT
+            if os.path.exists(out_path) and not args.force:
+                print(f"skip {json_path}: {out_path} exists")
+                continue
+            migrate_json(json_path, out_path, meta={"model": model_for_save(json_path)})
+            print(f"{json_path} -> {out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Fixed-timestep simulation clock, independent of the frame rate.
+
+Real elapsed time, scaled by the speed multiplier, is added to an accumulator;
+each whole ``tick_ms`` in it is one simulation tick, and the remainder carries
+over to the next frame instead of being dropped.
+"""
+TICK_MS = 250
+SPEEDS = (1, 2, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+
+class TickScheduler:
+    def __init__(self, tick_ms=TICK_MS, speeds=SPEEDS, max_ticks_per_frame=1_000_000):
+        self.tick_ms = tick_ms
+        self.speeds = speeds
+        self.speed_index = 0
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+
+    @property
+    def speed(self):
+        return self.speeds[self.speed_index]
+
+    def faster(self):
+        self.speed_index = min(self.speed_index + 1, len(self.speeds) - 1)
+
+    def slower(self):
+        self.speed_index = max(self.speed_index - 1, 0)
+
+    def advance(self, elapsed_ms):
+        """Ticks due after ``elapsed_ms`` of real time."""
+        self.accumulator += elapsed_ms * self.speed
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks_per_frame:
+            # After a long stall, drop the backlog rather than stall again catching up.
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    @property
+    def overdue_ms(self):
+        """Real time since the latest tick fell due: how far delivery lags the fixed timestep."""
+        return self.accumulator / self.speed
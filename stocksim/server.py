@@ -0,0 +1,251 @@
+"""Multiplayer market server: one authoritative price feed shared by many traders.
+
+    python -m stocksim.server --model brownian --port 8765
+
+Clients connect over TCP and speak newline-delimited JSON. The first line a
+client sends is a hello, and everything after it is an order::
+
+    {"op": "hello", "role": "trader", "name": "alice"}      role "viewer" only watches
+    {"op": "order", "side": "buy", "amount": 10, "ref": 7}  ref is echoed in the reply
+
+The server answers the hello with ``welcome`` (account, current tick and recent
+prices). On every tick it broadcasts one ``tick`` line, encoded once and shared by
+all clients. Orders are queued as they arrive, and the whole queue is filled
+against the new price as one batch at the start of the next tick, through the
+same whole-or-nothing cash/share rules as the single-player game
+(``trading.apply_orders``). Each trader then gets a ``fill`` line per order.
+
+Accounts live in structure-of-arrays (``cash``/``shares`` indexed by trader slot),
+so a tick costs a handful of array operations however many traders there are. A
+trader who reconnects under the same name gets the same account back. Clients
+that stop reading are disconnected once ``MAX_BUFFER`` bytes back up, rather
+than letting the server buffer for them.
+"""
+import asyncio
+import json
+import logging
+import time
+
+import numpy as np
+
+from .game import STARTING_CASH
+from .history import PriceHistory
+from .models import PriceModel, get_model
+from .rng import RandomStream
+from .scheduler import TICK_MS
+from .trading import apply_orders
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+WELCOME_TICKS = 2000  # recent prices sent with the welcome so viewers can draw a graph at once
+MAX_BUFFER = 1 << 20
+MAX_LINE = 1 << 16
+MAX_ORDER = 10 ** 12  # shares per order; keeps every amount well inside int64
+TRADER, VIEWER = "trader", "viewer"
+
+
+log = logging.getLogger(__name__)
+
+
+def _encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class MarketServer:
+    def __init__(self, model="brownian", tick_ms=TICK_MS, seed=None, cash=STARTING_CASH):
+        self.model = model if isinstance(model, PriceModel) else get_model(model)
+        self.tick_ms = tick_ms
+        self.rng = RandomStream(seed)
+        self.starting_cash = cash
+        self.price = self.model.reset()
+        self.history = PriceHistory([self.price])
+        # Trader accounts, indexed by slot; doubled when full.
+        self.cash = np.zeros(64)
+        self.shares = np.zeros(64, dtype=np.int64)
+        self.names = {}        # trader name -> slot, for traders who gave one
+        self._next_slot = 0
+        self.writers = {}      # slot -> StreamWriter of the connected trader
+        self.viewers = set()
+        self._orders = []      # (slot, signed amount, ref) waiting for the next tick
+        self.orders_filled = self.orders_rejected = 0
+        self._server = None
+        self._handlers = {}    # connection task -> its StreamWriter
+
+    @property
+    def tick(self):
+        return len(self.history) - 1
+
+    @property
+    def n_traders(self):
+        return self._next_slot
+
+    # --- Accounts ---
+    def open_account(self, name=None):
+        """Slot for ``name``, reusing its account if the name traded before; anonymous traders always get a new one."""
+        if name is not None and name in self.names: return self.names[name]
+        slot = self._next_slot
+        self._next_slot += 1
+        if slot == len(self.cash):
+            self.cash = np.concatenate((self.cash, np.zeros(slot)))
+            self.shares = np.concatenate((self.shares, np.zeros(slot, dtype=np.int64)))
+        self.cash[slot] = self.starting_cash
+        self.shares[slot] = 0
+        if name is not None: self.names[name] = slot
+        return slot
+
+    def submit(self, slot, side, amount, ref=None):
+        """Queue a market order for the next tick; returns an error string if it is malformed."""
+        if side not in ("buy", "sell"): return "side must be buy or sell"
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0: return "amount must be a positive integer"
+        if amount > MAX_ORDER: return f"amount must be at most {MAX_ORDER:,}"
+        self._orders.append((slot, amount if side == "buy" else -amount, ref))
+        return None
+
+    def fill_orders(self):
+        """Fill every queued order at the current price; returns ``[(slot, amount, ref, filled)]``."""
+        if not self._orders: return []
+        orders, self._orders = self._orders, []
+        slots = np.fromiter((o[0] for o in orders), dtype=np.int64, count=len(orders))
+        amounts = np.fromiter((o[1] for o in orders), dtype=np.int64, count=len(orders))
+        filled = np.zeros(len(orders), dtype=bool)
+        # A trader's orders apply in arrival order: their k-th order of the tick goes in round k,
+        # so no round touches one account twice.
+        order = np.argsort(slots, kind="stable")
+        sorted_slots = slots[order]
+        first = np.r_[0, np.flatnonzero(np.diff(sorted_slots)) + 1]
+        rank = np.empty(len(orders), dtype=np.int64)
+        rank[order] = np.arange(len(orders)) - np.repeat(first, np.diff(np.r_[first, len(orders)]))
+        for k in range(int(rank.max()) + 1):
+            batch = np.flatnonzero(rank == k)
+            batch_slots = slots[batch]
+            cash, shares = self.cash[batch_slots], self.shares[batch_slots]
+            filled[batch] = apply_orders(cash, shares, self.price, amounts[batch])
+            self.cash[batch_slots], self.shares[batch_slots] = cash, shares
+        n_filled = int(filled.sum())
+        self.orders_filled += n_filled
+        self.orders_rejected += len(orders) - n_filled
+        return [(slot, amount, ref, ok) for (slot, amount, ref), ok in zip(orders, filled.tolist())]
+
+    # --- Ticks ---
+    def step(self):
+        """Advance the price one tick, fill the queued orders and notify every client."""
+        self.price = self.model.step(self.price, self.rng)
+        self.history.append(self.price)
+        fills = self.fill_orders()
+        tick = _encode({"type": "tick", "tick": self.tick, "price": self.price, "time": time.time(), "traders": len(self.writers)})
+        for writer in list(self.writers.values()) + list(self.viewers): self._send(writer, tick)
+        for slot, amount, ref, ok in fills:
+            writer = self.writers.get(slot)
+            if writer is None: continue
+            self._send(writer, _encode({"type": "fill", "ref": ref, "side": "buy" if amount > 0 else "sell", "amount": abs(amount),
+                                        "filled": ok, "price": self.price, "tick": self.tick,
+                                        "cash": float(self.cash[slot]), "shares": int(self.shares[slot])}))
+        return fills
+
+    def _send(self, writer, data):
+        if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            writer.close()  # a client that stopped reading; its handler cleans up
+            return
+        writer.write(data)
+
+    async def _tick_loop(self):
+        # Fixed timestep against the loop clock, so slow ticks do not accumulate drift.
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick_ms / 1000
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            try:
+                self.step()
+            except Exception:
+                # One bad batch of orders must not stop the market for everyone; its orders are dropped.
+                log.exception("tick %d failed", self.tick)
+
+    # --- Connections ---
+    async def _handle(self, reader, writer):
+        slot = None
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if not isinstance(hello, dict) or hello.get("op") != "hello":
+                writer.write(_encode({"type": "error", "error": "expected hello"}))
+                return
+            if not isinstance(hello.get("name"), (str, type(None))):
+                writer.write(_encode({"type": "error", "error": "name must be a string"}))
+                return
+            recent = self.history.values(max(0, len(self.history) - WELCOME_TICKS)).tolist()
+            welcome = {"type": "welcome", "model": self.model.name, "tick": self.tick, "price": self.price,
+                       "tick_ms": self.tick_ms, "history": recent}
+            if hello.get("role") == VIEWER:
+                self.viewers.add(writer)
+                writer.write(_encode(welcome))
+                await reader.read()  # viewers only listen; wait for them to hang up
+                return
+            slot = self.open_account(hello.get("name"))
+            if slot in self.writers:
+                writer.write(_encode({"type": "error", "error": "trader already connected"}))
+                slot = None
+                return
+            self.writers[slot] = writer
+            writer.write(_encode({**welcome, "trader": slot, "cash": float(self.cash[slot]), "shares": int(self.shares[slot])}))
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                    error = self.submit(slot, message.get("side"), message.get("amount"), message.get("ref")) \
+                        if message.get("op") == "order" else "unknown op"
+                except (ValueError, AttributeError):
+                    message, error = {}, "malformed message"
+                if error: self._send(writer, _encode({"type": "reject", "ref": message.get("ref"), "error": error}))
+        except (ConnectionError, ValueError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            if slot is not None: self.writers.pop(slot, None)
+            self.viewers.discard(writer)
+            self._handlers.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE, backlog=4096)
+        self._ticker = asyncio.ensure_future(self._tick_loop())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._ticker.cancel()
+        self._server.close()
+        # Hang up rather than cancel, so every handler sees end-of-stream and finishes normally.
+        handlers = list(self._handlers)
+        for writer in self._handlers.values(): writer.close()
+        await asyncio.gather(self._ticker, *handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        await self.start(host, port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def main(argv=None):
+    import argparse
+
+    from .models import MODELS
+
+    parser = argparse.ArgumentParser(prog="python -m stocksim.server", description="Shared-market server for many traders")
+    parser.add_argument("--model", choices=sorted(m for m in MODELS if m != "replay"), default="brownian")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tick-ms", type=float, default=TICK_MS, help="real time per tick")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = MarketServer(args.model, args.tick_ms, args.seed)
+    print(f"{server.model.name} market on {args.host}:{args.port}, one tick every {args.tick_ms:g} ms")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Example trading strategies.
+
+A strategy is called as ``strategy(price, cash, shares)`` and returns the number of
+shares to trade: positive to buy, negative to sell, zero to hold. Orders go through
+the same rules as the game's Buy/Sell buttons. These examples only use NumPy
+operations, so they also work when called with arrays of prices, cash and shares.
+Strategies handed to the Monte Carlo runner must be picklable (module-level
+functions or instances of module-level classes).
+
+Signal strategies instead have a ``positions(prices, cash)`` method. It returns
+the number of shares to hold at every tick of a whole price path, and
+``backtest`` runs them without a per-tick loop.
+"""
+import numpy as np
+
+
+def buy_and_hold(price, cash, shares):
+    return cash // price
+
+
+def hold_cash(price, cash, shares):
+    return price * 0
+
+
+class Threshold:
+    """Buy ``size`` shares below ``low``, sell ``size`` above ``high``."""
+
+    def __init__(self, low=45.0, high=55.0, size=10):
+        self.low, self.high, self.size = low, high, size
+
+    def __call__(self, price, cash, shares):
+        return np.where(price < self.low, self.size, np.where(price > self.high, -self.size, 0))
+
+
+def _moving_average(prices, window):
+    # Trailing mean over up to ``window`` prices (fewer at the start of the path).
+    sums = np.cumsum(prices)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums / np.minimum(np.arange(1, len(prices) + 1), window)
+
+
+class MovingAverageCross:
+    """Hold ``size`` shares while the ``fast`` moving average is above the ``slow`` one."""
+
+    def __init__(self, fast=10, slow=50, size=100):
+        self.fast, self.slow, self.size = fast, slow, size
+
+    def positions(self, prices, cash):
+        prices = np.asarray(prices, dtype=np.float64)
+        above = _moving_average(prices, self.fast) > _moving_average(prices, self.slow)
+        above[:self.slow - 1] = False  # wait for a full slow window
+        return np.where(above, self.size, 0)
@@ -0,0 +1,202 @@
+"""Grid and random parameter sweeps over the vectorized simulator, with an on-disk cache.
+
+    python -m stocksim.sweep --model brownian --grid mu=0,0.0005,0.001 --grid sigma=0.01:0.05:9
+    python -m stocksim.sweep --model percent --random 500 --range width=0.01,0.1 --out sweep.csv
+
+Every parameter combination simulates ``n_paths`` paths of ``n_steps`` ticks and
+reports statistics of the final price and of a strategy run over those paths.
+A combination's seed and cache key are both derived from a hash of everything
+that determines its result: model, parameters, path counts, seed and strategy.
+Re-running a sweep, or running one whose grid overlaps an earlier sweep, only
+simulates the combinations not already in ``cache_dir``, and results do not
+depend on the order or the process the combinations ran in.
+"""
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import PRICE_FLOOR, START_PRICE
+from .game import DATA_DIR, STARTING_CASH
+from .models import get_model
+from .montecarlo import _run_vectorized
+from .strategies import buy_and_hold
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, "sweep_cache")
+SUMMARY_COLUMNS = ("mean_final", "std_final", "p05_final", "p95_final", "prob_floor", "mean_pnl", "prob_loss", "mean_max_drawdown")
+
+
+# --- Parameter sets ---
+def grid_points(grid):
+    """Every combination of ``{name: [values, ...]}``."""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_points(ranges, n, seed=None):
+    """``n`` combinations drawn uniformly from ``{name: (low, high)}``."""
+    rng = np.random.default_rng(seed)
+    names = sorted(ranges)
+    draws = {name: rng.uniform(*ranges[name], size=n).tolist() for name in names}
+    return [{name: draws[name][i] for name in names} for i in range(n)]
+
+
+def _strategy_key(strategy):
+    if hasattr(strategy, "__code__"):  # a plain function
+        return f"{strategy.__module__}.{strategy.__qualname__}"
+    cls = type(strategy)
+    return {"class": f"{cls.__module__}.{cls.__qualname__}", "state": vars(strategy)}
+
+
+def _canonical(value):
+    # linspace grids reach the same value with different rounding; 12 digits makes them meet.
+    return float(f"{value:.12g}") if isinstance(value, float) else value
+
+
+def cache_key(model, params, n_paths, n_steps, start, cash, seed, strategy):
+    spec = {"version": CACHE_VERSION, "model": model, "params": {k: _canonical(v) for k, v in params.items()},
+            "n_paths": n_paths, "n_steps": n_steps, "start": start, "cash": cash, "seed": seed,
+            "strategy": _strategy_key(strategy)}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+
+# --- Evaluation ---
+def _evaluate(model, params, n_paths, n_steps, start, cash, seed, strategy, key):
+    # The key doubles as the seed, so a combination's paths never depend on its neighbours.
+    rng = np.random.default_rng(np.random.SeedSequence([seed or 0, int(key[:16], 16)]))
+    paths = get_model(model, **params).paths(n_paths, n_steps, start=start, rng=rng)
+    final = paths[:, -1]
+    pnl, max_drawdown = _run_vectorized(strategy, paths, cash)
+    return {
+        "mean_final": float(final.mean()),
+        "std_final": float(final.std()),
+        "p05_final": float(np.quantile(final, 0.05)),
+        "p95_final": float(np.quantile(final, 0.95)),
+        "prob_floor": float((paths.min(axis=1) <= PRICE_FLOOR).mean()),
+        "mean_pnl": float(pnl.mean()),
+        "prob_loss": float((pnl < 0).mean()),
+        "mean_max_drawdown": float(max_drawdown.mean()),
+    }
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + ".json")
+
+
+def _read_cache(cache_dir, key):
+    try:
+        with open(_cache_path(cache_dir, key)) as f:
+            return json.load(f)["result"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache(cache_dir, key, entry):
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def sweep(model, points, n_paths=1000, n_steps=1000, start=START_PRICE, cash=STARTING_CASH, seed=0,
+          strategy=buy_and_hold, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Evaluate every parameter dict in ``points``; returns one row per point, in order.
+
+    Each row holds the parameters, the ``SUMMARY_COLUMNS`` statistics and ``cached``
+    (whether it came from ``cache_dir``). ``cache_dir=None`` disables the cache.
+    """
+    keys = [cache_key(model, params, n_paths, n_steps, start, cash, seed, strategy) for params in points]
+    results = {}
+    if cache_dir:
+        for key in set(keys):
+            cached = _read_cache(cache_dir, key)
+            if cached is not None: results[key] = cached
+    cached_keys = set(results)
+
+    todo = {key: params for key, params in zip(keys, points) if key not in results}
+    args = [(model, params, n_paths, n_steps, start, cash, seed, strategy, key) for key, params in todo.items()]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(args) <= 1:
+        computed = [_evaluate(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+            computed = list(pool.map(_evaluate, *zip(*args), chunksize=max(1, len(args) // (4 * workers))))
+    for (key, params), result in zip(todo.items(), computed):
+        results[key] = result
+        if cache_dir:
+            _write_cache(cache_dir, key, {"model": model, "params": params, "n_paths": n_paths, "n_steps": n_steps, "result": result})
+
+    return [{**params, **results[key], "cached": key in cached_keys} for key, params in zip(keys, points)]
+
+
+# --- Output ---
+def write_table(rows, path):
+    """Write rows as CSV (``.csv``) or JSON lines (anything else)."""
+    if path.endswith(".csv"):
+        import csv
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+def format_table(rows, param_names, sort_by="mean_pnl", limit=20):
+    rows = sorted(rows, key=lambda row: row[sort_by], reverse=True)[:limit]
+    columns = list(param_names) + list(SUMMARY_COLUMNS)
+    lines = ["  ".join(f"{c:>12}" for c in columns)]
+    lines += ["  ".join(f"{row[c]:>12.6g}" for c in columns) for row in rows]
+    return "\n".join(lines)
+
+
+def _parse_values(spec):
+    """``a,b,c`` or ``start:stop:num`` (inclusive linspace)."""
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        return [_canonical(v) for v in np.linspace(float(start), float(stop), int(num)).tolist()]
+    return [float(v) for v in spec.split(",")]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m stocksim.sweep", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="brownian")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=VALUES", help="a,b,c or start:stop:num; repeatable")
+    parser.add_argument("--random", type=int, default=0, metavar="N", help="also draw N random combinations from the --range bounds")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW,HIGH")
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="'' disables the cache")
+    parser.add_argument("--out", help="write every row to this .csv or .jsonl file")
+    parser.add_argument("--sort", default="mean_pnl", choices=SUMMARY_COLUMNS)
+    args = parser.parse_args(argv)
+
+    grid = {name: _parse_values(values) for name, values in (g.split("=", 1) for g in args.grid)}
+    ranges = {name: tuple(float(v) for v in bounds.split(",")) for name, bounds in (r.split("=", 1) for r in args.range)}
+    points = grid_points(grid) if grid else []
+    if args.random:
+        if not ranges: parser.error("--random needs at least one --range")
+        points += random_points(ranges, args.random, args.seed)
+    if not points: parser.error("give a --grid and/or --random with --range")
+
+    rows = sweep(args.model, points, args.paths, args.steps, seed=args.seed, workers=args.workers, cache_dir=args.cache_dir or None)
+    print(f"{len(rows):,} combinations, {sum(row['cached'] for row in rows):,} from cache")
+    print(format_table(rows, sorted(set(grid) | set(ranges)), sort_by=args.sort))
+    if args.out:
+        write_table(rows, args.out)
+        print(f"wrote {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Cash and share rules shared by the game, the order book and the batch tools."""
+import numpy as np
+
+
+def buy_shares(cash, shares, price, amount):
+    """Market buy; returns the new (cash, shares), unchanged if the order is rejected."""
+    if not isinstance(amount, int) or amount <= 0: return cash, shares
+    cost = price * amount
+    if cash < cost: return cash, shares
+    return cash - cost, shares + amount
+
+def sell_shares(cash, shares, price, amount):
+    """Market sell; returns the new (cash, shares), unchanged if the order is rejected."""
+    if not isinstance(amount, int) or amount <= 0: return cash, shares
+    if shares < amount: return cash, shares
+    return cash + price * amount, shares - amount
+
+def apply_orders(cash, shares, prices, amounts):
+    """Array form of buy_shares/sell_shares, updating cash and shares in place.
+
+    Positive amounts buy, negative amounts sell; each order is filled whole or not at all.
+    """
+    amounts = np.asarray(amounts).astype(np.int64)
+    cost = prices * amounts
+    fill = np.where(amounts > 0, cash >= cost, shares >= -amounts)
+    fill &= amounts != 0
+    np.subtract(cash, cost, out=cash, where=fill)
+    np.add(shares, amounts, out=shares, where=fill)
+    return fill
@@ -0,0 +1,276 @@
+"""Retained-mode widgets for the pygame front end.
+
+Widgets cache their rendered text and flag themselves ``dirty`` when something
+visible changes. A ``Scene`` repaints only dirty widgets and pushes just their
+rectangles to the display with ``pygame.display.update(rects)``.
+"""
+import pygame
+
+# --- Colors ---
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREEN = (0, 177, 106)
+RED = (217, 30, 24)
+GRAY = (200, 200, 200)
+LIGHT_GRAY = (220, 220, 220)
+DARK_GRAY = (50, 50, 50)
+BLUE = (30, 144, 255)
+DARK_BLUE = (40, 70, 110)
+ORANGE = (255, 165, 0)
+PURPLE = (186, 85, 211)
+
+# --- Fonts, created by init_fonts() once pygame is initialized ---
+font = None
+small_font = None
+title_font = None
+
+
+def init_fonts():
+    global font, small_font, title_font
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 28)
+    title_font = pygame.font.Font(None, 72)
+
+
+class Widget:
+    """Base for everything a Scene draws: a ``rect``, a ``dirty`` flag and ``draw(surface)``."""
+    dirty = True
+
+    def draw(self, surface):
+        raise NotImplementedError
+
+
+class TextLabel(Widget):
+    def __init__(self, text, pos, color=BLACK, font=None, anchor="topleft"):
+        self.pos = pos
+        self.anchor = anchor
+        self.font = font
+        self._text = text
+        self._color = color
+        self._surface = None
+        self.rect = pygame.Rect(pos, (0, 0))
+
+    def set(self, text=None, color=None):
+        if text is not None and text != self._text:
+            self._text = text
+            self._surface = None
+        if color is not None and color != self._color:
+            self._color = color
+            self._surface = None
+        if self._surface is None: self.dirty = True
+
+    def draw(self, surface):
+        if self._surface is None:
+            self._surface = (self.font or font).render(self._text, True, self._color)
+            self.rect = self._surface.get_rect(**{self.anchor: self.pos})
+        surface.blit(self._surface, self.rect)
+
+
+class Button(Widget):
+    def __init__(self, x, y, width, height, text, color, radius=10, font=None):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.color = color
+        self.radius = radius
+        self.font = font
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self._text_surface = None
+        self.dirty = True
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect, border_radius=self.radius)
+        if self._text_surface is None:
+            self._text_surface = (self.font or small_font).render(self._text, True, WHITE)
+        surface.blit(self._text_surface, self._text_surface.get_rect(center=self.rect.center))
+
+    def is_clicked(self, pos):
+        return self.rect.collidepoint(pos)
+
+
+class InputBox(Widget):
+    def __init__(self, x, y, width, height, text=''):
+        self.rect = pygame.Rect(x, y, width, height)
+        self._active = False
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self._text_surface = None
+        self.dirty = True
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        if value != self._active:
+            self._active = value
+            self.dirty = True
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.active = self.rect.collidepoint(event.pos)
+        if event.type == pygame.KEYDOWN and self.active:
+            if event.key == pygame.K_RETURN: return self.text
+            elif event.key == pygame.K_BACKSPACE: self.text = self.text[:-1]
+            else: self.text += event.unicode
+        return None
+
+    def draw(self, surface):
+        color = LIGHT_GRAY if self.active else GRAY
+        pygame.draw.rect(surface, color, self.rect, border_radius=5)
+        if self._text_surface is None:
+            self._text_surface = small_font.render(self.text, True, BLACK)
+        surface.blit(self._text_surface, (self.rect.x + 5, self.rect.y + 5), area=pygame.Rect(0, 0, self.rect.width - 10, self.rect.height - 5))
+        pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=5)
+
+
+class TextOverlay(Widget):
+    """Translucent box of text lines, re-rendered at most every ``refresh_ms`` while visible."""
+
+    def __init__(self, pos, refresh_ms=250, anchor="topleft"):
+        self.pos = pos
+        self.refresh_ms = refresh_ms
+        self.anchor = anchor
+        self.visible = False
+        self._surface = None
+        self._last_refresh = 0
+        self.rect = pygame.Rect(pos, (0, 0))
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._last_refresh = 0
+        self.dirty = True
+
+    def lines(self):
+        raise NotImplementedError
+
+    def update(self, now_ms):
+        if self.visible and now_ms - self._last_refresh >= self.refresh_ms:
+            self._last_refresh = now_ms
+            self._surface = None
+            self.dirty = True
+
+    def draw(self, surface):
+        if not self.visible:
+            self.rect.size = (0, 0)
+            return
+        if self._surface is None:
+            rendered = [small_font.render(line, True, WHITE) for line in self.lines()]
+            width = max(r.get_width() for r in rendered) + 16
+            height = sum(r.get_height() for r in rendered) + 12
+            self._surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            self._surface.fill((0, 0, 0, 190))
+            y = 6
+            for r in rendered:
+                self._surface.blit(r, (8, y))
+                y += r.get_height()
+            # Grow to cover the previous readout so a shorter one erases it.
+            self.rect = self.rect.union(self._surface.get_rect(**{self.anchor: self.pos}))
+        surface.blit(self._surface, self._surface.get_rect(**{self.anchor: self.pos}))
+
+
+class ProfilerOverlay(TextOverlay):
+    """Translucent readout of a ``FrameProfiler``'s recent timings, refreshed a few times a second."""
+
+    def __init__(self, profiler, pos, refresh_ms=250):
+        super().__init__(pos, refresh_ms)
+        self.profiler = profiler
+        self.note = ""
+
+    def lines(self):
+        s = self.profiler.summary()
+        lines = [f"FPS {s['fps']:5.1f}   frame p50 {s['frame_p50']:6.2f} ms  p99 {s['frame_p99']:6.2f} ms"]
+        lines += [f"  {phase:<7} p50 {s[phase + '_p50']:6.2f} ms  p99 {s[phase + '_p99']:6.2f} ms" for phase in self.profiler.phases]
+        lines.append(f"  gc      p99 {s['gc_p99']:6.2f} ms  ({s['gc_count']:,} collections)")
+        lines.append(f"tick lag p50 {s['tick_lag_p50']:6.1f} ms  p99 {s['tick_lag_p99']:6.1f} ms")
+        if self.note: lines.append(self.note)
+        return lines
+
+
+class RiskPanel(TextOverlay):
+    """The latest estimate of a ``risk.RiskWorker``, with how current it is."""
+
+    def __init__(self, worker, pos, refresh_ms=500, anchor="topright"):
+        super().__init__(pos, refresh_ms, anchor)
+        self.worker = worker
+        self.note = ""
+
+    def lines(self):
+        worker, report = self.worker, self.worker.report
+        lines = [f"Risk over {worker.horizon:,} ticks, {worker.n_paths:,} paths" + ("  (updating)" if worker.busy else "")]
+        if self.note: return lines + [self.note]
+        if worker.error: return lines + [worker.error]
+        if report is None: return lines + ["simulating..."]
+        if not report.shares: return lines + ["no shares held: equity cannot move"]
+        for c in report.confidence:
+            lines.append(f"  VaR {c:.0%}  ${report.var(c):>11,.2f}   CVaR ${report.cvar(c):>11,.2f}")
+        lines.append(f"  P(equity < {report.ruin_fraction:.0%} of ${report.equity:,.0f})  {report.prob_ruin:8.3%}")
+        lines.append(f"  E[max drawdown]  {report.expected_max_drawdown:8.2%}")
+        lines.append(f"as of tick {report.tick:,}: {report.shares:,} shares @ ${report.price:,.2f} ({report.elapsed:.1f} s)")
+        return lines
+
+
+class Scene:
+    """Widgets over a flat background, repainted and presented by dirty rectangle."""
+
+    def __init__(self, surface, background=DARK_GRAY):
+        self.surface = surface
+        self.background = background
+        self.widgets = []
+        self._full_redraw = True
+        self._flip_all = False
+
+    def add(self, *widgets):
+        self.widgets.extend(widgets)
+        self._full_redraw = True
+        return widgets[0] if len(widgets) == 1 else widgets
+
+    def invalidate(self):
+        self._full_redraw = True
+
+    def present(self):
+        """Repaint dirty widgets and push their rectangles; returns the rectangles updated."""
+        rects = self.repaint()
+        self.flip(rects)
+        return rects
+
+    def repaint(self):
+        """Redraw dirty widgets off-screen; returns the rectangles ``flip`` must push."""
+        self._flip_all = self._full_redraw
+        if self._full_redraw:
+            self.surface.fill(self.background)
+            for widget in self.widgets:
+                widget.draw(self.surface)
+                widget.dirty = False
+            self._full_redraw = False
+            return [self.surface.get_rect()]
+
+        rects = [widget.rect.copy() for widget in self.widgets if widget.dirty]
+        if not rects: return rects
+        for rect in rects: self.surface.fill(self.background, rect)
+        for widget in self.widgets:
+            # Repaint the dirty widgets plus any clean neighbour a cleared rect cut into. A repainted
+            # neighbour can cover widgets drawn after it (an overlay on the graph), so its rect counts too.
+            if widget.dirty or widget.rect.collidelist(rects) != -1:
+                widget.draw(self.surface)
+                rects.append(widget.rect.copy())
+                widget.dirty = False
+        return rects
+
+    def flip(self, rects):
+        if self._flip_all: pygame.display.flip()
+        elif rects: pygame.display.update(rects)
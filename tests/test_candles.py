@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+
+from stocksim.candles import CandleAggregator
+
+
+def _assert_same(a, b):
+    assert a.ticks == b.ticks
+    for interval in a.series:
+        np.testing.assert_array_equal(a[interval].data[:, :len(a[interval])], b[interval].data[:, :len(b[interval])])
+
+
+def test_saves_append_only_new_candles(tmp_path):
+    path = str(tmp_path / "game.candles")
+    prices = 50 + np.cumsum(np.random.default_rng(1).normal(size=30_000))
+    candles = CandleAggregator()
+    sizes = []
+    for stop in (1234, 1240, 25_000, 30_000):
+        candles.extend(prices[candles.ticks:stop])
+        candles.save(path)
+        sizes.append(os.path.getsize(path))
+        _assert_same(CandleAggregator.load(path), CandleAggregator.from_prices(prices[:stop]))
+    # Six more ticks rewrite only the candles still open at the previous save.
+    assert sizes[1] - sizes[0] < 200
+
+
+def test_torn_record_is_ignored_and_overwritten(tmp_path):
+    path = str(tmp_path / "game.candles")
+    prices = np.linspace(50, 60, 5000)
+    candles = CandleAggregator.from_prices(prices[:3000])
+    candles.save(path)
+    with open(path, "ab") as f:
+        f.write(b"\x07" * 40)
+    loaded = CandleAggregator.load(path)
+    _assert_same(loaded, candles)
+
+    loaded.extend(prices[3000:])
+    loaded.save(path)
+    _assert_same(CandleAggregator.load(path), CandleAggregator.from_prices(prices))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from stocksim.game import Game
+
+
+@pytest.mark.parametrize("batched", [True, False])
+def test_recovery_replays_fills_and_triggers(tmp_path, batched):
+    game = Game(data_dir=str(tmp_path), seed=11, journal=True)
+    game.new_game("recover")
+    game.buy_shares(50)
+    price = game.stock_price
+    # The stop triggers within a few ticks; the far-off limit then keeps it resting.
+    stop_limit = game.submit_order("sell", 5, "stop_limit", limit=price * 100, stop=price * 0.99)
+    buy = game.submit_order("buy", 10, "limit", limit=price * 0.98)
+
+    if batched: game.advance(3000)
+    else:
+        for _ in range(3000): game.update_stock_price()
+    assert game.orders.orders[stop_limit].kind == "limit"
+    assert buy not in game.orders.orders
+    fill_tick = int(game.ledger.records["tick"][-1])
+    assert fill_tick < game.total_ticks - 1
+    assert game.stock_history[fill_tick] <= price * 0.98
+    game.journal.flush()  # then "crash": no save, no close
+
+    recovered = Game(data_dir=str(tmp_path), seed=11, journal=True)
+    assert recovered.load_game(game.active_save_file)
+    assert recovered.orders.to_list() == game.orders.to_list()
+    np.testing.assert_array_equal(recovered.ledger.records, game.ledger.records)
+    assert (recovered.player_cash, recovered.player_shares) == (game.player_cash, game.player_shares)
+    np.testing.assert_array_equal(recovered.stock_history.values(), game.stock_history.values())
+    game.journal.close()
+    recovered.close()
+
+
+def test_write_error_falls_back_to_whole_saves(tmp_path, monkeypatch):
+    game = Game(data_dir=str(tmp_path), seed=3, journal=True)
+    game.new_game("diskfull")
+
+    def disk_full(records):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(game.journal, "_write", disk_full)
+    game.advance(20)
+    game.journal.flush()
+    assert isinstance(game.journal.error, OSError)
+
+    game.advance(20)
+    assert game.journal is None and "No space left" in game.journal_error
+    game.save_game()
+
+    loaded = Game(data_dir=str(tmp_path), seed=3)
+    assert loaded.load_game(game.active_save_file)
+    np.testing.assert_array_equal(loaded.stock_history.values(), game.stock_history.values())
+    game.close()
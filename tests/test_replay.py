@@ -0,0 +1,23 @@
+import pytest
+
+from stocksim.replay import PriceFeed
+
+
+def _feed(tmp_path, text):
+    path = tmp_path / "prices.txt"
+    path.write_bytes(text)
+    return PriceFeed(str(path))
+
+
+def test_blank_lines_are_skipped(tmp_path):
+    with _feed(tmp_path, b"1\r\n2\r\n\r\n3\r\n\n") as feed:
+        assert feed.read(10).tolist() == [1.0, 2.0, 3.0]
+    with _feed(tmp_path, b"Date,Close\n2020-01-01,1.5\n\n2020-01-02,2.5\n") as feed:
+        assert feed.read(10).tolist() == [1.5, 2.5]
+
+
+def test_bad_price_reports_its_own_tick(tmp_path):
+    with _feed(tmp_path, b"1\n2\n3\n4\n5\nbad\n7\n") as feed:
+        feed.read(2)
+        with pytest.raises(ValueError, match="tick 5: b'bad'"):
+            feed.read(10)
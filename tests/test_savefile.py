@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from stocksim import savefile
+from stocksim.game import Game
+
+
+def _saved_game(tmp_path):
+    game = Game(data_dir=str(tmp_path), seed=7)
+    game.new_game("crash")
+    game.advance(50)
+    game.buy_shares(10)
+    game.save_game()
+    return game
+
+
+def test_crash_before_header_keeps_previous_save(tmp_path, monkeypatch):
+    game = _saved_game(tmp_path)
+    cash, shares, history = game.player_cash, game.player_shares, game.stock_history.values().copy()
+
+    game.advance(30)
+    game.submit_order("sell", 5, "limit", limit=game.stock_price * 10)  # grows the metadata
+    game.sell_shares(3)
+
+    def crash(header):
+        raise OSError("simulated crash before the header write")
+    # The in-place save gets as far as writing the history, ledger and metadata, but not the header.
+    monkeypatch.setattr(savefile, "_pack_header", crash)
+    with pytest.raises(OSError):
+        game.save_game()
+    monkeypatch.undo()
+
+    loaded = Game(data_dir=str(tmp_path), seed=7)
+    assert loaded.load_game(game.active_save_file)
+    assert loaded.player_cash == cash
+    assert loaded.player_shares == shares
+    assert not loaded.orders
+    np.testing.assert_array_equal(loaded.stock_history.values(), history)
+
+
+def test_in_place_saves_alternate_metadata_slots(tmp_path):
+    game = _saved_game(tmp_path)
+    path = str(tmp_path / game.active_save_file)
+    slots = []
+    for _ in range(3):
+        game.advance(20)
+        game.save_game()
+        slots.append(savefile.read_header(path)["meta_slot"])
+    assert slots == [1, 0, 1]
+
+    loaded = Game(data_dir=str(tmp_path), seed=7)
+    assert loaded.load_game(game.active_save_file)
+    assert loaded.total_ticks == game.total_ticks
+    assert loaded.rng.state() == game.rng.state()
+
+
+def test_single_slot_file_is_rewritten_on_save(tmp_path):
+    path = str(tmp_path / "old.sav")
+    meta = savefile._encode_meta({"model": "percent"})
+    header = {"version": 2, "meta_slot": 0, "meta_len": len(meta), "meta_cap": 64, "cash": 100.0, "shares": 2,
+              "price": 51.0, "count": 3, "ledger_count": 0, "ledger_cap": 4}
+    with open(path, "wb") as f:
+        f.write(savefile.HEADER.pack(savefile.MAGIC, *header.values()))  # in the struct's field order
+        f.write(meta.ljust(64, b"\0") + bytes(4 * savefile.LEDGER_DTYPE.itemsize))
+        f.write(np.array([50.0, 50.5, 51.0]).tobytes())
+    assert savefile.read_header(path) == header
+    np.testing.assert_array_equal(savefile.load_history(path), [50.0, 50.5, 51.0])
+    assert savefile.read_meta(path) == {"model": "percent"}
+
+    savefile.write_save(path, 90.0, 2, 52.0, [52.0], keep=3, meta={"model": "percent", "n": 1})
+    header = savefile.read_header(path)
+    assert header["version"] == savefile.VERSION
+    assert savefile.read_meta(path, header) == {"model": "percent", "n": 1}
+    np.testing.assert_array_equal(savefile.load_history(path, header), [50.0, 50.5, 51.0, 52.0])